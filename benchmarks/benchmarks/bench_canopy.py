@@ -0,0 +1,36 @@
+import eradiate
+from eradiate import KernelContext
+from eradiate.kernel import mi_load_dict
+from eradiate.scenes.biosphere import LeafCloud
+from eradiate.scenes.core import Scene, traverse
+
+
+class BenchmarkLeafCloudLoad:
+    r"""
+    Leaf cloud kernel scene loading benchmark
+    =========================================
+
+    This benchmark records the time taken to assemble the kernel dictionary of
+    a cuboid leaf cloud and load it with Mitsuba, for each leaf representation.
+    """
+
+    params = [[1000, 100000], ["disk", "mesh"]]
+    param_names = ["n_leaves", "leaf_geometry"]
+
+    def setup(self, n_leaves, leaf_geometry):
+        eradiate.set_mode("mono")
+        self.scene = Scene(
+            objects={
+                "leaf_cloud": LeafCloud.cuboid(
+                    n_leaves=n_leaves,
+                    leaf_radius=0.1,
+                    l_horizontal=10.0,
+                    l_vertical=2.0,
+                    leaf_geometry=leaf_geometry,
+                )
+            }
+        )
+
+    def time_load(self, n_leaves, leaf_geometry):
+        kdict_template, _ = traverse(self.scene)
+        mi_load_dict(kdict_template.render(ctx=KernelContext()))
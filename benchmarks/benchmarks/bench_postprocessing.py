@@ -0,0 +1,120 @@
+import mitsuba as mi
+import numpy as np
+import xarray as xr
+
+import eradiate
+from eradiate.pipelines import logic
+from eradiate.quad import Quad
+from eradiate.spectral import CKDSpectralGrid
+from eradiate.xarray.interp import film_to_angular
+
+
+class BenchmarkAggregateCKDQuad:
+    r"""
+    CKD quadrature aggregation benchmark
+    ====================================
+
+    This benchmark records the time taken to aggregate raw CKD results on large
+    films. Each parameter set is a tuple (film width, film height, bin count);
+    bins have 16 g-points.
+    """
+
+    params = [[(64, 64, 200), (256, 256, 20)], [False, True]]
+    param_names = ["shape", "is_variance"]
+
+    def setup(self, shape, is_variance):
+        eradiate.set_mode("ckd")
+        width, height, n_bins = shape
+
+        self.spectral_grid = CKDSpectralGrid.arange(
+            start=500.0, stop=500.0 + 10.0 * n_bins, step=10.0
+        )
+        self.ckd_quads = [Quad.gauss_legendre(16) for _ in range(n_bins)]
+        rng = np.random.default_rng(0)
+        self.raw_data = xr.DataArray(
+            rng.random((n_bins, 16, height, width, 1, 1)),
+            dims=("w", "g", "y_index", "x_index", "sza", "saa"),
+            coords={
+                "w": self.spectral_grid.wcenters.m,
+                "g": self.ckd_quads[0].eval_nodes([0, 1]),
+                "sza": [30.0],
+                "saa": [0.0],
+            },
+            name="radiance_raw",
+        )
+
+    def time_aggregate_ckd_quad(self, shape, is_variance):
+        logic.aggregate_ckd_quad(
+            "ckd", self.raw_data, self.spectral_grid, self.ckd_quads, is_variance
+        )
+
+
+class BenchmarkGatherBitmaps:
+    r"""
+    Bitmap gathering benchmark
+    ==========================
+
+    This benchmark records the time taken to gather the bitmaps produced by a
+    CKD spectral loop into data arrays. Each parameter set is a tuple (film
+    width, film height, bin count); bins have 16 g-points.
+    """
+
+    params = [[(32, 32, 200), (256, 256, 20)]]
+    param_names = ["shape"]
+
+    def setup(self, shape):
+        eradiate.set_mode("ckd")
+        width, height, n_bins = shape
+        rng = np.random.default_rng(0)
+        g = Quad.gauss_legendre(16).eval_nodes([0, 1])
+
+        self.bitmaps = {
+            (500.0 + 10.0 * i, g[j]): {
+                "spp": 16,
+                "bitmap": mi.Bitmap(
+                    rng.random((height, width, 1)), mi.Bitmap.PixelFormat.Y
+                ),
+                "m2": mi.Bitmap(
+                    rng.random((height, width, 1)), mi.Bitmap.PixelFormat.Y
+                ),
+            }
+            for i in range(n_bins)
+            for j in range(16)
+        }
+
+    def time_gather_bitmaps(self, shape):
+        logic.gather_bitmaps(
+            "ckd", "radiance", {}, True, False, self.bitmaps, None, None
+        )
+
+
+class BenchmarkFilmToAngular:
+    r"""
+    Film to angular interpolation benchmark
+    =======================================
+
+    This benchmark records the time taken to interpolate a hemispherical film
+    with spectral and Stokes dimensions on a 1°×1° angular grid. Each parameter
+    is a tuple (film width, film height, wavelength count).
+    """
+
+    params = [[(64, 64, 10), (256, 256, 4)]]
+    param_names = ["shape"]
+
+    def setup(self, shape):
+        width, height, n_w = shape
+        rng = np.random.default_rng(0)
+        self.da = xr.DataArray(
+            rng.random((n_w, width, height, 4)),
+            coords=(
+                ("w", np.linspace(400.0, 700.0, n_w)),
+                ("x", np.arange(0.5, width, 1) / width),
+                ("y", np.arange(0.5, height, 1) / height),
+                ("stokes", ["I", "Q", "U", "V"]),
+            ),
+        )
+        self.theta = np.radians(np.arange(0.0, 90.0, 1.0))
+        self.phi = np.radians(np.arange(0.0, 360.0, 1.0))
+
+    def time_film_to_angular(self, shape):
+        film_to_angular(self.da, self.theta, self.phi)
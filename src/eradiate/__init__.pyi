@@ -28,6 +28,7 @@ from .contexts import KernelContext as KernelContext
 from .data._asset_manager import asset_manager as asset_manager
 from .data._file_resolver import fresolver as fresolver
 from .experiments import run as run
+from .experiments import run_sweep as run_sweep
 from .notebook import load_ipython_extension as load_ipython_extension
 from .scenes.core import traverse as traverse
 from .units import unit_context_config as unit_context_config
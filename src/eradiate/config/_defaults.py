@@ -23,6 +23,10 @@ def absorption_database__error_handling(settings=None, validator=None) -> dict:
     }
 
 
+def absorption_database__preload(settings=None, validator=None) -> bool:
+    return False
+
+
 def azimuth_convention(settings=None, validator=None) -> str:
     return "east_right"
 
@@ -35,6 +39,10 @@ def data_url(settings=None, validator=None) -> str:
     return "https://eradiate-data-registry.s3.eu-west-3.amazonaws.com/registry-v1/"
 
 
+def kernel_cache_path(settings=None, validator=None) -> Path | None:
+    return None
+
+
 def offline(settings=None, validator=None) -> bool:
     return False
 
@@ -159,6 +159,11 @@ settings = Dynaconf(
             "ABSORPTION_DATABASE.ERROR_HANDLING",
             default=_defaults.absorption_database__error_handling,
         ),
+        Validator(
+            "ABSORPTION_DATABASE.PRELOAD",
+            cast=bool,
+            default=_defaults.absorption_database__preload,
+        ),
         Validator(
             "AZIMUTH_CONVENTION",
             cast=AzimuthConvention.convert,
@@ -174,6 +179,11 @@ settings = Dynaconf(
             cast=Path,
             default=_defaults.data_path,
         ),
+        Validator(
+            "KERNEL_CACHE_PATH",
+            cast=lambda x: Path(x).expanduser() if x is not None else None,
+            default=_defaults.kernel_cache_path,
+        ),
         Validator(
             "OFFLINE",
             cast=bool,
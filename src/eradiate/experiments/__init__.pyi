@@ -6,3 +6,5 @@ from ._core import Experiment as Experiment
 from ._core import MeasureRegistry as MeasureRegistry
 from ._core import run as run
 from ._dem import DEMExperiment as DEMExperiment
+from ._sink import ResultSink as ResultSink
+from ._sweep import run_sweep as run_sweep
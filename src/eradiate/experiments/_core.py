@@ -1,37 +1,51 @@
 from __future__ import annotations
 
+import contextlib
 import datetime
 import logging
 import typing as t
 import warnings
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 
 import attrs
 import mitsuba as mi
 import numpy as np
 import pinttrs
 import xarray as xr
+from axsdb import AbsorptionDatabase
 
 import eradiate
 
-from .. import converters, validators
+from ._sink import ResultSink
+from .. import config, converters, validators
 from .. import pipelines as pl
 from ..attrs import AUTO, define, documented, frozen
 from ..contexts import KernelContext
 from ..exceptions import UnsupportedModeError
 from ..kernel import (
+    AdaptiveSampling,
     KernelDict,
+    KernelDictCache,
     KernelSceneParameterMap,
     MitsubaObjectWrapper,
+    RenderCheckpoint,
     mi_load_dict,
     mi_render,
     mi_traverse,
 )
-from ..pipelines.definitions import build_pipeline
-from ..pipelines.engine import Pipeline
+from ..pipelines.definitions import build_pipeline, compile_pipeline
+from ..pipelines.engine import CompiledPipeline, Pipeline, PipelineMemo
+from ..pipelines.logic import CKDQuadAccumulator
 from ..quad import Quad
+from ..radprops import preload_absdb
 from ..rng import SeedState
+from ..scenes.atmosphere import (
+    AbstractHeterogeneousAtmosphere,
+    HeterogeneousAtmosphere,
+    MolecularAtmosphere,
+)
 from ..scenes.core import Scene, SceneElement, get_factory, traverse
 from ..scenes.illumination import (
     AbstractDirectionalIllumination,
@@ -47,8 +61,11 @@ from ..scenes.measure import (
 )
 from ..spectral.ckd_quad import CKDQuadConfig
 from ..spectral.grid import CKDSpectralGrid, MonoSpectralGrid, SpectralGrid
-from ..spectral.index import CKDSpectralIndex, MonoSpectralIndex, SpectralIndex
+from ..spectral.index import CKDSpectralIndex, SpectralIndex
+from ..typing import PathLike
 from ..units import unit_registry as ureg
+from ..util import profiling
+from ..util.misc import fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -125,6 +142,98 @@ class MeasureRegistry(Sequence):
         return self[self.get_index(value)]
 
 
+class _LazyMeasureMap(Mapping):
+    """
+    A read-only mapping from measure indices to values computed upon first
+    access.
+    """
+
+    def __init__(self, size: int, func: t.Callable[[int], t.Any]):
+        self._size = size
+        self._func = func
+
+    def __getitem__(self, index: int) -> t.Any:
+        if not 0 <= index < self._size:
+            raise KeyError(index)
+        return self._func(index)
+
+    def __iter__(self):
+        return iter(range(self._size))
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class _SpectralIndexTable:
+    """
+    An incrementally built table of unique spectral indices. Sequences of
+    spectral indices are registered as groups and stored as integer arrays of
+    positions in the table; the table maintains a sorting order of its
+    entries, updated upon insertion.
+    """
+
+    def __init__(self):
+        self.sis: list[SpectralIndex] = []
+        self._positions: dict[t.Hashable, int] = {}
+        self._hashables: list[t.Hashable] = []
+        self._groups: dict[t.Hashable, np.ndarray] = {}
+        self._ranks: np.ndarray | None = None
+
+    def add(self, group: t.Hashable, sis: t.Iterable[SpectralIndex]) -> np.ndarray:
+        """
+        Register a group of spectral indices (if not already registered) and
+        return the positions of its members in the table.
+        """
+        positions = self._groups.get(group)
+
+        if positions is None:
+            positions = []
+            for si in sis:
+                si_hash = si.as_hashable
+                position = self._positions.get(si_hash)
+                if position is None:
+                    position = self._positions[si_hash] = len(self.sis)
+                    self.sis.append(si)
+                    self._hashables.append(si_hash)
+                    self._ranks = None
+                positions.append(position)
+            positions = self._groups[group] = np.array(positions, dtype=np.int64)
+
+        return positions
+
+    @property
+    def ranks(self) -> np.ndarray:
+        """
+        Rank of each table entry in ascending spectral index order.
+        """
+        if self._ranks is None:
+            order = sorted(range(len(self.sis)), key=self._hashables.__getitem__)
+            ranks = np.empty(len(order), dtype=np.int64)
+            ranks[order] = np.arange(len(order))
+            self._ranks = ranks
+        return self._ranks
+
+
+def _spectral_grid_subset(spectral_grid: SpectralGrid, index: slice) -> SpectralGrid:
+    """
+    Return the spectral grid made of a subset of the points of another one.
+    """
+    if isinstance(spectral_grid, MonoSpectralGrid):
+        return MonoSpectralGrid(spectral_grid.wavelengths[index])
+
+    if isinstance(spectral_grid, CKDSpectralGrid):
+        return CKDSpectralGrid(
+            spectral_grid.wmins[index],
+            spectral_grid.wmaxs[index],
+            spectral_grid.wcenters[index],
+            fix_bounds="ignore",
+        )
+
+    raise TypeError(
+        f"unsupported spectral grid type '{spectral_grid.__class__.__name__}'"
+    )
+
+
 @define
 class Experiment(ABC):
     """
@@ -215,18 +324,25 @@ class Experiment(ABC):
     def background_spectral_grid(self) -> SpectralGrid:
         return self._background_spectral_grid
 
-    # Grid used to walk the spectral dimension for each measure.
-    # Set upon initialization by the '_normalize_spectral()' method.
-    _spectral_grids: dict[int, SpectralGrid] = attrs.field(
+    # Per-measure spectral data, computed upon first access and shared by
+    # measures with identical spectral response functions. Maps (kind, key)
+    # pairs to values.
+    _spectral_cache: dict[tuple[str, t.Hashable], t.Any] = attrs.field(
         factory=dict, init=False, repr=False
     )
 
+    # Unique spectral indices of all measures
+    _spectral_index_table: _SpectralIndexTable = attrs.field(
+        factory=_SpectralIndexTable, init=False, repr=False
+    )
+
     @property
-    def spectral_grids(self) -> dict[int, SpectralGrid]:
+    def spectral_grids(self) -> Mapping[int, SpectralGrid]:
         """
-        A dictionary mapping measure index to the associated spectral grid.
+        A mapping from measure index to the associated spectral grid. Spectral
+        grids are selected upon first access.
         """
-        return self._spectral_grids
+        return _LazyMeasureMap(len(self.measures), self._spectral_grid)
 
     ckd_quad_config: CKDQuadConfig = documented(
         attrs.field(
@@ -239,19 +355,19 @@ class Experiment(ABC):
         init_type=".CKDQuadConfig or dict",
     )
 
-    # CKD quadrature configuration for each bin.
-    # Set upon initialization by the '_normalize_spectral()' method.
-    _ckd_quads: dict[int, list[Quad]] = attrs.field(
-        factory=dict, init=False, repr=False
-    )
-
     @property
-    def ckd_quads(self) -> dict[int, list[Quad]]:
+    def ckd_quads(self) -> Mapping[int, list[Quad]]:
         """
-        A dictionary mapping measure index to the associated CKD quadrature rule
-        (if relevant).
+        A mapping from measure index to the associated CKD quadrature rules
+        (if relevant). Quadrature rules are generated upon first access.
         """
-        return self._ckd_quads
+        return _LazyMeasureMap(len(self.measures), self._ckd_quad)
+
+    # CKD quadrature accumulators for measures processed without retaining raw
+    # results. Set by the 'process()' method.
+    _ckd_accumulators: dict[str, CKDQuadAccumulator] = attrs.field(
+        factory=dict, init=False, repr=False
+    )
 
     def __attrs_post_init__(self):
         self._normalize_spectral()
@@ -279,35 +395,139 @@ class Experiment(ABC):
         if self._background_spectral_grid is AUTO:
             self._background_spectral_grid = SpectralGrid.default()
 
-        # Select subparts of the grid that are covered by the SRF
-        self._spectral_grids = {
-            i: self.background_spectral_grid.select(measure.srf)
-            for i, measure in enumerate(self.measures)
-        }
+        # Preload absorption data required by the selected grids
+        if abs_db is not None:
+            self._preload_absorption_data(abs_db)
+
+        # Subparts of the grid that are covered by each SRF and the associated
+        # quadrature rules are selected lazily (see _spectral_grid())
+
+    def _spectral_key(self, measure_index: int) -> t.Hashable:
+        # Key identifying the spectral data of a measure: measures with
+        # identical SRFs share the same spectral grid
+        srf = self.measures[measure_index].srf
+        cached = self._spectral_cache.get(("key", id(srf)))
+
+        # The SRF is stored with its key to keep its ID from being reused
+        if cached is None:
+            try:
+                key = fingerprint(srf)
+            except TypeError:
+                key = id(srf)
+            cached = self._spectral_cache[("key", id(srf))] = (srf, key)
+
+        return cached[1]
+
+    def _spectral_cached(
+        self, kind: str, measure_index: int, func: t.Callable[[], t.Any]
+    ) -> t.Any:
+        # Look up per-measure spectral data, computing it if necessary
+        key = (kind, self._spectral_key(measure_index))
+        try:
+            return self._spectral_cache[key]
+        except KeyError:
+            value = self._spectral_cache[key] = func()
+            return value
 
-        # Get quadrature rules for all bins
-        ckd_quads = {}
-        for i, measure in enumerate(self.measures):
-            if eradiate.mode().is_ckd:
-                spectral_grid: CKDSpectralGrid = self._spectral_grids[i]
-                ckd_quads[i] = [
-                    x[1] for x in spectral_grid.walk_quads(self.ckd_quad_config, abs_db)
-                ]
+    def _spectral_grid(self, measure_index: int) -> SpectralGrid:
+        # Select the subpart of the background grid covered by the SRF
+        return self._spectral_cached(
+            "grid",
+            measure_index,
+            lambda: self.background_spectral_grid.select(
+                self.measures[measure_index].srf
+            ),
+        )
+
+    def _ckd_quad(self, measure_index: int) -> list[Quad]:
+        # Get quadrature rules for all bins of the measure's spectral grid
+        def func():
+            if not eradiate.mode().is_ckd:
+                return []
+
+            atmosphere = getattr(self, "atmosphere", None)
+            abs_db = getattr(atmosphere, "absorption_data", None)
+            spectral_grid: CKDSpectralGrid = self._spectral_grid(measure_index)
+            return [
+                x[1] for x in spectral_grid.walk_quads(self.ckd_quad_config, abs_db)
+            ]
+
+        return self._spectral_cached("ckd_quad", measure_index, func)
+
+    def _spectral_index_positions(self, measure_index: int) -> np.ndarray:
+        # Positions of the spectral indices of a measure in the spectral index
+        # table, in spectral loop order
+        def func():
+            if eradiate.mode().is_mono:
+                spectral_grid: MonoSpectralGrid = self._spectral_grid(measure_index)
+                sis = spectral_grid.walk_indices()
+            elif eradiate.mode().is_ckd:
+                spectral_grid: CKDSpectralGrid = self._spectral_grid(measure_index)
+                sis = (
+                    CKDSpectralIndex(w=w, g=g)
+                    for w, quad in zip(
+                        spectral_grid.wcenters, self._ckd_quad(measure_index)
+                    )
+                    for g in quad.eval_nodes([0, 1])
+                )
             else:
-                ckd_quads[i] = []
-        self._ckd_quads = ckd_quads
+                raise UnsupportedModeError
+
+            return self._spectral_index_table.add(
+                self._spectral_key(measure_index), sis
+            )
+
+        return self._spectral_cached("positions", measure_index, func)
+
+    def _preload_absorption_data(
+        self, abs_db: AbsorptionDatabase
+    ) -> AbsorptionDatabase:
+        """
+        If the ``absorption_database.preload`` setting is enabled, replace the
+        absorption database of the molecular atmosphere with one holding only
+        the spectral slices required by the selected spectral grids
+        (see :func:`.preload_absdb`). The atmosphere is copied; the instance
+        passed by the user is left unchanged.
+        """
+        if not eradiate.mode().is_mono or not config.settings.get(
+            "ABSORPTION_DATABASE.PRELOAD", False
+        ):
+            return abs_db
+
+        w = np.concatenate(
+            [grid.wavelengths.m_as(ureg.nm) for grid in self.spectral_grids.values()]
+        )
+        preloaded = preload_absdb(abs_db, w * ureg.nm)
+        if preloaded is abs_db:
+            return abs_db
+
+        atmosphere = self.atmosphere
+        if isinstance(atmosphere, MolecularAtmosphere):
+            self.atmosphere = attrs.evolve(atmosphere, absorption_data=preloaded)
+        elif isinstance(atmosphere, HeterogeneousAtmosphere):
+            self.atmosphere = attrs.evolve(
+                atmosphere,
+                molecular_atmosphere=attrs.evolve(
+                    atmosphere.molecular_atmosphere, absorption_data=preloaded
+                ),
+            )
+        else:
+            return abs_db
+
+        return preloaded
 
     def clear(self) -> None:
         """
         Clear previous experiment results and reset internal state.
         """
         self.results.clear()
+        self._ckd_accumulators.clear()
 
         for measure in self.measures:
             measure.mi_results.clear()
 
     @abstractmethod
-    def init(self, drop_parameters: bool = True) -> None:
+    def init(self, drop_parameters: bool = True, prefetch: bool = True) -> None:
         """
         Generate kernel dictionary and initialize Mitsuba scene.
 
@@ -316,6 +536,21 @@ class Experiment(ABC):
         drop_parameters : bool
             If ``True``, drop Mitsuba scene parameters that are not used (*i.e.*
             that do not have an updater associated).
+
+        prefetch : bool
+            If ``True``, :meth:`process` precomputes the radiative properties
+            of heterogeneous atmospheres for the spectral indexes of the
+            processed measures before entering the spectral loop (see
+            :meth:`.AbstractHeterogeneousAtmosphere.prefetch_radprops`). This
+            speeds up scene parameter updates at the cost of memory.
+
+        Notes
+        -----
+        If the ``kernel_cache_path`` setting is set, the rendered kernel
+        dictionary and resolved parameter lookups are stored in a
+        :class:`.KernelDictCache` at this location. Subsequent initializations
+        of an experiment with an identical scene specification then skip
+        kernel dictionary assembly.
         """
         pass
 
@@ -325,6 +560,11 @@ class Experiment(ABC):
         measures: None | int | list[int] = None,
         spp: int = 0,
         seed_state: SeedState | None = None,
+        processes: int = 1,
+        keep_raw: bool = True,
+        prefetch: int = 0,
+        checkpoint: RenderCheckpoint | PathLike | None = None,
+        adaptive: AdaptiveSampling | None = None,
     ) -> None:
         """
         Run simulation and collect raw results.
@@ -343,11 +583,49 @@ class Experiment(ABC):
             Seed state used to generate seeds to initialize Mitsuba's RNG at
             every iteration of the parametric loop. If unset, Eradiate's
             :attr:`root seed state <.root_seed_state>` is used.
+
+        processes : int, optional
+            Number of worker processes the spectral loop is distributed to. By
+            default, the spectral loop runs in the current process
+            (see :func:`.mi_render`).
+
+        keep_raw : bool, optional
+            If ``False``, in CKD modes, the CKD quadrature is evaluated on the
+            fly during the spectral loop (see :class:`.CKDQuadAccumulator`)
+            and raw per-*g*-point results are not stored in
+            :attr:`.Measure.mi_results`. This divides the memory footprint of
+            raw results by the number of *g*-points per bin. This parameter is
+            ignored in monochromatic modes.
+
+        prefetch : int, optional
+            If greater than 0, scene parameters of upcoming iterations are
+            evaluated by a background thread while the current iteration is
+            rendered, with at most ``prefetch`` iterations evaluated ahead
+            (see :func:`.mi_render`).
+
+        checkpoint : .RenderCheckpoint or path-like, optional
+            If set, rendered bitmaps are persisted to this checkpoint store (a
+            path is interpreted as a checkpoint directory). If the computation
+            is interrupted, processing the same measures again with an
+            identically initialized seed state only renders the iterations
+            missing from the checkpoint (see :func:`.mi_render`).
+
+        adaptive : .AdaptiveSampling, optional
+            If set, each iteration is rendered in successive passes until the
+            relative standard error of each measure reaches a target value
+            (see :class:`.AdaptiveSampling`). The effective sample count of
+            each iteration is stored in the ``spp`` result variable. This
+            requires the moment integrator.
         """
         pass
 
     @abstractmethod
-    def postprocess(self, measures: None | int | list[int] = None) -> None:
+    def postprocess(
+        self,
+        measures: None | int | list[int] = None,
+        threads: int = 1,
+        sink: ResultSink | PathLike | None = None,
+    ) -> None:
         """
         Post-process raw results and store them in :attr:`results`.
 
@@ -356,6 +634,19 @@ class Experiment(ABC):
         measures : int or list of int, optional
             Indices of the measures that will be processed. By default, all
             measures are processed.
+
+        threads : int, optional
+            Number of threads used to execute independent branches of the
+            post-processing pipelines concurrently (see
+            :meth:`.Pipeline.execute`). By default, pipelines are executed
+            sequentially.
+
+        sink : .ResultSink or path-like, optional
+            If set, results are written incrementally, one chunk of the
+            spectral grid at a time, to this on-disk store (a path is
+            interpreted as a store location, see :class:`.ResultSink`), and
+            :attr:`results` entries are lazy datasets opened from the store.
+            Otherwise, results are held in memory.
         """
         pass
 
@@ -483,6 +774,13 @@ class EarthObservationExperiment(Experiment, ABC):
         default="{}",
     )
 
+    # Heterogeneous atmospheres of the scene from which the kernel scene
+    # parameter map was built, for which 'process()' precomputes radiative
+    # properties. Set by the 'init()' method.
+    _prefetch_atmospheres: list[AbstractHeterogeneousAtmosphere] = attrs.field(
+        factory=list, init=False, repr=False
+    )
+
     def kdict_base(self) -> KernelDict:
         # This is inefficient and exists at the moment only for debugging purposes
         return traverse(self.scene)[0]
@@ -543,28 +841,9 @@ class EarthObservationExperiment(Experiment, ABC):
             Spectral index.
         """
 
-        if eradiate.mode().is_mono:
-            spectral_grid: MonoSpectralGrid = self.spectral_grids[measure_index]
-
-            def generator():
-                yield from spectral_grid.walk_indices()
-
-        elif eradiate.mode().is_ckd:
-            spectral_grid: CKDSpectralGrid = self.spectral_grids[measure_index]
-            quad_config = self.ckd_quad_config
-            try:
-                abs_db = self.atmosphere.abs_db
-            except (
-                AttributeError
-            ):  # There is either no atmosphere or no absorption database
-                abs_db = None
-
-            def generator():
-                yield from spectral_grid.walk_indices(quad_config, abs_db)
-        else:
-            raise UnsupportedModeError
-
-        yield from generator()
+        sis = self._spectral_index_table.sis
+        for position in self._spectral_index_positions(measure_index):
+            yield sis[position]
 
     def context_init(self):
         # Inherit docstring
@@ -598,35 +877,36 @@ class EarthObservationExperiment(Experiment, ABC):
             measure = self.measures[measure_index]
             measure_to_sensor[measure_index] = mi_sensors_ids.index(measure.sensor_id)
 
-        # Collect contexts from all measures
-        # Maps spectral index hash to (spectral index, active sensor list)
-        si_hash_to_si = {}
+        if not measures:
+            return []
 
-        for measure_index in measures:
-            sis = list(self.spectral_indices(measure_index))
-            sensor_index = measure_to_sensor[measure_index]
-            for si in sis:
-                si_hash = si.as_hashable
-                if si_hash not in si_hash_to_si:
-                    si_hash_to_si[si_hash] = (si, [sensor_index])
-                else:
-                    si_hash_to_si[si_hash][1].append(sensor_index)
+        # Collect the spectral index table positions of all measures and the
+        # matching sensor indices
+        positions = [self._spectral_index_positions(i) for i in measures]
+        sensors = np.concatenate(
+            [np.full(len(p), measure_to_sensor[i]) for i, p in zip(measures, positions)]
+        )
+        positions = np.concatenate(positions)
+
+        # Group sensors by spectral index, in ascending spectral index order
+        # (the stable sort preserves measure order within groups)
+        ranks = self._spectral_index_table.ranks[positions]
+        order = np.argsort(ranks, kind="stable")
+        ranks = ranks[order]
+        starts = np.flatnonzero(np.diff(ranks, prepend=-1))
 
         # Generate final list of contexts
+        sis = self._spectral_index_table.sis
         kwargs = self._context_kwargs()
-        result = [
-            KernelContext(si, active_sensors=active_sensors, kwargs=kwargs)
-            for si, active_sensors in si_hash_to_si.values()
+        return [
+            KernelContext(
+                sis[position], active_sensors=active_sensors.tolist(), kwargs=kwargs
+            )
+            for position, active_sensors in zip(
+                positions[order][starts], np.split(sensors[order], starts[1:])
+            )
         ]
 
-        key = {
-            MonoSpectralIndex: lambda ctx: ctx.si.w.m,
-            CKDSpectralIndex: lambda ctx: (ctx.si.w.m, ctx.si.g),
-        }[SpectralIndex.subtypes.resolve()]
-        result.sort(key=key)
-
-        return result
-
     @property
     @abstractmethod
     def scene_objects(self) -> dict[str, SceneElement]:
@@ -652,36 +932,134 @@ class EarthObservationExperiment(Experiment, ABC):
         """
         return Scene(objects={**self.scene_objects, **self.extra_objects})
 
-    def init(self, drop_parameters: bool = True):
+    def init(self, drop_parameters: bool = True, prefetch: bool = True):
         # Inherit docstring
 
         logger.info("Initializing kernel scene")
 
-        kdict_template, umap_template = traverse(self.scene)
-        kdict_template.update(self.kdict)
-        umap_template.update(self.kpmap)
+        scene = self.scene
+        ctx = self.context_init()
 
-        try:
-            ctx = self.context_init()
-            self.mi_scene = mi_traverse(
-                mi_load_dict(kdict_template.render(ctx=ctx)),
-                umap_template=umap_template,
+        # Look up the rendered kernel dictionary in the persistent cache
+        cache, cache_key, cached = None, None, None
+        cache_path = config.settings.get("KERNEL_CACHE_PATH")
+
+        if cache_path is not None:
+            cache = KernelDictCache(cache_path)
+            cache_key = cache.key(
+                (scene, self.kdict, {k: v.search for k, v in self.kpmap.items()}, ctx)
             )
+            if cache_key is not None:
+                cached = cache.load(cache_key)
+
+        if cached is None:
+            kdict_template, umap_template = self._kernel_templates(scene)
+            with profiling.stage("kdict_render"):
+                kdict = kdict_template.render(ctx=ctx)
+
+        else:
+            # Only the parameter update map is collected; parameter lookups
+            # resolved upon caching are reused
+            logger.info("Using cached kernel scene dictionary")
+            kdict, parameter_ids = cached
+            kdict_template = KernelDict(kdict)
+            with profiling.stage("traverse"):
+                umap_template = traverse(scene, templates=False)[1]
+            umap_template.update(self.kpmap)
+
+            for key, parameter_id in parameter_ids.items():
+                uparam = umap_template.get(key)
+                if uparam is not None and uparam.parameter_id is None:
+                    uparam.parameter_id = parameter_id
+
+        try:
+            with profiling.stage("mi_load_dict"):
+                mi_obj = mi_load_dict(kdict)
+            with profiling.stage("mi_traverse"):
+                self.mi_scene = mi_traverse(mi_obj, umap_template=umap_template)
         except RuntimeError as e:
             raise RuntimeError(f"(while loading kernel scene dictionary){e}") from e
 
+        if cache_key is not None and cached is None:
+            cache.save(
+                cache_key,
+                kdict,
+                {
+                    k: v.parameter_id
+                    for k, v in self.mi_scene.umap_template.items()
+                    if v.search is not None and v.parameter_id is not None
+                },
+            )
+
+        # Keep track of the template so that the scene can be reloaded (e.g. by
+        # worker processes)
+        self.mi_scene.kdict_template = kdict_template
+        self.mi_scene.ctx_init = ctx
+
         # Remove unused elements from Mitsuba scene parameter table
         if drop_parameters:
             self.mi_scene.drop_parameters()
 
+        # Spectral radiative properties of heterogeneous atmospheres are
+        # precomputed upon processing, for the processed measures only
+        self._set_prefetch_scene(scene if prefetch else None)
+
+    def _kernel_templates(
+        self, scene: Scene | None = None
+    ) -> tuple[KernelDict, KernelSceneParameterMap]:
+        # Collect the kernel dictionary and update map templates of the scene,
+        # merged with user-defined contributions
+        if scene is None:
+            scene = self.scene
+
+        with profiling.stage("traverse"):
+            kdict_template, umap_template = traverse(scene)
+        kdict_template.update(self.kdict)
+        umap_template.update(self.kpmap)
+        return kdict_template, umap_template
+
+    def _set_prefetch_scene(self, scene: Scene | None) -> None:
+        # Track the heterogeneous atmospheres of the scene from which the
+        # kernel scene parameter map was built: parameter updates evaluate
+        # these instances, which are not those of the 'scene' property
+        self._prefetch_atmospheres = (
+            []
+            if scene is None
+            else [
+                obj
+                for obj in scene.objects.values()
+                if isinstance(obj, AbstractHeterogeneousAtmosphere)
+            ]
+        )
+
+    def _prefetch_radprops(self, ctxs: list[KernelContext]) -> None:
+        # Precompute the radiative properties of heterogeneous atmospheres for
+        # the spectral indices of the passed contexts
+        if self._prefetch_atmospheres:
+            logger.info("Precomputing atmosphere radiative properties")
+            sis = [ctx.si for ctx in ctxs]
+            for atmosphere in self._prefetch_atmospheres:
+                atmosphere.prefetch_radprops(sis)
+
     def process(
         self,
         measures: None | int | str | list[int | str] = None,
         spp: int = 0,
         seed_state: SeedState | None = None,
+        processes: int = 1,
+        keep_raw: bool = True,
+        prefetch: int = 0,
+        checkpoint: RenderCheckpoint | PathLike | None = None,
+        adaptive: AdaptiveSampling | None = None,
     ) -> None:
         # Inherit docstring
 
+        if adaptive is not None and not self.integrator.moment:
+            raise ValueError(
+                "adaptive sampling requires the moment integrator; set "
+                "'integrator.moment' to True"
+            )
+
         # Set up Mitsuba scene
         if self.mi_scene is None:
             self.init()
@@ -698,9 +1076,22 @@ class EarthObservationExperiment(Experiment, ABC):
         measure_idxs = [self.measures.get_index(measure.id) for measure in measures]
         ctxs = self.contexts(measure_idxs)
 
-        # Run Mitsuba for each context
-        logger.info("Launching simulation")
-        mi_results = mi_render(self.mi_scene, ctxs=ctxs, seed_state=seed_state, spp=spp)
+        # Precompute spectral radiative properties of heterogeneous atmospheres
+        self._prefetch_radprops(ctxs)
+
+        # Set up on-the-fly CKD quadrature evaluation if requested
+        accumulate = not keep_raw and eradiate.mode().is_ckd
+        for measure_idx, measure in zip(measure_idxs, measures):
+            if accumulate:
+                measure.mi_results.clear()
+                self._ckd_accumulators[measure.id] = CKDQuadAccumulator(
+                    spectral_grid=self.spectral_grids[measure_idx],
+                    ckd_quads=self.ckd_quads[measure_idx],
+                    calculate_variance=self.integrator.moment,
+                    calculate_stokes=self.integrator.stokes,
+                )
+            else:
+                self._ckd_accumulators.pop(measure.id, None)
 
         # Assign collected results to the appropriate measure
         sensor_to_measure: dict[str, Measure] = {
@@ -708,7 +1099,9 @@ class EarthObservationExperiment(Experiment, ABC):
         }
 
         def convert_to_y_format(img):
-            img_np = np.array(img, copy=False)[:, :, [0]]
+            # Extract the first channel as a view: the bitmap constructor
+            # performs the only copy
+            img_np = np.asarray(img)[:, :, 0]
             return mi.Bitmap(img_np, mi.Bitmap.PixelFormat.Y)
 
         # Map bitmap names to result names
@@ -726,11 +1119,17 @@ class EarthObservationExperiment(Experiment, ABC):
         if self.integrator.moment:
             mapping["m2_nested"] = "m2"
 
-        # gather results and info from measures
-        for ctx_index, spectral_group_dict in mi_results.items():
+        # Gather results and info from measures as soon as a context is rendered
+        def collect(ctx, spectral_group_dict, sample_counts=None):
+            ctx_index = ctx.si.as_hashable
+
             for sensor_id, mi_bitmap in spectral_group_dict.items():
                 measure = sensor_to_measure[sensor_id]
-                result_imgs = {"spp": spp if spp > 0 else measure.spp}
+                if sample_counts is not None:
+                    # Adaptive sampling: each iteration has its own sample count
+                    result_imgs = {"spp": sample_counts[sensor_id]}
+                else:
+                    result_imgs = {"spp": spp if spp > 0 else measure.spp}
 
                 splits = mi_bitmap.split()
                 for split in splits:
@@ -741,9 +1140,32 @@ class EarthObservationExperiment(Experiment, ABC):
                             img = convert_to_y_format(img)
                         result_imgs[mapping[split[0]]] = img
 
-                measure.mi_results[ctx_index] = result_imgs
+                accumulator = self._ckd_accumulators.get(measure.id)
+                if accumulator is None:
+                    measure.mi_results[ctx_index] = result_imgs
+                else:
+                    accumulator.add(ctx_index, result_imgs)
 
-    def postprocess(self, measures: None | int | list[int] = None) -> None:
+        # Run Mitsuba for each context
+        logger.info("Launching simulation")
+        mi_render(
+            self.mi_scene,
+            ctxs=ctxs,
+            seed_state=seed_state,
+            spp=spp,
+            processes=processes,
+            callback=collect,
+            prefetch=prefetch,
+            checkpoint=checkpoint,
+            adaptive=adaptive,
+        )
+
+    def postprocess(
+        self,
+        measures: None | int | list[int] = None,
+        threads: int = 1,
+        sink: ResultSink | PathLike | None = None,
+    ) -> None:
         # Inherit docstring
         logger.info("Post-processing results")
 
@@ -753,33 +1175,130 @@ class EarthObservationExperiment(Experiment, ABC):
             if isinstance(measures, (int, str)):
                 measures = [self.measures.get_index(measures)]
 
-        # Run pipelines
-        for i in measures:
-            measure = self.measures[i]
-            pipeline: Pipeline = self.pipeline(measure)
-            inputs = self._pipeline_inputs(i)
-            outputs = pipeline.get_nodes_by_metadata(final=True, kind="data")
-            result = pipeline.execute(outputs=outputs, inputs=inputs)
-            self.results[measure.id] = xr.Dataset({var: result[var] for var in outputs})
+        if sink is not None and not isinstance(sink, ResultSink):
+            sink = ResultSink(sink)
+
+        # Outputs which only depend on the measure and illumination
+        # specifications (e.g. the spectral response) are shared by measures
+        memo = PipelineMemo() if len(measures) > 1 else None
+
+        with contextlib.ExitStack() as stack:
+            executor = (
+                stack.enter_context(ThreadPoolExecutor(max_workers=threads))
+                if threads > 1
+                else None
+            )
+
+            # Run pipelines (compiled plans are shared by equal configurations)
+            for i in measures:
+                measure = self.measures[i]
+                config = self._pipeline_config(measure)
+                pipeline = compile_pipeline(config)
+                inputs = self._pipeline_inputs(i, config)
+                outputs = pipeline.get_nodes_by_metadata(final=True, kind="data")
+
+                if sink is not None:
+                    self.results[measure.id] = self._postprocess_to_sink(
+                        measure, pipeline, outputs, inputs, sink, executor, memo
+                    )
+                    continue
+
+                result = pipeline.execute(
+                    outputs=outputs, inputs=inputs, executor=executor, memo=memo
+                )
+                self.results[measure.id] = xr.Dataset(
+                    {var: result[var] for var in outputs}
+                )
+
+    def _postprocess_to_sink(
+        self,
+        measure: Measure,
+        pipeline: CompiledPipeline,
+        outputs: list[str],
+        inputs: dict,
+        sink: ResultSink,
+        executor,
+        memo: PipelineMemo | None,
+    ) -> xr.Dataset:
+        """
+        Execute a measure's post-processing pipeline chunk by chunk along the
+        spectral grid, write results to a sink and return the stored results
+        as a lazy dataset.
+        """
+        srf_outputs = pipeline.get_nodes_by_metadata(final=True, kind="data", srf=True)
+        spectral_outputs = [var for var in outputs if var not in srf_outputs]
+        metadata = self._dataset_metadata(measure)
+
+        # Spectral variables: each chunk is processed from the subset of
+        # inputs associated with its spectral grid points
+        spectral_grid = inputs["spectral_grid"]
+        ckd_quads = inputs.get("ckd_quads")
+        bitmaps = inputs.get("bitmaps")
+
+        for i_chunk, chunk in enumerate(sink.chunks(len(spectral_grid.wavelengths))):
+            chunk_grid = _spectral_grid_subset(spectral_grid, chunk)
+            chunk_inputs = {**inputs, "spectral_grid": chunk_grid}
+
+            if ckd_quads is not None:
+                chunk_inputs["ckd_quads"] = ckd_quads[chunk]
+
+            if bitmaps is not None:
+                ws = set(chunk_grid.wavelengths.m_as(ureg.nm).tolist())
+                chunk_inputs["bitmaps"] = {
+                    key: value
+                    for key, value in bitmaps.items()
+                    if (key[0] if isinstance(key, tuple) else key) in ws
+                }
+
+            result = pipeline.execute(
+                outputs=spectral_outputs,
+                inputs=chunk_inputs,
+                executor=executor,
+                memo=memo,
+            )
+            ds = xr.Dataset({var: result[var] for var in spectral_outputs})
+            ds.attrs.update(metadata)
+            sink.write(measure.id, ds, append=i_chunk > 0)
+
+        # SRF-weighted variables are evaluated from stored spectral variables
+        # (outputs are not memoized: fingerprinting lazy inputs would load them)
+        if srf_outputs:
+            stored = sink.open(measure.id)
+            result = pipeline.execute(
+                outputs=srf_outputs,
+                inputs={**inputs, **{var: stored[var] for var in spectral_outputs}},
+                executor=executor,
+            )
+            sink.update(
+                measure.id, xr.Dataset({var: result[var] for var in srf_outputs})
+            )
+
+        return sink.open(measure.id)
 
     def pipeline(self, measure: Measure | int | str) -> Pipeline:
         # Inherit docstring
         if isinstance(measure, (int, str)):
             measure = self.measures.resolve(measure)
+        return build_pipeline(self._pipeline_config(measure))
+
+    def _pipeline_config(self, measure: Measure) -> dict:
+        # This convenience function generates the pipeline configuration for a
+        # specific measure
         config = pl.config(measure, integrator=self.integrator)
-        return build_pipeline(config)
+        config["accumulate_ckd_quad"] = measure.id in self._ckd_accumulators
+        return config
 
-    def _pipeline_inputs(self, i_measure: int):
-        # This convenience function collects pipeline inputs for a specific measure
+    def _pipeline_inputs(self, i_measure: int, config: dict | None = None):
+        # This convenience function collects pipeline inputs for a specific
+        # measure; the pipeline configuration may be passed if already known
 
         measure = self.measures[i_measure]
-        config = pl.config(measure, integrator=self.integrator)
+        if config is None:
+            config = self._pipeline_config(measure)
 
         result = {
             # Runtime data
-            "bitmaps": measure.mi_results,
             "spectral_grid": self.spectral_grids[i_measure],
-            "ckd_quads": self.ckd_quads[i_measure],
             "illumination": self.illumination,
             # Config scalars required as virtual inputs
             "mode_id": config["mode_id"],
@@ -789,6 +1308,12 @@ class EarthObservationExperiment(Experiment, ABC):
             "calculate_stokes": config["calculate_stokes"],
         }
 
+        if config["accumulate_ckd_quad"]:
+            result["accumulator"] = self._ckd_accumulators[measure.id]
+        else:
+            result["bitmaps"] = measure.mi_results
+            result["ckd_quads"] = self.ckd_quads[i_measure]
+
         if config.get("apply_spectral_response", False):
             result["srf"] = measure.srf
 
@@ -810,6 +1335,12 @@ def run(
     measures: None | int | str | list[int | str] = None,
     spp: int = 0,
     seed_state: SeedState | None = None,
+    processes: int = 1,
+    keep_raw: bool = True,
+    prefetch: int = 0,
+    checkpoint: RenderCheckpoint | PathLike | None = None,
+    sink: ResultSink | PathLike | None = None,
+    adaptive: AdaptiveSampling | None = None,
 ) -> xr.Dataset | dict[str, xr.Dataset]:
     """
     Run an Eradiate experiment. This function performs kernel scene assembly,
@@ -835,6 +1366,37 @@ def run(
             every iteration of the parametric loop. If unset, Eradiate's
             :attr:`root seed state <.root_seed_state>` is used.
 
+    processes : int, optional, default: 1
+        Number of worker processes the spectral loop is distributed to. By
+        default, the spectral loop runs in the current process
+        (see :func:`.mi_render`).
+
+    keep_raw : bool, optional, default: True
+        If ``False``, in CKD modes, the CKD quadrature is evaluated during the
+        spectral loop and raw per-*g*-point results are not retained (see
+        :meth:`.Experiment.process`).
+
+    prefetch : int, optional, default: 0
+        If greater than 0, scene parameters of upcoming spectral loop
+        iterations are evaluated by a background thread while the current
+        iteration is rendered (see :func:`.mi_render`).
+
+    checkpoint : .RenderCheckpoint or path-like, optional
+        If set, rendered bitmaps are persisted to this checkpoint store and
+        iterations already stored are not rendered again (see
+        :meth:`.Experiment.process`).
+
+    sink : .ResultSink or path-like, optional
+        If set, post-processed results are written incrementally to this
+        on-disk store and returned as lazy datasets opened from it (see
+        :meth:`.Experiment.postprocess`). This allows for processing results
+        which do not fit in memory.
+
+    adaptive : .AdaptiveSampling, optional
+        If set, spectral loop iterations are rendered progressively until a
+        target relative standard error is reached (see
+        :meth:`.Experiment.process`).
+
     Returns
     -------
     Dataset or dict[str, Dataset]
@@ -854,10 +1416,34 @@ def run(
     if isinstance(measures, (int, str)):
         measures = [measures]
 
-    exp.process(spp=spp, measures=measures, seed_state=seed_state)
-    exp.postprocess(measures=measures)
+    if exp.mi_scene is None:
+        with profiling.stage("init"):
+            exp.init()
+
+    with profiling.stage("process"):
+        exp.process(
+            spp=spp,
+            measures=measures,
+            seed_state=seed_state,
+            processes=processes,
+            keep_raw=keep_raw,
+            prefetch=prefetch,
+            checkpoint=checkpoint,
+            adaptive=adaptive,
+        )
+
+    with profiling.stage("postprocess"):
+        exp.postprocess(measures=measures, sink=sink)
 
     measure_ids = [exp.measures.get_id(m) for m in measures]
+
+    # Attach the profiling report to results if profiling is enabled
+    profiler = profiling.get_profiler()
+    if profiler is not None:
+        report = profiler.to_json()
+        for measure_id in measure_ids:
+            exp.results[measure_id].attrs["profile"] = report
+
     return (
         {x: exp.results[x] for x in measure_ids}
         if len(measure_ids) > 1
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import logging
+import shutil
+import typing as t
+from pathlib import Path
+
+import attrs
+import xarray as xr
+
+from ..attrs import define, documented
+
+logger = logging.getLogger(__name__)
+
+
+def _require(module: str) -> None:
+    # Check that an optional dependency of the sink is installed
+    try:
+        __import__(module)
+    except ImportError:
+        raise ImportError(
+            f"{module} is required to stream results to disk. Install with: "
+            f"pip install {module}"
+        ) from None
+
+
+def _format_default(self) -> str:
+    return "zarr" if self.path.suffix == ".zarr" else "netcdf"
+
+
+@define
+class ResultSink:
+    """
+    An on-disk store to which post-processed experiment results are written
+    incrementally.
+
+    When passed to :meth:`.Experiment.postprocess` or :func:`.run`, the
+    post-processing pipeline of each measure is executed for successive chunks
+    of :attr:`chunk_size` points of the spectral grid, and each chunk is
+    appended to the store along the ``w`` dimension before the next one is
+    processed. SRF-weighted variables, which have no spectral dimension, are
+    then evaluated from the stored data. Results are finally opened from the
+    store as lazy, dask-backed datasets.
+
+    Each measure's results are stored under its ID:
+
+    * ``"zarr"`` format: a group of a Zarr store located at :attr:`path`;
+    * ``"netcdf"`` format: a subdirectory of :attr:`path` holding one NetCDF
+      file per spectral chunk and a file holding SRF-weighted variables.
+
+    Notes
+    -----
+    * Opening results requires `dask <https://www.dask.org/>`_; the Zarr
+      format additionally requires `zarr <https://zarr.dev/>`_.
+    * Writing results for a measure overwrites previously stored results for
+      that measure.
+    """
+
+    path: Path = documented(
+        attrs.field(converter=lambda x: Path(x).expanduser().resolve()),
+        doc="Path to the store. It is created upon first write.",
+        type="Path",
+        init_type="path-like",
+    )
+
+    format: t.Literal["netcdf", "zarr"] = documented(
+        attrs.field(
+            default=attrs.Factory(_format_default, takes_self=True),
+            validator=attrs.validators.in_({"netcdf", "zarr"}),
+        ),
+        doc='Storage format. By default, ``"zarr"`` is selected if :attr:`path` '
+        'has the ``.zarr`` suffix, and ``"netcdf"`` otherwise.',
+        type='{"netcdf", "zarr"}',
+        init_type='{"netcdf", "zarr"}, optional',
+    )
+
+    chunk_size: int = documented(
+        attrs.field(
+            default=16,
+            converter=int,
+            validator=attrs.validators.gt(0),
+        ),
+        doc="Number of spectral grid points (CKD bins or monochromatic "
+        "wavelengths) post-processed and written at once.",
+        type="int",
+        init_type="int, optional",
+        default="16",
+    )
+
+    def chunks(self, n: int) -> list[slice]:
+        """
+        Split a spectral grid of ``n`` points into chunks.
+
+        Returns
+        -------
+        list of slice
+        """
+        return [
+            slice(start, min(start + self.chunk_size, n))
+            for start in range(0, n, self.chunk_size)
+        ]
+
+    def _measure_path(self, measure_id: str) -> Path:
+        return self.path / measure_id
+
+    def write(self, measure_id: str, ds: xr.Dataset, append: bool = False) -> None:
+        """
+        Write a chunk of spectral results.
+
+        Parameters
+        ----------
+        measure_id : str
+            ID of the measure the results belong to.
+
+        ds : Dataset
+            Results with a ``w`` dimension.
+
+        append : bool, optional
+            If ``True``, ``ds`` is appended to stored results along the ``w``
+            dimension. Otherwise, stored results are overwritten.
+        """
+        if self.format == "zarr":
+            _require("zarr")
+            if append:
+                ds.to_zarr(self.path, group=measure_id, append_dim="w")
+            else:
+                ds.to_zarr(self.path, group=measure_id, mode="w")
+
+        else:
+            path = self._measure_path(measure_id)
+            if not append and path.exists():
+                shutil.rmtree(path)
+            path.mkdir(parents=True, exist_ok=True)
+            index = len(list(path.glob("w_*.nc")))
+            ds.to_netcdf(path / f"w_{index:05d}.nc")
+
+        logger.debug(
+            "Wrote %d spectral points of results for measure '%s' to '%s'",
+            ds.sizes["w"],
+            measure_id,
+            self.path,
+        )
+
+    def update(self, measure_id: str, ds: xr.Dataset) -> None:
+        """
+        Add variables without a spectral dimension (*e.g.* SRF-weighted
+        variables) to stored results.
+
+        Parameters
+        ----------
+        measure_id : str
+            ID of the measure the results belong to.
+
+        ds : Dataset
+            Results without a ``w`` dimension.
+        """
+        if self.format == "zarr":
+            _require("zarr")
+            ds.to_zarr(self.path, group=measure_id, mode="a")
+        else:
+            ds.to_netcdf(self._measure_path(measure_id) / "srf.nc")
+
+    def open(self, measure_id: str) -> xr.Dataset:
+        """
+        Open stored results as a lazy, dask-backed dataset.
+
+        Parameters
+        ----------
+        measure_id : str
+            ID of the measure the results belong to.
+
+        Returns
+        -------
+        Dataset
+        """
+        _require("dask")
+
+        if self.format == "zarr":
+            _require("zarr")
+            return xr.open_zarr(self.path, group=measure_id, chunks={})
+
+        path = self._measure_path(measure_id)
+        result = xr.open_mfdataset(
+            sorted(path.glob("w_*.nc")),
+            combine="nested",
+            concat_dim="w",
+            data_vars="minimal",
+            coords="minimal",
+            compat="override",
+        )
+
+        filename = path / "srf.nc"
+        if filename.is_file():
+            result = xr.merge(
+                [result, xr.open_dataset(filename, chunks={})],
+                compat="override",
+                combine_attrs="override",
+            )
+
+        return result
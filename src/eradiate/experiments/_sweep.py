@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import logging
+import typing as t
+from collections.abc import Mapping, Sequence
+
+import attrs
+import numpy as np
+import numpy.typing as npt
+import xarray as xr
+
+from ._core import EarthObservationExperiment, run
+from ..attrs import define
+from ..contexts import KernelContext
+from ..kernel import (
+    AdaptiveSampling,
+    KernelDict,
+    KernelSceneParameterMap,
+    MitsubaObjectWrapper,
+)
+from ..kernel._cache import _encode
+from ..rng import SeedState
+from ..scenes.core import Scene
+from ..util import profiling
+from ..util.misc import fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+@define
+class _LoadedScene:
+    # A loaded kernel scene and the flat kernel dictionary it was loaded from
+
+    mi_scene: MitsubaObjectWrapper
+    kdict: dict[str, t.Any]
+    fingerprints: dict[str, str | None]
+
+
+def _fingerprints(kdict: dict[str, t.Any]) -> dict[str, str | None]:
+    # Fingerprint the values of a flat kernel dictionary; values which cannot
+    # be fingerprinted (e.g. Mitsuba objects) are mapped to None
+    result = {}
+
+    for key, value in kdict.items():
+        try:
+            result[key] = fingerprint(_encode(value))
+        except TypeError:
+            result[key] = None
+
+    return result
+
+
+def _kernel_updates(
+    loaded: _LoadedScene,
+    kdict: dict[str, t.Any],
+    fingerprints: dict[str, str | None],
+    umap_template: KernelSceneParameterMap,
+) -> list[str] | None:
+    """
+    Classify the differences between a rendered kernel dictionary and the one
+    from which a kernel scene was loaded. Return the keys of the entries which
+    can be applied as kernel scene parameter updates, or ``None`` if the
+    differences are structural.
+    """
+    # Changes to the set of objects or parameters are structural
+    if fingerprints.keys() != loaded.fingerprints.keys():
+        return None
+
+    if umap_template.keys() != loaded.mi_scene.umap_template.keys():
+        return None
+
+    result = []
+    parameters = loaded.mi_scene.parameters
+
+    for key, value in fingerprints.items():
+        reference = loaded.fingerprints[key]
+
+        if value is None or reference is None:
+            changed = kdict[key] is not loaded.kdict[key]
+        else:
+            changed = value != reference
+
+        if changed:
+            # Values which are not exposed as kernel scene parameters (e.g.
+            # plugin types) can only be modified by reloading the scene
+            if key not in parameters:
+                return None
+            result.append(key)
+
+    return result
+
+
+def _update_kernel_scene(
+    exp: EarthObservationExperiment,
+    scene: Scene,
+    loaded: _LoadedScene | None,
+    kdict_template: KernelDict,
+    umap_template: KernelSceneParameterMap,
+    ctx: KernelContext,
+) -> _LoadedScene:
+    """
+    Set up the kernel scene of an experiment, reusing a loaded kernel scene if
+    possible.
+    """
+    with profiling.stage("kdict_render"):
+        kdict = kdict_template.render(ctx, nested=False)
+    fingerprints = _fingerprints(kdict)
+
+    updates = (
+        _kernel_updates(loaded, kdict, fingerprints, umap_template)
+        if loaded is not None
+        else None
+    )
+
+    if updates is not None:
+        # Parameter lookups resolved upon loading are reused
+        for key, uparam in umap_template.items():
+            if uparam.search is not None and uparam.parameter_id is None:
+                uparam.parameter_id = loaded.mi_scene.umap_template[key].parameter_id
+
+        mi_scene = attrs.evolve(
+            loaded.mi_scene,
+            umap_template=umap_template,
+            kdict_template=kdict_template,
+            ctx_init=ctx,
+        )
+
+        try:
+            with profiling.stage("parameters_update"):
+                for key in updates:
+                    mi_scene.parameters[key] = kdict[key]
+                mi_scene.parameters.update()
+        except (TypeError, ValueError, RuntimeError) as e:
+            logger.warning(
+                "Could not update kernel scene parameters %s (%s); "
+                "reloading kernel scene",
+                updates,
+                e,
+            )
+            updates = None
+
+    if updates is None:
+        logger.info("Sweep: loading kernel scene")
+        # Parameters are kept to allow for subsequent updates
+        exp.init(drop_parameters=False)
+        return _LoadedScene(exp.mi_scene, kdict, fingerprints)
+
+    logger.info("Sweep: updating %d kernel scene parameter(s)", len(updates))
+    exp.mi_scene = mi_scene
+    exp._set_prefetch_scene(scene)
+    return _LoadedScene(mi_scene, kdict, fingerprints)
+
+
+def run_sweep(
+    exp: EarthObservationExperiment,
+    overrides: Sequence[Mapping[str, t.Any]],
+    dim: str = "sweep",
+    coords: npt.ArrayLike | None = None,
+    measures: None | int | str | list[int | str] = None,
+    spp: int = 0,
+    seed_state: SeedState | None = None,
+    processes: int = 1,
+    keep_raw: bool = True,
+    prefetch: int = 0,
+    adaptive: AdaptiveSampling | None = None,
+) -> xr.Dataset | dict[str, xr.Dataset]:
+    """
+    Run a parameter sweep based on an Eradiate experiment. For each override,
+    a modified copy of the experiment is run and results are concatenated
+    along a new sweep dimension.
+
+    The kernel scene is loaded once and reused across sweep steps whenever
+    possible. Each override is classified by comparing the kernel dictionary
+    of the modified experiment with that of the loaded kernel scene:
+
+    * if only values exposed as kernel scene parameters differ (*e.g.* surface
+      reflectance spectra), the loaded kernel scene is updated;
+    * otherwise (*e.g.* a changed surface or phase function type, an added
+      object), the change is structural and the kernel scene is reloaded.
+
+    Parameters
+    ----------
+    exp : .EarthObservationExperiment
+        Base experiment. It is not modified.
+
+    overrides : sequence of mapping
+        Field values overriding those of the base experiment for each sweep
+        step. They are passed as keyword arguments to :func:`attrs.evolve`
+        and may therefore be dictionary specifications, *e.g.*
+        ``{"surface": {"type": "lambertian", "reflectance": 0.5}}``.
+
+    dim : str, optional, default: "sweep"
+        Name of the sweep dimension.
+
+    coords : array-like, optional
+        Coordinate values of the sweep dimension. By default, the sweep step
+        index is used.
+
+    measures : int or str or list of int or str, optional
+        Indices of the measures that will be processed. By default, all measures
+        are processed.
+
+    spp : int, optional, default: 0
+        Optional parameter to override the number of samples per pixel for all
+        computed measures (see :func:`.run`).
+
+    seed_state : :class:`.SeedState`, optional
+        Seed state used to generate seeds to initialize Mitsuba's RNG (see
+        :func:`.run`).
+
+    processes : int, optional, default: 1
+        Number of worker processes the spectral loop is distributed to (see
+        :func:`.run`).
+
+    keep_raw : bool, optional, default: True
+        Whether raw per-*g*-point results are retained in CKD modes (see
+        :func:`.run`).
+
+    prefetch : int, optional, default: 0
+        Depth of the scene parameter prefetch queue of the spectral loop (see
+        :func:`.run`).
+
+    adaptive : .AdaptiveSampling, optional
+        Adaptive sampling configuration of the spectral loop (see
+        :func:`.run`).
+
+    Returns
+    -------
+    Dataset or dict[str, Dataset]
+        If a single measure is processed, a single xarray dataset is returned.
+        If several measures are processed, a dictionary mapping measure IDs to
+        the corresponding result dataset is returned.
+
+    Raises
+    ------
+    ValueError
+        If ``overrides`` is empty or if ``coords`` and ``overrides`` have
+        different lengths.
+
+    Notes
+    -----
+    Kernel scene parameter tables are not reduced upon loading (see
+    :meth:`.Experiment.init`), so that values exposed as parameters can be
+    updated.
+    """
+    if not overrides:
+        raise ValueError("at least one override is required")
+
+    if coords is None:
+        coords = np.arange(len(overrides))
+    else:
+        coords = np.asarray(coords)
+        if len(coords) != len(overrides):
+            raise ValueError(
+                f"coords has length {len(coords)}, but {len(overrides)} "
+                "overrides were passed"
+            )
+
+    if measures is None:
+        measures = list(range(len(exp.measures)))
+    if isinstance(measures, (int, str)):
+        measures = [measures]
+    measure_ids = [exp.measures.get_id(m) for m in measures]
+
+    loaded = None
+    results = {measure_id: [] for measure_id in measure_ids}
+
+    for override in overrides:
+        # Measures store raw results: they are copied so that the base
+        # experiment's are left untouched
+        override = {
+            "measures": [attrs.evolve(measure) for measure in exp.measures],
+            **override,
+        }
+        exp_step = attrs.evolve(exp, results={}, **override)
+
+        with profiling.stage("init"):
+            scene = exp_step.scene
+            kdict_template, umap_template = exp_step._kernel_templates(scene)
+            loaded = _update_kernel_scene(
+                exp_step,
+                scene,
+                loaded,
+                kdict_template,
+                umap_template,
+                exp_step.context_init(),
+            )
+
+        result = run(
+            exp_step,
+            measures=measures,
+            spp=spp,
+            seed_state=seed_state,
+            processes=processes,
+            keep_raw=keep_raw,
+            prefetch=prefetch,
+            adaptive=adaptive,
+        )
+        if len(measure_ids) == 1:
+            result = {measure_ids[0]: result}
+
+        for measure_id in measure_ids:
+            results[measure_id].append(result[measure_id])
+
+    results = {
+        measure_id: xr.concat(datasets, dim=dim).assign_coords({dim: coords})
+        for measure_id, datasets in results.items()
+    }
+
+    return results if len(measure_ids) > 1 else results[measure_ids[0]]
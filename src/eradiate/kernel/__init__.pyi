@@ -1,13 +1,17 @@
 from . import gridvolume as gridvolume
 from . import transform as transform
+from ._adaptive import AdaptiveSampling as AdaptiveSampling
 from ._bitmap import bitmap_to_dataarray as bitmap_to_dataarray
 from ._bitmap import bitmap_to_dataset as bitmap_to_dataset
 from ._bsdf import eval_bsdf as eval_bsdf
+from ._cache import KernelDictCache as KernelDictCache
+from ._checkpoint import RenderCheckpoint as RenderCheckpoint
 from ._kernel_dict import DictParameter as DictParameter
 from ._kernel_dict import KernelDict as KernelDict
 from ._kernel_dict import KernelSceneParameterFlags as KernelSceneParameterFlags
 from ._kernel_dict import KernelSceneParameterMap as KernelSceneParameterMap
 from ._kernel_dict import SceneParameter as SceneParameter
+from ._kernel_dict import SpectralDependency as SpectralDependency
 from ._kernel_dict import dict_parameter as dict_parameter
 from ._kernel_dict import scene_parameter as scene_parameter
 from ._render import MitsubaObjectWrapper as MitsubaObjectWrapper
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import math
+
+import attrs
+import mitsuba as mi
+import numpy as np
+
+from ..attrs import define, documented
+
+# Names of the bitmap splits holding the expectation (unpolarized and
+# polarized modes) and the raw second moment written by the moment integrator
+_EXPECTATION_SPLITS = ("<root>", "S0")
+_M2_SPLIT = "m2_nested"
+
+
+@define
+class AdaptiveSampling:
+    """
+    A progressive rendering configuration, which adapts the number of samples
+    per pixel to the noise level of each rendered bitmap.
+
+    When :func:`.mi_render` is passed an adaptive sampling configuration, each
+    sensor is rendered in successive passes for each context. After each pass,
+    the relative standard error (RSE) of the film is estimated from the second
+    moment output of the moment integrator (see
+    :meth:`relative_standard_error`). Rendering stops when the RSE reaches
+    :attr:`target_rse` or when :attr:`spp_max` samples per pixel have been
+    rendered.
+
+    The first pass renders the sample count passed to :func:`.mi_render` (or
+    that of the sensor's sampler). Each subsequent pass renders the number of
+    additional samples estimated to reach the target RSE, which is at least
+    the first pass's sample count. Passes are combined by sample-weighted
+    averaging, and the total sample count is reported as the effective sample
+    count of the bitmap.
+
+    Notes
+    -----
+    * The moment integrator is required
+      (see :attr:`.Experiment.integrator`).
+    * Seed values of passes after the first are derived from the seed of the
+      first pass: results remain deterministic.
+    """
+
+    target_rse: float = documented(
+        attrs.field(
+            converter=float,
+            validator=attrs.validators.gt(0.0),
+        ),
+        doc="Target relative standard error of the rendered film mean.",
+        type="float",
+    )
+
+    spp_max: int = documented(
+        attrs.field(
+            converter=int,
+            validator=attrs.validators.gt(0),
+        ),
+        doc="Maximum number of samples per pixel rendered for a sensor and a context.",
+        type="int",
+    )
+
+    @staticmethod
+    def moments(bitmap: mi.Bitmap) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Extract the expectation and raw second moment images from a bitmap
+        rendered with the moment integrator.
+
+        Parameters
+        ----------
+        bitmap : Bitmap
+            Rendered bitmap.
+
+        Returns
+        -------
+        expectation : ndarray
+            Expectation image (intensity in polarized modes).
+
+        m2 : ndarray
+            Raw second moment image.
+
+        Raises
+        ------
+        ValueError
+            If ``bitmap`` holds no second moment data.
+        """
+        splits = dict(bitmap.split())
+
+        if _M2_SPLIT not in splits:
+            raise ValueError(
+                "adaptive sampling requires second moment data: render with "
+                "the moment integrator"
+            )
+
+        expectation = next(
+            splits[name] for name in _EXPECTATION_SPLITS if name in splits
+        )
+
+        return (
+            np.asarray(expectation, dtype=np.float64)[:, :, 0],
+            np.asarray(splits[_M2_SPLIT], dtype=np.float64)[:, :, 0],
+        )
+
+    @staticmethod
+    def relative_standard_error(
+        expectation: np.ndarray, m2: np.ndarray, spp: int
+    ) -> float:
+        """
+        Estimate the relative standard error of a rendered film.
+
+        The RSE is the root mean square of the per-pixel standard errors of
+        the mean, :math:`\\sqrt{(m_2 - \\mu^2) / N}`, divided by the mean
+        absolute expectation over the film. Dark films are therefore not
+        penalized by the noise of individual pixels.
+
+        Parameters
+        ----------
+        expectation : ndarray
+            Expectation image.
+
+        m2 : ndarray
+            Raw second moment image.
+
+        spp : int
+            Number of samples per pixel used to compute the moments.
+
+        Returns
+        -------
+        float
+            Relative standard error. It is 0 for a noiseless film and infinite
+            for a noisy film with a zero mean.
+        """
+        variance = np.maximum(m2 - expectation * expectation, 0.0) / spp
+        error = math.sqrt(np.nanmean(variance))
+        scale = np.nanmean(np.abs(expectation))
+
+        if error == 0.0:
+            return 0.0
+        return error / scale if scale > 0.0 else math.inf
+
+    def first_spp(self, spp: int) -> int:
+        """
+        Return the sample count of the first rendering pass, given the
+        requested sample count ``spp``.
+        """
+        return min(spp, self.spp_max)
+
+    def next_spp(self, spp_total: int, spp_first: int, rse: float) -> int:
+        """
+        Return the sample count of the next rendering pass.
+
+        Parameters
+        ----------
+        spp_total : int
+            Number of samples per pixel rendered so far.
+
+        spp_first : int
+            Sample count of the first pass.
+
+        rse : float
+            Relative standard error estimated after the last pass.
+
+        Returns
+        -------
+        int
+            Sample count of the next pass, or 0 if rendering is complete.
+        """
+        remaining = self.spp_max - spp_total
+
+        if rse <= self.target_rse or remaining <= 0:
+            return 0
+
+        # The standard error decreases like the inverse square root of the
+        # sample count
+        required = math.ceil(spp_total * min((rse / self.target_rse) ** 2, 1e9))
+
+        return min(max(required - spp_total, spp_first), remaining)
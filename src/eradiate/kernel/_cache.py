@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import pickle
+import tempfile
+import typing as t
+from pathlib import Path
+
+import attrs
+import mitsuba as mi
+import numpy as np
+
+from ._versions import kernel_version
+from ..attrs import define, documented
+from ..util.misc import fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+@attrs.frozen
+class _EncodedTransform:
+    # Picklable stand-in for a Mitsuba scalar transform
+    matrix: np.ndarray
+
+
+@attrs.frozen
+class _EncodedVolumeGrid:
+    # Picklable stand-in for a Mitsuba volume grid; the array has shape
+    # (z, y, x, channels)
+    array: np.ndarray
+
+
+@attrs.frozen
+class _EncodedMesh:
+    # Picklable stand-in for a mesh created from Python: buffers are stored
+    # flat, and the BSDF is stored as the (encoded) dictionary it was loaded
+    # from
+    name: str
+    vertex_count: int
+    face_count: int
+    buffers: dict[str, np.ndarray]
+    bsdf: t.Any
+
+
+@attrs.frozen
+class _EncodedObject:
+    # Picklable stand-in for a Mitsuba object loaded from a dictionary
+    kdict: t.Any
+
+
+# Dictionaries from which objects were loaded by mi_load_dict(), keyed by object
+# ID. Objects are kept alive so that IDs are not reused, and only the most
+# recent entries are retained.
+_SOURCES: collections.OrderedDict[int, tuple[t.Any, dict]] = collections.OrderedDict()
+_SOURCES_MAXSIZE = 256
+
+_MESH_BUFFERS = ["vertex_positions", "faces", "vertex_normals", "vertex_texcoords"]
+
+
+def _record_source(obj: t.Any, kdict: dict) -> None:
+    # Record the dictionary from which a (non-scene) object was loaded, so that
+    # kernel dictionaries embedding it can be cached
+    if kdict.get("type") == "scene":
+        return
+
+    _SOURCES[id(obj)] = (obj, kdict)
+    _SOURCES.move_to_end(id(obj))
+    while len(_SOURCES) > _SOURCES_MAXSIZE:
+        _SOURCES.popitem(last=False)
+
+
+def _source(obj: t.Any) -> dict | None:
+    entry = _SOURCES.get(id(obj))
+    return entry[1] if entry is not None and entry[0] is obj else None
+
+
+def _encode_mesh(mesh: mi.Mesh) -> _EncodedMesh:
+    params = mi.traverse(mesh)
+    buffers = {
+        key: np.array(params[key]) for key in _MESH_BUFFERS if key in params.keys()
+    }
+    if not mesh.has_vertex_normals():
+        buffers.pop("vertex_normals", None)
+    if not mesh.has_vertex_texcoords():
+        buffers.pop("vertex_texcoords", None)
+
+    bsdf = mesh.bsdf()
+    if bsdf is not None and _source(bsdf) is None:
+        raise TypeError(f"cannot cache the BSDF of mesh '{mesh.id()}'")
+
+    return _EncodedMesh(
+        name=mesh.id(),
+        vertex_count=int(mesh.vertex_count()),
+        face_count=int(mesh.face_count()),
+        buffers=buffers,
+        bsdf=None if bsdf is None else _encode(_source(bsdf)),
+    )
+
+
+def _decode_mesh(value: _EncodedMesh) -> mi.Mesh:
+    props = mi.Properties()
+    if value.bsdf is not None:
+        props["mesh_bsdf"] = _load(_decode(value.bsdf))
+
+    mesh = mi.Mesh(
+        name=value.name,
+        face_count=value.face_count,
+        vertex_count=value.vertex_count,
+        has_vertex_normals="vertex_normals" in value.buffers,
+        has_vertex_texcoords="vertex_texcoords" in value.buffers,
+        props=props,
+    )
+    params = mi.traverse(mesh)
+    for key, buffer in value.buffers.items():
+        params[key] = buffer
+    params.update()
+
+    return mesh
+
+
+def _load(kdict: dict) -> t.Any:
+    obj = mi.load_dict(kdict)
+    _record_source(obj, kdict)
+    return obj
+
+
+def _encode(value: t.Any) -> t.Any:
+    # Convert a rendered kernel dictionary to a picklable structure
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+
+    if isinstance(value, mi.ScalarTransform4f):
+        return _EncodedTransform(np.array(value.matrix, dtype=np.float64))
+
+    if isinstance(value, mi.VolumeGrid):
+        return _EncodedVolumeGrid(np.array(value))
+
+    if isinstance(value, mi.Mesh):
+        return _encode_mesh(value)
+
+    if isinstance(value, mi.Object):
+        source = _source(value)
+        if source is None:
+            raise TypeError(f"cannot cache Mitsuba object {value!r}")
+        return _EncodedObject(_encode(source))
+
+    return value
+
+
+def _decode(value: t.Any) -> t.Any:
+    # Reverse the conversion applied by _encode()
+    if isinstance(value, dict):
+        return {k: _decode(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+
+    if isinstance(value, _EncodedTransform):
+        return mi.ScalarTransform4f(mi.ScalarMatrix4f(value.matrix))
+
+    if isinstance(value, _EncodedVolumeGrid):
+        return mi.VolumeGrid(value.array)
+
+    if isinstance(value, _EncodedMesh):
+        return _decode_mesh(value)
+
+    if isinstance(value, _EncodedObject):
+        return _load(_decode(value.kdict))
+
+    return value
+
+
+@define
+class KernelDictCache:
+    """
+    A persistent, content-addressed cache of rendered kernel scene dictionaries.
+
+    Each entry holds a rendered kernel dictionary, ready to be loaded with
+    :func:`.mi_load_dict`, and the Mitsuba scene parameter IDs resolved by
+    :func:`.mi_traverse` for the parameters of the associated update map
+    template. Entries are stored as individual files in :attr:`path` and are
+    addressed by a key computed from a specification (see :meth:`key`).
+
+    Warnings
+    --------
+    Entries are pickled: only use cache directories you trust.
+
+    Notes
+    -----
+    Mitsuba objects embedded in kernel dictionaries are cached as follows:
+
+    * volume grids are stored as arrays;
+    * meshes created from Python (*e.g.* by :class:`.BufferMeshShape` or mesh
+      :class:`.LeafCloud` instances) are stored as vertex and face buffers,
+      together with the dictionary their BSDF was loaded from;
+    * other objects are stored as the dictionary they were loaded from with
+      :func:`.mi_load_dict`, if any.
+
+    Kernel dictionaries which contain other Mitsuba objects or unpicklable
+    values cannot be cached; :meth:`save` then emits a warning and returns
+    ``False``.
+    """
+
+    path: Path = documented(
+        attrs.field(converter=lambda x: Path(x).expanduser().resolve()),
+        doc="Path to the cache directory. It is created upon first write.",
+        type="Path",
+        init_type="path-like",
+    )
+
+    def key(self, spec: t.Any) -> str | None:
+        """
+        Compute the cache key associated with a specification.
+
+        Parameters
+        ----------
+        spec
+            Any object which fully determines the kernel dictionary and
+            parameter lookups, *e.g.* a scene element tree and the
+            kernel context used for rendering. It is combined with the Eradiate
+            and Mitsuba versions.
+
+        Returns
+        -------
+        str or None
+            A key, or ``None`` if ``spec`` cannot be fingerprinted
+            (see :func:`.fingerprint`).
+        """
+        from .._version import _version
+
+        try:
+            return fingerprint((_version, kernel_version(), mi.variant(), spec))
+        except TypeError as e:
+            logger.warning("Kernel dictionary cache disabled: %s", e)
+            return None
+
+    def _filename(self, key: str) -> Path:
+        return self.path / f"{key}.pickle"
+
+    def load(self, key: str) -> tuple[dict, dict[str, str]] | None:
+        """
+        Load a cache entry.
+
+        Parameters
+        ----------
+        key : str
+            Entry key.
+
+        Returns
+        -------
+        kdict : dict
+            Rendered (nested) kernel dictionary.
+
+        parameter_ids : dict[str, str]
+            A dictionary mapping update map template keys to the corresponding
+            Mitsuba scene parameter IDs.
+
+        Notes
+        -----
+        ``None`` is returned if the entry does not exist or cannot be read.
+        """
+        filename = self._filename(key)
+
+        if not filename.is_file():
+            return None
+
+        try:
+            with open(filename, "rb") as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            logger.warning(
+                "Could not read kernel dictionary cache entry '%s' (%s)", filename, e
+            )
+            return None
+
+        logger.debug("Loaded kernel dictionary from cache entry '%s'", filename)
+        return _decode(entry["kdict"]), entry["parameter_ids"]
+
+    def save(self, key: str, kdict: dict, parameter_ids: dict[str, str]) -> bool:
+        """
+        Write a cache entry. The file is written atomically, which makes it
+        safe for concurrent processes to share a cache directory.
+
+        Parameters
+        ----------
+        key : str
+            Entry key.
+
+        kdict : dict
+            Rendered (nested) kernel dictionary.
+
+        parameter_ids : dict[str, str]
+            A dictionary mapping update map template keys to the corresponding
+            Mitsuba scene parameter IDs.
+
+        Returns
+        -------
+        bool
+            ``True`` if the entry was written, ``False`` if the kernel dictionary
+            cannot be cached.
+        """
+        try:
+            data = pickle.dumps(
+                {"kdict": _encode(kdict), "parameter_ids": dict(parameter_ids)},
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        except Exception as e:
+            logger.warning(
+                "Kernel dictionary cannot be cached, cache entry '%s' is not "
+                "written (%s)",
+                key,
+                e,
+            )
+            return False
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._filename(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+        logger.debug("Saved kernel dictionary to cache entry '%s'", key)
+        return True
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+        for filename in self.path.glob("*.pickle"):
+            filename.unlink()
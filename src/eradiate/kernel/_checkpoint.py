@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import typing as t
+import uuid
+from pathlib import Path
+
+import attrs
+import mitsuba as mi
+import numpy as np
+
+from ..attrs import define, documented
+
+logger = logging.getLogger(__name__)
+
+
+def _key(si: t.Hashable, sensor_id: str, seed: int, spp: int) -> tuple:
+    # Checkpoint entry key; spectral index hashables are floats or tuples
+    return (si, sensor_id, int(seed), int(spp))
+
+
+@define
+class RenderCheckpoint:
+    """
+    A persistent store of the bitmaps rendered during a spectral loop, used to
+    resume interrupted computations.
+
+    Each entry holds the bitmap rendered for a sensor at a given spectral
+    index, and is identified by the spectral index, the sensor ID, the seed
+    value used to initialize Mitsuba's RNG and the sample count. Rendered
+    bitmaps are accumulated in memory and written to :attr:`path` every
+    :attr:`interval` contexts, in chunk files written atomically. Existing
+    chunks are read lazily: a bitmap is only loaded when it is restored.
+
+    When :func:`.mi_render` is passed a checkpoint, contexts for which all
+    active sensors have an entry are not rendered again. Since seed values are
+    part of entry keys, entries are only reused if seeds are drawn from an
+    identically initialized :class:`.SeedState`.
+
+    Warnings
+    --------
+    Entries do not identify the scene they were rendered from: a checkpoint
+    directory must not be shared by computations using different scenes.
+    """
+
+    path: Path = documented(
+        attrs.field(converter=lambda x: Path(x).expanduser().resolve()),
+        doc="Path to the checkpoint directory. It is created upon first write.",
+        type="Path",
+        init_type="path-like",
+    )
+
+    interval: int = documented(
+        attrs.field(
+            default=1,
+            converter=int,
+            validator=attrs.validators.gt(0),
+        ),
+        doc="Number of rendered contexts after which pending entries are "
+        "written to disk.",
+        type="int",
+        init_type="int, optional",
+        default="1",
+    )
+
+    # Maps entry keys to (chunk file, array name) pairs; built upon first use
+    _index: dict[tuple, tuple[Path, str]] | None = attrs.field(
+        default=None, init=False, repr=False, eq=False
+    )
+
+    # Entries rendered since the last write and number of contexts they cover
+    _pending: list[tuple[tuple, np.ndarray, str, list[str]]] = attrs.field(
+        factory=list, init=False, repr=False, eq=False
+    )
+    _pending_contexts: int = attrs.field(default=0, init=False, repr=False, eq=False)
+
+    # Last opened chunk file
+    _chunk: tuple[Path, t.Any] | None = attrs.field(
+        default=None, init=False, repr=False, eq=False
+    )
+
+    def _read_index(self) -> dict[tuple, tuple[Path, str]]:
+        if self._index is not None:
+            return self._index
+
+        self._index = {}
+
+        for filename in sorted(self.path.glob("chunk-*.npz")):
+            try:
+                with np.load(filename) as chunk:
+                    records = json.loads(str(chunk["meta"]))
+            except Exception as e:
+                logger.warning("Could not read checkpoint chunk '%s' (%s)", filename, e)
+                continue
+
+            for record in records:
+                si = record["si"]
+                if isinstance(si, list):
+                    si = tuple(si)
+                key = _key(si, record["sensor_id"], record["seed"], record["spp"])
+                self._index[key] = (filename, record["name"])
+
+        logger.debug(
+            "Read %d entries from checkpoint directory '%s'",
+            len(self._index),
+            self.path,
+        )
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self._read_index())
+
+    def contains(self, si: t.Hashable, seeds: dict[str, int], spp: int) -> bool:
+        """
+        Check if the bitmaps rendered for all sensors of a context are stored.
+
+        Parameters
+        ----------
+        si : hashable
+            Hashable representation of the context's spectral index
+            (see :attr:`.SpectralIndex.as_hashable`).
+
+        seeds : dict[str, int]
+            A dictionary mapping the IDs of the sensors rendered for the
+            context to the seed values used to render them.
+
+        spp : int
+            Sample count passed to :func:`.mi_render`.
+
+        Returns
+        -------
+        bool
+        """
+        index = self._read_index()
+        return all(
+            _key(si, sensor_id, seed, spp) in index for sensor_id, seed in seeds.items()
+        )
+
+    def load(
+        self, si: t.Hashable, seeds: dict[str, int], spp: int
+    ) -> dict[str, mi.Bitmap]:
+        """
+        Load the bitmaps rendered for all sensors of a context.
+
+        Parameters
+        ----------
+        si : hashable
+            Hashable representation of the context's spectral index.
+
+        seeds : dict[str, int]
+            A dictionary mapping sensor IDs to seed values.
+
+        spp : int
+            Sample count passed to :func:`.mi_render`.
+
+        Returns
+        -------
+        dict[str, Bitmap]
+            A dictionary mapping sensor IDs to the stored bitmaps.
+
+        Raises
+        ------
+        KeyError
+            If an entry is missing.
+        """
+        index = self._read_index()
+        result = {}
+
+        for sensor_id, seed in seeds.items():
+            filename, name = index[_key(si, sensor_id, seed, spp)]
+
+            if self._chunk is None or self._chunk[0] != filename:
+                self._close_chunk()
+                self._chunk = (filename, np.load(filename))
+            chunk = self._chunk[1]
+
+            meta = json.loads(str(chunk[f"{name}_meta"]))
+            result[sensor_id] = mi.Bitmap(
+                chunk[name],
+                getattr(mi.Bitmap.PixelFormat, meta["pixel_format"]),
+                meta["channel_names"],
+            )
+
+        return result
+
+    def add(
+        self,
+        si: t.Hashable,
+        bitmaps: dict[str, mi.Bitmap],
+        seeds: dict[str, int],
+        spp: int,
+    ) -> None:
+        """
+        Add the bitmaps rendered for a context. Pending entries are written to
+        disk once :attr:`interval` contexts have been added since the last
+        write.
+
+        Parameters
+        ----------
+        si : hashable
+            Hashable representation of the context's spectral index.
+
+        bitmaps : dict[str, Bitmap]
+            A dictionary mapping sensor IDs to rendered bitmaps.
+
+        seeds : dict[str, int]
+            A dictionary mapping sensor IDs to the seed values used to render
+            them.
+
+        spp : int
+            Sample count passed to :func:`.mi_render`.
+        """
+        for sensor_id, bitmap in bitmaps.items():
+            self._pending.append(
+                (
+                    _key(si, sensor_id, seeds[sensor_id], spp),
+                    np.array(bitmap),
+                    bitmap.pixel_format().name,
+                    [field.name for field in bitmap.struct_()],
+                )
+            )
+        self._pending_contexts += 1
+
+        if self._pending_contexts >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write pending entries to a new chunk file. The file is written
+        atomically: an interrupted write leaves no partial chunk behind.
+        """
+        if not self._pending:
+            self._pending_contexts = 0
+            return
+
+        index = self._read_index()
+        arrays = {}
+        records = []
+
+        for i, (key, array, pixel_format, channel_names) in enumerate(self._pending):
+            si, sensor_id, seed, spp = key
+            name = f"bitmap{i}"
+            arrays[name] = array
+            arrays[f"{name}_meta"] = np.array(
+                json.dumps(
+                    {"pixel_format": pixel_format, "channel_names": channel_names}
+                )
+            )
+            records.append(
+                {
+                    "si": list(si) if isinstance(si, tuple) else si,
+                    "sensor_id": sensor_id,
+                    "seed": seed,
+                    "spp": spp,
+                    "name": name,
+                }
+            )
+        arrays["meta"] = np.array(json.dumps(records))
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        filename = self.path / f"chunk-{uuid.uuid4().hex}.npz"
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, filename)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+        for record, (key, *_) in zip(records, self._pending):
+            index[key] = (filename, record["name"])
+
+        logger.debug(
+            "Wrote %d entries to checkpoint chunk '%s'", len(records), filename
+        )
+        self._pending.clear()
+        self._pending_contexts = 0
+
+    def _close_chunk(self) -> None:
+        if self._chunk is not None:
+            self._chunk[1].close()
+            self._chunk = None
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the checkpoint, including pending ones.
+        """
+        self._close_chunk()
+        self._pending.clear()
+        self._pending_contexts = 0
+        self._index = None
+
+        for filename in self.path.glob("chunk-*.npz"):
+            filename.unlink()
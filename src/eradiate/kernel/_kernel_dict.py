@@ -15,6 +15,7 @@ import mitsuba as mi
 
 from ..attrs import define, documented
 from ..contexts import KernelContext
+from ..units import unit_registry as ureg
 from ..util.misc import flatten, nest
 
 
@@ -52,6 +53,30 @@ class KernelSceneParameterFlags(enum.Flag):
     ALL = SPECTRAL | GEOMETRIC
 
 
+class SpectralDependency(enum.Enum):
+    """
+    Granularity of the spectral dependency of a scene parameter. It is used to
+    detect that a parameter value cannot have changed between two successive
+    kernel contexts (see :meth:`.KernelSceneParameterMap.render`).
+    """
+
+    NONE = "none"  #: Does not depend on the spectral index
+    BIN = "bin"  #: Depends only on the wavelength (in CKD modes, the bin)
+    INDEX = "index"  #: Depends on the full spectral index
+
+    def key(self, ctx: KernelContext) -> t.Hashable:
+        """
+        Return a hashable value which identifies the parameter value for a
+        given kernel context.
+        """
+        if self is SpectralDependency.NONE:
+            return None
+        elif self is SpectralDependency.BIN:
+            return float(ctx.si.w.m_as(ureg.nm))
+        else:
+            return ctx.si.as_hashable
+
+
 @define
 class SceneParameter:
     """
@@ -99,6 +124,21 @@ class SceneParameter:
         init_type="str, optional",
     )
 
+    spectral_dependency: SpectralDependency = documented(
+        attrs.field(
+            default=SpectralDependency.INDEX,
+            converter=SpectralDependency,
+            kw_only=True,
+        ),
+        doc="Granularity of the parameter's spectral dependency. Incremental "
+        "parameter map rendering skips the evaluation of the parameter if "
+        "the spectral index changes at a finer granularity. By default, the "
+        "parameter is assumed to depend on the full spectral index.",
+        type=".SpectralDependency",
+        init_type=".SpectralDependency or str, optional",
+        default=".SpectralDependency.INDEX",
+    )
+
     def __call__(self, ctx: KernelContext) -> t.Any:
         return self.func(ctx)
 
@@ -126,6 +166,7 @@ def scene_parameter(
     node_type: type,
     node_id: str,
     parameter_relpath: str,
+    spectral_dependency: SpectralDependency | str = SpectralDependency.INDEX,
 ):
     """
     This function wraps another one into a :class:`.SceneParameter` instance.
@@ -151,6 +192,9 @@ def scene_parameter(
         Relative path (from the looked up node) of the parameter updated by the
         wrapped callable.
 
+    spectral_dependency : .SpectralDependency or str, optional
+        Granularity of the parameter's spectral dependency.
+
     Returns
     -------
     callable
@@ -167,6 +211,7 @@ def scene_parameter(
                 node_id=node_id,
                 parameter_relpath=parameter_relpath,
             ),
+            spectral_dependency=spectral_dependency,
         )
 
     return wrap if maybe_fn is None else wrap(maybe_fn)
@@ -247,15 +292,56 @@ class KernelSceneParameterMap(UserDict):
 
     Each entry maps a string key to a :class:`.SceneParameter` instance that
     implements an update protocol for a Mitsuba scene parameter.
+
+    In incremental mode (see :meth:`render`), the map keeps track of the
+    context for which each parameter was last evaluated, and counts evaluated
+    and skipped parameters (see :attr:`update_stats`).
     """
 
     data: dict[str, SceneParameter] = attrs.field(factory=dict)
 
+    # Maps parameter keys to the (context keyword arguments, spectral
+    # dependency key) pair for which they were last evaluated
+    _update_keys: dict[str, tuple] = attrs.field(
+        factory=dict, init=False, repr=False, eq=False
+    )
+
+    _update_stats: dict[str, int] = attrs.field(
+        factory=lambda: {"evaluated": 0, "skipped": 0},
+        init=False,
+        repr=False,
+        eq=False,
+    )
+
+    @property
+    def update_stats(self) -> dict[str, int]:
+        """
+        Counters of the parameters evaluated and skipped by incremental renders
+        since the last call to :meth:`reset_incremental`.
+
+        Returns
+        -------
+        dict[str, int]
+            A dictionary with ``"evaluated"`` and ``"skipped"`` entries.
+        """
+        return self._update_stats
+
+    def reset_incremental(self) -> None:
+        """
+        Forget the contexts for which parameters were last evaluated and reset
+        the :attr:`update_stats` counters. This must be called whenever scene
+        parameters may have been modified by other means than the rendered
+        map, *e.g.* before a new spectral loop.
+        """
+        self._update_keys.clear()
+        self._update_stats.update({"evaluated": 0, "skipped": 0})
+
     def render(
         self,
         ctx: KernelContext,
         flags: KernelSceneParameterFlags = KernelSceneParameterFlags.ALL,
         drop: bool = False,
+        incremental: bool = False,
     ) -> dict:
         """
         Evaluate the parameter map for a given kernel context and for selected
@@ -276,6 +362,14 @@ class KernelSceneParameterMap(UserDict):
             information implied it. If ``False``, any unused parameter will
             raise an exception.
 
+        incremental : bool, optional
+            If ``True``, parameters whose value cannot have changed since the
+            previous incremental render are not evaluated and omitted from the
+            returned mapping. This is the case if the context keyword arguments
+            are the same object and if the spectral index is unchanged at the
+            granularity of the parameter's
+            :attr:`~.SceneParameter.spectral_dependency`.
+
         Returns
         -------
         params : dict
@@ -301,6 +395,19 @@ class KernelSceneParameterMap(UserDict):
                 key = k if v.parameter_id is None else v.parameter_id
 
                 if v.flags & flags:
+                    if incremental:
+                        update_key = (ctx.kwargs, v.spectral_dependency.key(ctx))
+                        previous = self._update_keys.get(key)
+                        if (
+                            previous is not None
+                            and previous[0] is update_key[0]
+                            and previous[1] == update_key[1]
+                        ):
+                            self._update_stats["skipped"] += 1
+                            continue
+                        self._update_keys[key] = update_key
+                        self._update_stats["evaluated"] += 1
+
                     result[key] = v(ctx)
                 else:
                     unused.append(k)
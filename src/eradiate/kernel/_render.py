@@ -1,20 +1,32 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import queue
+import threading
 import typing as t
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 import attrs
 import drjit as dr
 import mitsuba as mi
+import numpy as np
 from mitsuba.python.util import SceneParameters as _MitsubaSceneParameters
 from tqdm.auto import tqdm
 
-from ._kernel_dict import KernelSceneParameterMap
+from ._adaptive import AdaptiveSampling
+from ._cache import _record_source
+from ._checkpoint import RenderCheckpoint
+from ._kernel_dict import KernelDict, KernelSceneParameterMap
 from .. import config
 from ..attrs import define, documented, frozen
 from ..contexts import KernelContext
 from ..rng import SeedState, get_seed_state
+from ..spectral.index import CKDSpectralIndex
+from ..typing import PathLike
+from ..units import unit_registry as ureg
+from ..util import profiling
 
 logger = logging.getLogger(__name__)
 
@@ -119,6 +131,24 @@ class MitsubaObjectWrapper:
         default="None",
     )
 
+    kdict_template: KernelDict | None = documented(
+        attrs.field(default=None, repr=False),
+        doc="The kernel dictionary template from which :attr:`obj` was loaded. "
+        "This is required to reload the scene in worker processes "
+        "(see :func:`.mi_render`).",
+        type=".KernelDict or None",
+        init_type=".KernelDict, optional",
+        default="None",
+    )
+
+    ctx_init: KernelContext | None = documented(
+        attrs.field(default=None, repr=False),
+        doc="The context used to render :attr:`kdict_template` upon loading.",
+        type=".KernelContext or None",
+        init_type=".KernelContext, optional",
+        default="None",
+    )
+
     def drop_parameters(self) -> None:
         """
         Reduce the size of the scene parameter table :attr:`.parameters` by
@@ -206,7 +236,11 @@ def mi_load_dict(dict: dict, parallel: bool = True, optimize: bool = False) -> o
     object
         Mitsuba object.
     """
-    return mi.load_dict(dict, parallel=parallel, optimize=optimize)
+    result = mi.load_dict(dict, parallel=parallel, optimize=optimize)
+    # Objects loaded from a dictionary can be embedded in cached kernel
+    # dictionaries
+    _record_source(result, dict)
+    return result
 
 
 def mi_traverse(
@@ -376,11 +410,310 @@ def mi_traverse(
 # ------------------------------------------------------------------------------
 
 
+# Process-wide state shared with spectral loop worker processes. It is set by
+# the parent process before the worker pool is forked and inherited by workers,
+# which avoids pickling scene templates and parameter updaters.
+_WORKER_STATE: dict[str, t.Any] = {}
+
+
+def _pass_seed(seed: int, i_pass: int) -> int:
+    # Seed value of an adaptive sampling pass, derived from that of the first
+    # pass
+    if i_pass == 0:
+        return seed
+    return int(np.random.SeedSequence([seed, i_pass]).generate_state(1)[0])
+
+
+def _render_sensor(
+    mi_scene: MitsubaObjectWrapper,
+    i_sensor: int,
+    spp: int,
+    seed: int,
+    adaptive: AdaptiveSampling | None = None,
+) -> tuple[mi.Bitmap, int]:
+    """
+    Render a sensor and return the developed film bitmap and the effective
+    number of samples per pixel. If ``adaptive`` is set, the sensor is
+    rendered in successive passes until the adaptive sampling stopping
+    criterion is met, and passes are combined by sample-weighted averaging.
+    """
+    mi_sensor = mi_scene.obj.sensors()[i_sensor]
+    if spp <= 0:
+        spp = mi_sensor.sampler().sample_count()
+    if adaptive is not None:
+        spp = adaptive.first_spp(spp)
+
+    spp_pass = spp
+    spp_total = 0
+    accumulated = None
+    i_pass = 0
+
+    while spp_pass > 0:
+        with profiling.stage("mi_render"):
+            mi.render(
+                mi_scene.obj,
+                sensor=i_sensor,
+                seed=_pass_seed(seed, i_pass),
+                spp=spp_pass,
+            )
+
+        # The developed film is a new Bitmap object: no copy is required
+        with profiling.stage("film_bitmap"):
+            bitmap = mi_sensor.film().bitmap()
+
+        if adaptive is None:
+            return bitmap, spp_pass
+
+        array = np.array(bitmap, dtype=np.float64)
+        if accumulated is None:
+            accumulated = spp_pass * array
+        else:
+            accumulated += spp_pass * array
+        spp_total += spp_pass
+        i_pass += 1
+
+        expectation, m2 = adaptive.moments(
+            bitmap if i_pass == 1 else _bitmap_like(bitmap, accumulated / spp_total)
+        )
+        rse = adaptive.relative_standard_error(expectation, m2, spp_total)
+        spp_pass = adaptive.next_spp(spp_total, spp, rse)
+        logger.debug(
+            'Adaptive sampling: sensor "%s", %d spp, RSE = %g',
+            mi_sensor.id(),
+            spp_total,
+            rse,
+        )
+
+    # A single pass yields the rendered bitmap unchanged
+    if i_pass == 1:
+        return bitmap, spp_total
+
+    return _bitmap_like(bitmap, accumulated / spp_total), spp_total
+
+
+def _bitmap_like(bitmap: mi.Bitmap, array: np.ndarray) -> mi.Bitmap:
+    # Create a bitmap with the pixel format and channels of another one
+    return mi.Bitmap(
+        array.astype(np.asarray(bitmap).dtype),
+        bitmap.pixel_format(),
+        [field.name for field in bitmap.struct_()],
+    )
+
+
+def _render_context(
+    mi_scene: MitsubaObjectWrapper,
+    ctx: KernelContext,
+    spp: int,
+    seeds: list[int],
+    umap: dict | None = None,
+    adaptive: AdaptiveSampling | None = None,
+) -> tuple[dict[str, mi.Bitmap], dict[str, int]]:
+    """
+    Update scene parameters for a given context and render all active sensors.
+    Returns a dictionary mapping sensor IDs to rendered bitmaps and a
+    dictionary mapping sensor IDs to effective sample counts. If ``umap`` is
+    set, it is used as the parameter update map instead of rendering the update
+    map template.
+    """
+    logger.debug("Updating Mitsuba scene parameters")
+    # Parameters which cannot have changed since the previous context are
+    # neither evaluated nor updated
+    if umap is None:
+        with profiling.stage("umap_render"):
+            umap = mi_scene.umap_template.render(ctx, incremental=True)
+    with profiling.stage("parameters_update"):
+        mi_scene.parameters.update(umap)
+
+    active_sensors = ctx.active_sensors
+    if active_sensors is None:
+        i_sensors = list(range(len(mi_scene.obj.sensors())))
+    else:
+        i_sensors = list(active_sensors)
+
+    result = {}
+    sample_counts = {}
+
+    # Loop on sensors
+    for i_sensor, seed in zip(i_sensors, seeds):
+        sensor_id = mi_scene.obj.sensors()[i_sensor].id()
+        logger.debug(
+            'Running Mitsuba for sensor "%s" with seed value %s',
+            sensor_id,
+            seed,
+        )
+        result[sensor_id], sample_counts[sensor_id] = _render_sensor(
+            mi_scene, i_sensor, spp, seed, adaptive
+        )
+
+    return result, sample_counts
+
+
+class _UpdateMapPrefetcher:
+    """
+    Iterator over the parameter update maps of a sequence of contexts, which
+    are evaluated ahead of time by a background thread.
+
+    Update maps are rendered incrementally, in context order, and at most
+    ``depth`` of them are held in a bounded queue. Exceptions raised during
+    evaluation are re-raised by :meth:`__next__`. The background thread is
+    stopped by :meth:`close`, which must be called if iteration is interrupted.
+    """
+
+    # Queue sentinel signalling the end of the sequence
+    _DONE = object()
+
+    def __init__(
+        self,
+        umap_template: KernelSceneParameterMap,
+        ctxs: list[KernelContext],
+        depth: int,
+    ):
+        self._umap_template = umap_template
+        self._ctxs = ctxs
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._produce, name="eradiate-umap-prefetch", daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        # Block until the item is queued or the prefetcher is closed
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        for ctx in self._ctxs:
+            if self._stop.is_set():
+                return
+
+            try:
+                with profiling.stage("umap_render"):
+                    umap = self._umap_template.render(ctx, incremental=True)
+            except BaseException as e:
+                self._put(e)
+                return
+
+            if not self._put(umap):
+                return
+
+        self._put(self._DONE)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> dict:
+        item = self._queue.get()
+
+        if item is self._DONE:
+            self._queue.put(item)  # Subsequent calls also stop iteration
+            raise StopIteration
+
+        if isinstance(item, BaseException):
+            self.close()
+            raise item
+
+        return item
+
+    def close(self) -> None:
+        """
+        Stop the background thread and wait for it to terminate.
+        """
+        self._stop.set()
+        self._thread.join()
+
+
+def _context_batches(ctxs: list[KernelContext]) -> list[list[int]]:
+    """
+    Group the indices of consecutive contexts sharing a CKD bin into batches.
+    In monochromatic modes, each context forms its own batch.
+    """
+    batches = []
+    previous = None
+
+    for i_ctx, ctx in enumerate(ctxs):
+        key = (
+            float(ctx.si.w.m_as(ureg.nm))
+            if isinstance(ctx.si, CKDSpectralIndex)
+            else None
+        )
+        if batches and key is not None and key == previous:
+            batches[-1].append(i_ctx)
+        else:
+            batches.append([i_ctx])
+        previous = key
+
+    return batches
+
+
+def _render_batch_worker(
+    i_ctxs: list[int], seeds: list[list[int]]
+) -> tuple[list[tuple], dict[str, int]]:
+    """
+    Worker process entry point: render the contexts with indices ``i_ctxs`` and
+    return bitmap data in a picklable form and effective sample counts,
+    together with the parameter update counts of the batch.
+    """
+    mi_scene, ctxs, spp, adaptive = _WORKER_STATE["parent"]
+
+    # Load the scene upon first call in this worker
+    worker_scene = _WORKER_STATE.get("scene")
+    if worker_scene is None:
+        logger.debug("Loading kernel scene in worker process")
+        worker_scene = mi_traverse(
+            mi_load_dict(mi_scene.kdict_template.render(ctx=mi_scene.ctx_init)),
+            umap_template=mi_scene.umap_template,
+        )
+        worker_scene.drop_parameters()
+        _WORKER_STATE["scene"] = worker_scene
+
+    result = []
+    stats = dict(worker_scene.umap_template.update_stats)
+
+    for i_ctx, ctx_seeds in zip(i_ctxs, seeds):
+        ctx = ctxs[i_ctx]
+        bitmaps, sample_counts = _render_context(
+            worker_scene, ctx, spp, ctx_seeds, adaptive=adaptive
+        )
+
+        # Bitmaps cannot be pickled: we transfer their contents and format
+        result.append(
+            (
+                ctx.si.as_hashable,
+                {
+                    sensor_id: (
+                        np.array(bitmap),
+                        bitmap.pixel_format(),
+                        [field.name for field in bitmap.struct_()],
+                    )
+                    for sensor_id, bitmap in bitmaps.items()
+                },
+                sample_counts,
+            )
+        )
+
+    stats = {
+        k: v - stats[k] for k, v in worker_scene.umap_template.update_stats.items()
+    }
+
+    return result, stats
+
+
 def mi_render(
     mi_scene: MitsubaObjectWrapper,
     ctxs: list[KernelContext],
     spp: int = 0,
     seed_state: SeedState | None = None,
+    processes: int = 1,
+    callback: t.Callable[[KernelContext, dict[str, mi.Bitmap]], None] | None = None,
+    prefetch: int = 0,
+    checkpoint: RenderCheckpoint | PathLike | None = None,
+    adaptive: AdaptiveSampling | None = None,
 ) -> dict[t.Any, mi.Bitmap]:
     """
     Render a Mitsuba scene multiple times given specified contexts and sensor
@@ -397,28 +730,181 @@ def mi_render(
 
     spp : int, optional, default: 0
         Number of samples per pixel. If set to 0 (default), the value set in the
-        original scene definition takes precedence.
+        original scene definition takes precedence. If ``adaptive`` is set,
+        this is the sample count of the first rendering pass.
 
     seed_state : .SeedState, optional
         Seed state used to generate seeds to initialize Mitsuba's RNG at
         each run. If unset, Eradiate's root seed state is used.
 
+    processes : int, optional, default: 1
+        Number of worker processes the contexts are dispatched to. If set to 1
+        (default), contexts are processed sequentially in the current process.
+        Otherwise, each worker loads its own copy of the scene from
+        ``mi_scene.kdict_template`` and renders its share of the contexts.
+        In CKD modes, all contexts of a spectral bin are dispatched together
+        to the same worker. Results are identical to the sequential path.
+
+    callback : callable, optional
+        If set, this function is called, in context order, with each context
+        and a dictionary mapping sensor IDs to the corresponding rendered
+        bitmaps as soon as they are available. Bitmaps passed to the callback
+        are not stored in the returned dictionary, which allows for processing
+        results on the fly without retaining them. If ``adaptive`` is set, the
+        callback is passed a third argument: a dictionary mapping sensor IDs
+        to the effective number of samples per pixel of each bitmap.
+
+    prefetch : int, optional, default: 0
+        If greater than 0, the parameter update maps of upcoming contexts are
+        evaluated by a background thread while the current context is
+        rendered, with at most ``prefetch`` evaluated update maps held in
+        memory. Updates are applied to the Mitsuba scene between renders, in
+        context order, and results are identical to those obtained without
+        prefetching. This parameter is ignored if ``processes`` is greater
+        than 1.
+
+    checkpoint : .RenderCheckpoint or path-like, optional
+        If set, rendered bitmaps are persisted to this checkpoint store (a path
+        is interpreted as a checkpoint directory). Contexts for which a bitmap
+        rendered with the same seed and sample count is stored for all active
+        sensors are not rendered again: stored bitmaps are passed to
+        ``callback`` instead. Since seeds are drawn for all contexts, resumed
+        computations are deterministic.
+
+    adaptive : .AdaptiveSampling, optional
+        If set, each sensor is rendered in successive passes until the
+        relative standard error of its film reaches a target value or a
+        maximum sample count is reached. This requires the moment integrator.
+
     Returns
     -------
     dict
         A nested dictionary mapping context and sensor indices to rendered
-        bitmaps.
+        bitmaps. If ``callback`` is set, it is empty.
+
+    Raises
+    ------
+    ValueError
+        If ``processes`` is greater than 1 and ``mi_scene`` has no kernel
+        dictionary template, or if both ``checkpoint`` and ``adaptive`` are
+        set.
 
     Notes
     -----
-    This function wraps sequential calls to  :func:`mitsuba.render`.
+    * This function wraps sequential calls to :func:`mitsuba.render`.
+    * Worker processes are created with the ``fork`` start method so that
+      scene templates and parameter updaters need not be pickled. On platforms
+      where it is not available, contexts are processed sequentially. Kernel
+      computations queued by the calling process are completed before
+      workers are created; other threads must not use the kernel meanwhile.
+    * Prefetching only hides parameter evaluation time if scene parameter
+      updaters do not hold Python's global interpreter lock for long periods;
+      it is most effective in CKD modes, where radiative properties and phase
+      functions are evaluated with NumPy.
     """
 
     if seed_state is None:
         logger.debug("Using default RNG seed generator")
         seed_state = get_seed_state()
 
+    if checkpoint is not None and adaptive is not None:
+        # Checkpoint entries do not record effective sample counts
+        raise ValueError("checkpoints are not supported with adaptive sampling")
+
+    if processes > 1:
+        if mi_scene.kdict_template is None:
+            raise ValueError(
+                "rendering with multiple processes requires a kernel dictionary "
+                "template; set the 'kdict_template' field of the passed scene"
+            )
+        if "fork" not in multiprocessing.get_all_start_methods():
+            warnings.warn(
+                "The 'fork' process start method is unavailable on this "
+                "platform; the spectral loop will run sequentially"
+            )
+            processes = 1
+
+    # Draw seeds ahead of time, in the order of the sequential loop, so that
+    # results do not depend on how contexts are dispatched
+    n_sensors = len(mi_scene.obj.sensors())
+    seeds = [
+        [
+            int(seed_state.next().squeeze())
+            for _ in range(
+                n_sensors if ctx.active_sensors is None else len(ctx.active_sensors)
+            )
+        ]
+        for ctx in ctxs
+    ]
+
     results = {}
+    umap_template = mi_scene.umap_template
+    umap_template.reset_incremental()
+
+    if callback is None:
+
+        def callback(ctx, bitmaps, *_):
+            results.setdefault(ctx.si.as_hashable, {}).update(bitmaps)
+
+    # Map the IDs of the sensors rendered for each context to their seeds
+    sensor_ids = [sensor.id() for sensor in mi_scene.obj.sensors()]
+    sensor_seeds = [
+        dict(
+            zip(
+                sensor_ids
+                if ctx.active_sensors is None
+                else [sensor_ids[i] for i in ctx.active_sensors],
+                ctx_seeds,
+            )
+        )
+        for ctx, ctx_seeds in zip(ctxs, seeds)
+    ]
+
+    # Contexts stored in the checkpoint are restored instead of being rendered
+    if checkpoint is not None and not isinstance(checkpoint, RenderCheckpoint):
+        checkpoint = RenderCheckpoint(checkpoint)
+
+    if checkpoint is None:
+        i_render = list(range(len(ctxs)))
+    else:
+        i_render = [
+            i_ctx
+            for i_ctx, ctx in enumerate(ctxs)
+            if not checkpoint.contains(ctx.si.as_hashable, sensor_seeds[i_ctx], spp)
+        ]
+        if len(i_render) < len(ctxs):
+            logger.info(
+                "Restoring %d/%d contexts from checkpoint '%s'",
+                len(ctxs) - len(i_render),
+                len(ctxs),
+                checkpoint.path,
+            )
+
+    i_next = 0  # Index of the next context passed to the callback
+
+    def restore(stop):
+        # Pass contexts restored from the checkpoint up to index stop (excluded)
+        # to the callback
+        nonlocal i_next
+        for i_ctx in range(i_next, stop):
+            ctx = ctxs[i_ctx]
+            callback(ctx, checkpoint.load(ctx.si.as_hashable, sensor_seeds[i_ctx], spp))
+            pbar.update()
+        i_next = max(i_next, stop)
+
+    def deliver(i_ctx, bitmaps, sample_counts):
+        # Pass a rendered context to the callback, in context order
+        nonlocal i_next
+        restore(i_ctx)
+        ctx = ctxs[i_ctx]
+        if checkpoint is not None:
+            checkpoint.add(ctx.si.as_hashable, bitmaps, sensor_seeds[i_ctx], spp)
+        if adaptive is None:
+            callback(ctx, bitmaps)
+        else:
+            callback(ctx, bitmaps, sample_counts)
+        pbar.update()
+        i_next = i_ctx + 1
 
     # Loop on contexts
     with tqdm(
@@ -430,41 +916,116 @@ def mi_render(
         disable=(config.settings.progress < config.ProgressLevel.SPECTRAL_LOOP)
         or len(ctxs) <= 1,
     ) as pbar:
-        for ctx in ctxs:
-            pbar.set_description(
-                f"Eradiate [{ctx.index_formatted}]",
-                refresh=True,
-            )
-
-            logger.debug("Updating Mitsuba scene parameters")
-            mi_scene.parameters.update(mi_scene.umap_template.render(ctx))
-
-            active_sensors = ctx.active_sensors
-            if active_sensors is None:
-                mi_sensors = [
-                    (i, sensor) for i, sensor in enumerate(mi_scene.obj.sensors())
-                ]
-            else:
-                mi_sensors = [(i, mi_scene.obj.sensors()[i]) for i in active_sensors]
-
-            # Loop on sensors
-            for i_sensor, mi_sensor in mi_sensors:
-                # Render sensor
-                seed = int(seed_state.next().squeeze())
-                logger.debug(
-                    'Running Mitsuba for sensor "%s" with seed value %s',
-                    mi_sensor.id(),
-                    seed,
+        try:
+            if processes <= 1 or not i_render:
+                # Update maps are either prefetched by a background thread or
+                # rendered on demand by _render_context()
+                umaps = (
+                    _UpdateMapPrefetcher(
+                        umap_template, [ctxs[i] for i in i_render], prefetch
+                    )
+                    if prefetch > 0 and len(i_render) > 1
+                    else None
                 )
-                mi.render(mi_scene.obj, sensor=i_sensor, seed=seed, spp=spp)
-
-                # Store result in a new Bitmap object
-                siah = ctx.si.as_hashable
-                if siah not in results:
-                    results[siah] = {}
 
-                results[siah][mi_sensor.id()] = mi.Bitmap(mi_sensor.film().bitmap())
+                try:
+                    for i_ctx in i_render:
+                        ctx = ctxs[i_ctx]
+                        pbar.set_description(
+                            f"Eradiate [{ctx.index_formatted}]",
+                            refresh=True,
+                        )
+                        bitmaps, sample_counts = _render_context(
+                            mi_scene,
+                            ctx,
+                            spp,
+                            seeds[i_ctx],
+                            umap=None if umaps is None else next(umaps),
+                            adaptive=adaptive,
+                        )
+                        deliver(i_ctx, bitmaps, sample_counts)
+                finally:
+                    if umaps is not None:
+                        umaps.close()
 
-            pbar.update()
+            else:
+                logger.debug("Dispatching spectral loop to %s processes", processes)
+                _WORKER_STATE["parent"] = (mi_scene, ctxs, spp, adaptive)
+
+                try:
+                    # The kernel thread pool was started in this process (at
+                    # the latest by mi_load_dict()), so Python warns that
+                    # forking a multi-threaded process may deadlock. Workers
+                    # only inherit the calling thread; the hazard is a lock
+                    # held by a pool thread at fork time, which cannot happen
+                    # once queued kernel work has completed. In workers, tasks
+                    # submitted to the inherited pool are then processed by the
+                    # waiting thread itself.
+                    dr.sync_thread()
+
+                    with warnings.catch_warnings():
+                        warnings.filterwarnings(
+                            "ignore",
+                            message=".*use of fork\\(\\) may lead to deadlocks.*",
+                            category=DeprecationWarning,
+                        )
+                        with ProcessPoolExecutor(
+                            max_workers=processes,
+                            mp_context=multiprocessing.get_context("fork"),
+                        ) as executor:
+                            # Contexts are dispatched by CKD bin; results are
+                            # collected in context order
+                            batches = [
+                                [i_render[i] for i in batch]
+                                for batch in _context_batches(
+                                    [ctxs[i] for i in i_render]
+                                )
+                            ]
+                            for i_ctxs, (batch_results, batch_stats) in zip(
+                                batches,
+                                executor.map(
+                                    _render_batch_worker,
+                                    batches,
+                                    [[seeds[i] for i in i_ctxs] for i_ctxs in batches],
+                                ),
+                            ):
+                                for k, v in batch_stats.items():
+                                    umap_template.update_stats[k] += v
+
+                                for i_ctx, (_, buffers, sample_counts) in zip(
+                                    i_ctxs, batch_results
+                                ):
+                                    pbar.set_description(
+                                        f"Eradiate [{ctxs[i_ctx].index_formatted}]",
+                                        refresh=True,
+                                    )
+                                    deliver(
+                                        i_ctx,
+                                        {
+                                            sensor_id: mi.Bitmap(
+                                                array, pixel_format, channel_names
+                                            )
+                                            for sensor_id, (
+                                                array,
+                                                pixel_format,
+                                                channel_names,
+                                            ) in buffers.items()
+                                        },
+                                        sample_counts,
+                                    )
+                finally:
+                    _WORKER_STATE.clear()
+
+            restore(len(ctxs))
+
+        finally:
+            # Completed contexts are persisted even if the loop is interrupted
+            if checkpoint is not None:
+                checkpoint.flush()
+
+    logger.debug(
+        "Scene parameter updates: %(evaluated)s evaluated, %(skipped)s skipped",
+        umap_template.update_stats,
+    )
 
     return results
@@ -8,13 +8,19 @@ This module contains components to imperatively assemble a
 from __future__ import annotations
 
 from . import logic
-from .engine import Pipeline
+from .engine import CompiledPipeline, Pipeline
 from .._mode import modes
+from ..util.misc import CacheInfo, _LRUStore, fingerprint
 
 _MODE_IDS_CKD = set(modes(lambda x: x.is_ckd))
 
+# Compiled pipelines, keyed by configuration fingerprint
+_COMPILED_PIPELINES = _LRUStore(maxsize=64, maxbytes=None)
+
 _FINAL_DATA = {"final": True, "kind": "data"}
 _FINAL_COORD = {"final": True, "kind": "coord"}
+# SRF-weighted outputs have no spectral dimension
+_FINAL_DATA_SRF = {**_FINAL_DATA, "srf": True}
 
 
 def build_pipeline(config: dict) -> Pipeline:
@@ -42,11 +48,25 @@ def build_pipeline(config: dict) -> Pipeline:
             Whether to compute variance.
         ``calculate_stokes`` : bool
             Whether to compute the full Stokes vector.
+        ``accumulate_ckd_quad`` : bool, optional
+            Whether the CKD quadrature was evaluated during the spectral loop
+            (see :class:`.CKDQuadAccumulator`). If ``True``, raw bitmaps are
+            replaced by an ``accumulator`` virtual input.
 
     Returns
     -------
     .Pipeline
         A configured pipeline ready for execution.
+
+    Notes
+    -----
+    Nodes which do not depend on raw results (viewing angles, spectral
+    response, irradiance) are memoizable: when a :class:`.PipelineMemo` is
+    passed to :meth:`.Pipeline.execute`, their outputs are reused across
+    executions with identical inputs.
+
+    Final SRF-weighted outputs, which have no spectral dimension, are flagged
+    with the ``srf=True`` metadata entry.
     """
     pipeline = Pipeline()
     mode_id = config["mode_id"]
@@ -57,6 +77,7 @@ def build_pipeline(config: dict) -> Pipeline:
     calc_var = config["calculate_variance"]
     calc_stokes = config["calculate_stokes"]
     is_ckd = mode_id in _MODE_IDS_CKD
+    accumulate = is_ckd and config.get("accumulate_ckd_quad", False)
 
     # ------------------------------------------------------------------
     # viewing_angles node (optional)
@@ -69,6 +90,7 @@ def build_pipeline(config: dict) -> Pipeline:
             dependencies=["angles"],
             description="Compute viewing angles dataset",
             metadata=_FINAL_COORD,
+            memoize=True,
         )
 
     # ------------------------------------------------------------------
@@ -80,6 +102,7 @@ def build_pipeline(config: dict) -> Pipeline:
             func=lambda srf: logic.spectral_response(srf),
             dependencies=["srf"],
             description="Evaluate spectral response function",
+            memoize=True,
         )
 
     # ------------------------------------------------------------------
@@ -93,129 +116,184 @@ def build_pipeline(config: dict) -> Pipeline:
         dependencies=["mode_id", "illumination", "spectral_grid"],
         description="Extract irradiance and solar angles",
         outputs={"irradiance": "irradiance", "solar_angles": "solar_angles"},
+        memoize=True,
     )
     pipeline.get_node("irradiance").metadata.update(_FINAL_DATA)
     pipeline.get_node("solar_angles").metadata.update(_FINAL_COORD)
 
-    # ------------------------------------------------------------------
-    # gather_bitmaps — expands into spp, weights_raw, <var>_raw [+ m2_raw]
-    # viewing_angles is either a real node (add_viewing_angles=True) or a
-    # virtual input set to None via inputs dict.
-    # ------------------------------------------------------------------
-    gather_outputs = ["spp", "weights_raw", f"{var_name}_raw"]
-    if calc_var:
-        gather_outputs.append(f"{var_name}_m2_raw")
-
-    def _gather_bitmaps_func(
-        mode_id,
-        var_name,
-        var_metadata,
-        calculate_variance,
-        calculate_stokes,
-        bitmaps,
-        solar_angles,
-        viewing_angles,
-    ):
-        return logic.gather_bitmaps(
+    if accumulate:
+        # --------------------------------------------------------------
+        # gather_ckd_aggregates — expands into <var> [+ <var>_var]
+        # The CKD quadrature was evaluated during the spectral loop: this
+        # replaces bitmap gathering, variance and quadrature nodes.
+        # --------------------------------------------------------------
+        aggregate_outputs = [var_name]
+        if calc_var:
+            aggregate_outputs.append(f"{var_name}_var")
+
+        def _gather_ckd_aggregates_func(
             mode_id,
             var_name,
             var_metadata,
             calculate_variance,
             calculate_stokes,
-            bitmaps,
-            viewing_angles,
+            accumulator,
+            spectral_grid,
             solar_angles,
-        )
-
-    pipeline.add_node(
-        "_gather_bitmaps",
-        func=_gather_bitmaps_func,
-        dependencies=[
-            "mode_id",
-            "var_name",
-            "var_metadata",
-            "calculate_variance",
-            "calculate_stokes",
-            "bitmaps",
-            "solar_angles",
-            "viewing_angles",
-        ],
-        description="Gather raw bitmaps into xarray arrays",
-        outputs=gather_outputs,
-    )
-
-    # ------------------------------------------------------------------
-    # moment2_to_variance → <var>_var_raw (optional)
-    # ------------------------------------------------------------------
-    if calc_var:
-        _vn = var_name  # capture for closure
-
-        def _m2_to_var(**kwargs):
-            return logic.moment2_to_variance(
-                kwargs[f"{_vn}_raw"],
-                kwargs[f"{_vn}_m2_raw"],
-                kwargs["spp"],
-                kwargs["calculate_stokes"],
+            viewing_angles,
+        ):
+            return logic.gather_ckd_aggregates(
+                mode_id,
+                var_name,
+                var_metadata,
+                calculate_variance,
+                calculate_stokes,
+                accumulator,
+                spectral_grid,
+                viewing_angles,
+                solar_angles,
             )
 
         pipeline.add_node(
-            f"{var_name}_var_raw",
-            func=_m2_to_var,
+            "_gather_ckd_aggregates",
+            func=_gather_ckd_aggregates_func,
             dependencies=[
-                f"{var_name}_raw",
-                f"{var_name}_m2_raw",
-                "spp",
+                "mode_id",
+                "var_name",
+                "var_metadata",
+                "calculate_variance",
                 "calculate_stokes",
+                "accumulator",
+                "spectral_grid",
+                "solar_angles",
+                "viewing_angles",
             ],
-            description="Compute variance from 2nd moment",
+            description="Gather CKD quadrature aggregates into xarray arrays",
+            outputs=aggregate_outputs,
         )
+        for output in aggregate_outputs:
+            pipeline.get_node(output).metadata.update(_FINAL_DATA)
+
+    else:
+        # --------------------------------------------------------------
+        # gather_bitmaps — expands into spp, weights_raw, <var>_raw [+ m2_raw]
+        # viewing_angles is either a real node (add_viewing_angles=True) or a
+        # virtual input set to None via inputs dict.
+        # --------------------------------------------------------------
+        gather_outputs = ["spp", "weights_raw", f"{var_name}_raw"]
+        if calc_var:
+            gather_outputs.append(f"{var_name}_m2_raw")
+
+        def _gather_bitmaps_func(
+            mode_id,
+            var_name,
+            var_metadata,
+            calculate_variance,
+            calculate_stokes,
+            bitmaps,
+            solar_angles,
+            viewing_angles,
+        ):
+            return logic.gather_bitmaps(
+                mode_id,
+                var_name,
+                var_metadata,
+                calculate_variance,
+                calculate_stokes,
+                bitmaps,
+                viewing_angles,
+                solar_angles,
+            )
 
-    # ------------------------------------------------------------------
-    # aggregate_ckd_quad → <var>  (always — no-op in mono)
-    # ------------------------------------------------------------------
-    _vn = var_name  # capture for closure
-
-    def _aggregate_main(**kwargs):
-        return logic.aggregate_ckd_quad(
-            kwargs["mode_id"],
-            kwargs[f"{_vn}_raw"],
-            kwargs["spectral_grid"],
-            kwargs["ckd_quads"],
-            False,
+        pipeline.add_node(
+            "_gather_bitmaps",
+            func=_gather_bitmaps_func,
+            dependencies=[
+                "mode_id",
+                "var_name",
+                "var_metadata",
+                "calculate_variance",
+                "calculate_stokes",
+                "bitmaps",
+                "solar_angles",
+                "viewing_angles",
+            ],
+            description="Gather raw bitmaps into xarray arrays",
+            outputs=gather_outputs,
         )
 
-    pipeline.add_node(
-        var_name,
-        func=_aggregate_main,
-        dependencies=["mode_id", f"{var_name}_raw", "spectral_grid", "ckd_quads"],
-        description=f"Aggregate CKD quadrature → {var_name}",
-        metadata=_FINAL_DATA,
-    )
+        # --------------------------------------------------------------
+        # moment2_to_variance → <var>_var_raw (optional)
+        # --------------------------------------------------------------
+        if calc_var:
+            _vn = var_name  # capture for closure
+
+            def _m2_to_var(**kwargs):
+                return logic.moment2_to_variance(
+                    kwargs[f"{_vn}_raw"],
+                    kwargs[f"{_vn}_m2_raw"],
+                    kwargs["spp"],
+                    kwargs["calculate_stokes"],
+                )
 
-    if calc_var:
+            pipeline.add_node(
+                f"{var_name}_var_raw",
+                func=_m2_to_var,
+                dependencies=[
+                    f"{var_name}_raw",
+                    f"{var_name}_m2_raw",
+                    "spp",
+                    "calculate_stokes",
+                ],
+                description="Compute variance from 2nd moment",
+            )
 
-        def _aggregate_var(**kwargs):
+        # --------------------------------------------------------------
+        # aggregate_ckd_quad → <var>  (always — no-op in mono)
+        # --------------------------------------------------------------
+        _vn = var_name  # capture for closure
+
+        def _aggregate_main(**kwargs):
             return logic.aggregate_ckd_quad(
                 kwargs["mode_id"],
-                kwargs[f"{_vn}_var_raw"],
+                kwargs[f"{_vn}_raw"],
                 kwargs["spectral_grid"],
                 kwargs["ckd_quads"],
-                True,
+                False,
             )
 
         pipeline.add_node(
-            f"{var_name}_var",
-            func=_aggregate_var,
-            dependencies=[
-                "mode_id",
-                f"{var_name}_var_raw",
-                "spectral_grid",
-                "ckd_quads",
-            ],
-            description=f"Aggregate CKD quadrature → {var_name}_var",
+            var_name,
+            func=_aggregate_main,
+            dependencies=["mode_id", f"{var_name}_raw", "spectral_grid", "ckd_quads"],
+            description=f"Aggregate CKD quadrature → {var_name}",
             metadata=_FINAL_DATA,
         )
 
+        if calc_var:
+
+            def _aggregate_var(**kwargs):
+                return logic.aggregate_ckd_quad(
+                    kwargs["mode_id"],
+                    kwargs[f"{_vn}_var_raw"],
+                    kwargs["spectral_grid"],
+                    kwargs["ckd_quads"],
+                    True,
+                )
+
+            pipeline.add_node(
+                f"{var_name}_var",
+                func=_aggregate_var,
+                dependencies=[
+                    "mode_id",
+                    f"{var_name}_var_raw",
+                    "spectral_grid",
+                    "ckd_quads",
+                ],
+                description=f"Aggregate CKD quadrature → {var_name}_var",
+                metadata=_FINAL_DATA,
+            )
+
     # ------------------------------------------------------------------
     # radiosity  (sector_radiosity only)
     # Must be added before radiosity_srf which depends on it.
@@ -245,7 +323,7 @@ def build_pipeline(config: dict) -> Pipeline:
             func=_make_srf_node(var_name),
             dependencies=[var_name, "srf"],
             description=f"Apply SRF → {var_name}_srf",
-            metadata=_FINAL_DATA,
+            metadata=_FINAL_DATA_SRF,
         )
 
         if var_name == "sector_radiosity":
@@ -254,7 +332,7 @@ def build_pipeline(config: dict) -> Pipeline:
                 func=_make_srf_node("radiosity"),
                 dependencies=["radiosity", "srf"],
                 description="Apply SRF → radiosity_srf",
-                metadata=_FINAL_DATA,
+                metadata=_FINAL_DATA_SRF,
             )
 
         if measure_distant:
@@ -263,7 +341,8 @@ def build_pipeline(config: dict) -> Pipeline:
                 func=_make_srf_node("irradiance"),
                 dependencies=["irradiance", "srf"],
                 description="Apply SRF → irradiance_srf",
-                metadata=_FINAL_DATA,
+                metadata=_FINAL_DATA_SRF,
+                memoize=True,
             )
 
     # ------------------------------------------------------------------
@@ -288,7 +367,7 @@ def build_pipeline(config: dict) -> Pipeline:
                 ),
                 dependencies=["radiosity_srf", "irradiance_srf"],
                 description="Compute surface albedo (SRF-weighted)",
-                metadata=_FINAL_DATA,
+                metadata=_FINAL_DATA_SRF,
             )
 
     # ------------------------------------------------------------------
@@ -324,8 +403,8 @@ def build_pipeline(config: dict) -> Pipeline:
                 description="Compute BRDF and BRF (SRF-weighted)",
                 outputs=["brdf_srf", "brf_srf"],
             )
-            pipeline.get_node("brdf_srf").metadata.update(_FINAL_DATA)
-            pipeline.get_node("brf_srf").metadata.update(_FINAL_DATA)
+            pipeline.get_node("brdf_srf").metadata.update(_FINAL_DATA_SRF)
+            pipeline.get_node("brf_srf").metadata.update(_FINAL_DATA_SRF)
 
     # ------------------------------------------------------------------
     # dlp  (Stokes only)
@@ -347,7 +426,54 @@ def build_pipeline(config: dict) -> Pipeline:
                 ),
                 dependencies=["radiance_srf"],
                 description="Compute DLP (SRF-weighted)",
-                metadata=_FINAL_DATA,
+                metadata=_FINAL_DATA_SRF,
             )
 
     return pipeline
+
+
+def compile_pipeline(config: dict) -> CompiledPipeline:
+    """
+    Build and compile a post-processing pipeline from a configuration
+    dictionary, reusing a previously compiled plan if one exists for an equal
+    configuration.
+
+    Parameters
+    ----------
+    config : dict
+        Pipeline configuration dictionary (see :func:`build_pipeline`).
+
+    Returns
+    -------
+    .CompiledPipeline
+        An immutable execution plan. It is shared by all callers requesting
+        an equal configuration.
+
+    See Also
+    --------
+    :meth:`.Pipeline.compile`, :func:`compile_pipeline_cache_info`,
+    :func:`compile_pipeline_cache_clear`
+    """
+    key = fingerprint(config)
+    found, compiled = _COMPILED_PIPELINES.get(key)
+
+    if not found:
+        compiled = build_pipeline(config).compile()
+        _COMPILED_PIPELINES.put(key, compiled)
+
+    return compiled
+
+
+def compile_pipeline_cache_info() -> CacheInfo:
+    """
+    Return statistics of the compiled pipeline cache used by
+    :func:`compile_pipeline`.
+    """
+    return _COMPILED_PIPELINES.info()
+
+
+def compile_pipeline_cache_clear() -> None:
+    """
+    Clear the compiled pipeline cache used by :func:`compile_pipeline`.
+    """
+    _COMPILED_PIPELINES.clear()
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 from collections.abc import Sequence
+from types import MappingProxyType
 from typing import Any, Callable
 
 import attrs
 import networkx as nx
 
+from ..util import profiling
+from ..util.misc import CacheInfo, _LRUStore, fingerprint
+
 _DOT_STYLES = {
     "node_default": {"fontname": "Helvetica", "fontsize": "10"},
     "edge_default": {"fontname": "Helvetica", "fontsize": "9"},
@@ -71,6 +76,11 @@ class Node:
 
     metadata : dict, optional
         Additional metadata/tags for the node.
+
+    memoize : bool, default: False
+        Whether the node output may be stored in and retrieved from a
+        :class:`.PipelineMemo` (see :meth:`.Pipeline.execute`). This requires
+        ``func`` to be a pure function of its dependencies.
     """
 
     name: str
@@ -81,6 +91,7 @@ class Node:
     post_funcs: list[Callable] = attrs.field(factory=list)
     validate: bool = True
     metadata: dict[str, Any] = attrs.field(factory=dict)
+    memoize: bool = False
 
     def pprint(self):
         try:
@@ -93,6 +104,375 @@ class Node:
         pprint(self)
 
 
+@attrs.define
+class PipelineMemo:
+    """
+    A bounded store of node outputs shared across pipeline executions.
+
+    When a memo is passed to :meth:`.Pipeline.execute`, the outputs of nodes
+    created with ``memoize=True`` are keyed by the node name and the
+    :func:`.fingerprint` of the values they (transitively) depend on. Nodes
+    whose key is found in the memo are not executed, nor are their ancestors
+    if nothing else requires them. A memo can be shared by different
+    pipelines, *e.g.* to avoid evaluating the same spectral response function
+    for several measures.
+
+    Parameters
+    ----------
+    maxsize : int or None, default: 128
+        Maximum number of stored outputs. If ``None``, the entry count is
+        unbounded.
+
+    maxbytes : int or None, default: None
+        Maximum estimated memory footprint of stored outputs, in bytes. If
+        ``None``, the memory footprint is unbounded.
+
+    Warnings
+    --------
+    Stored outputs are returned without copy: mutating them will corrupt the
+    memo.
+
+    Notes
+    -----
+    Nodes which depend on values that cannot be fingerprinted are never
+    memoized.
+    """
+
+    maxsize: int | None = attrs.field(default=128)
+    maxbytes: int | None = attrs.field(default=None)
+    _store: _LRUStore = attrs.field(
+        default=attrs.Factory(
+            lambda self: _LRUStore(self.maxsize, self.maxbytes), takes_self=True
+        ),
+        init=False,
+        repr=False,
+    )
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Look up a stored output. Returns a (found, value) pair.
+        """
+        return self._store.get(key)
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store an output.
+        """
+        self._store.put(key, value)
+
+    def clear(self) -> None:
+        """
+        Remove all stored outputs and reset statistics.
+        """
+        self._store.clear()
+
+    def info(self) -> CacheInfo:
+        """
+        Return memo statistics.
+        """
+        return self._store.info()
+
+
+@attrs.frozen
+class _Step:
+    # Immutable node representation used by CompiledPipeline
+
+    name: str
+    func: Callable
+    dependencies: tuple[str, ...]
+    pre_funcs: tuple[Callable, ...]
+    post_funcs: tuple[Callable, ...]
+    metadata: MappingProxyType
+    memoize: bool
+
+    @classmethod
+    def from_node(cls, node: Node, validate: bool = True) -> _Step:
+        # Pre/post functions are dropped if validation is disabled
+        validate = validate and node.validate
+        return cls(
+            name=node.name,
+            func=node.func,
+            dependencies=tuple(node.dependencies),
+            pre_funcs=tuple(node.pre_funcs) if validate else (),
+            post_funcs=tuple(node.post_funcs) if validate else (),
+            metadata=MappingProxyType(dict(node.metadata)),
+            memoize=node.memoize,
+        )
+
+    def __call__(self, inputs: dict[str, Any]) -> Any:
+        with profiling.stage(f"pipeline.{self.name}"):
+            for func in self.pre_funcs:
+                func(inputs)
+
+            result = self.func(**inputs)
+
+            for func in self.post_funcs:
+                func(result)
+
+        return result
+
+
+@attrs.frozen(eq=False)
+class CompiledPipeline:
+    """
+    An immutable, pre-sorted execution plan produced by
+    :meth:`.Pipeline.compile`.
+
+    A compiled pipeline holds a flat list of nodes in topological order with
+    their resolved dependencies; execution does not involve any graph
+    operation. It holds no execution state and can therefore be shared and
+    executed concurrently, *e.g.* to memoize post-processing pipelines by
+    configuration (see :func:`.compile_pipeline`).
+
+    Parameters
+    ----------
+    steps : tuple
+        Compiled nodes, in topological order.
+
+    virtual_inputs : frozenset of str
+        Names of the virtual inputs of the pipeline.
+    """
+
+    steps: tuple[_Step, ...] = attrs.field(converter=tuple)
+    virtual_inputs: frozenset[str] = attrs.field(converter=frozenset)
+    _index: dict[str, int] = attrs.field(
+        default=attrs.Factory(
+            lambda self: {step.name: i for i, step in enumerate(self.steps)},
+            takes_self=True,
+        ),
+        init=False,
+        repr=False,
+    )
+    _successors: dict[str, tuple[str, ...]] = attrs.field(
+        default=attrs.Factory(
+            lambda self: self._compute_successors(self.steps), takes_self=True
+        ),
+        init=False,
+        repr=False,
+    )
+
+    @staticmethod
+    def _compute_successors(steps: tuple[_Step, ...]) -> dict[str, tuple[str, ...]]:
+        successors = {}
+        for step in steps:
+            for dep in step.dependencies:
+                successors.setdefault(dep, []).append(step.name)
+        return {k: tuple(v) for k, v in successors.items()}
+
+    def list_nodes(self) -> list[str]:
+        """
+        List all node names in topological order.
+        """
+        return [step.name for step in self.steps]
+
+    def get_virtual_inputs(self) -> list[str]:
+        """
+        List virtual inputs, sorted by name.
+        """
+        return sorted(self.virtual_inputs)
+
+    def get_nodes_by_metadata(self, **kwargs: Any) -> list[str]:
+        """
+        Return names of nodes whose metadata matches all given key-value pairs,
+        in topological order (see :meth:`.Pipeline.get_nodes_by_metadata`).
+        """
+        return [
+            step.name
+            for step in self.steps
+            if all(
+                k in step.metadata and step.metadata[k] == v for k, v in kwargs.items()
+            )
+        ]
+
+    def execute(
+        self,
+        outputs: list[str] | None = None,
+        inputs: dict[str, Any] | None = None,
+        executor: concurrent.futures.Executor | None = None,
+        memo: PipelineMemo | None = None,
+    ) -> dict[str, Any]:
+        """
+        Execute the plan and return results. Parameters and semantics are the
+        same as for :meth:`.Pipeline.execute`.
+
+        Raises
+        ------
+        ValueError
+            If output nodes don't exist, if input keys are neither nodes nor
+            virtual inputs, or if required virtual inputs are missing.
+        """
+        if outputs is None:
+            outputs = [
+                step.name for step in self.steps if step.name not in self._successors
+            ]
+        for output in outputs:
+            if output not in self._index:
+                raise ValueError(f"Output node '{output}' not found")
+
+        values = dict(inputs or {})
+        for key in values:
+            if key not in self._index and key not in self.virtual_inputs:
+                raise ValueError(
+                    f"Input key '{key}' is neither a node nor a virtual input"
+                )
+
+        self._run(outputs, values, executor, memo)
+        return {name: values[name] for name in outputs}
+
+    def _run(
+        self,
+        outputs: list[str],
+        values: dict[str, Any],
+        executor: concurrent.futures.Executor | None,
+        memo: PipelineMemo | None,
+    ) -> None:
+        """
+        Compute the requested outputs and add them, as well as intermediate
+        results, to ``values``, which initially holds virtual input values and
+        node bypasses.
+        """
+        execution_order = self._execution_order(outputs, values)
+
+        # Look up memoized node outputs: hits are handled like node bypasses
+        memo_keys = {}
+        if memo is not None:
+            memo_keys = self._memo_keys(execution_order, values)
+            hit = False
+            for node_name, key in memo_keys.items():
+                found, value = memo.get(key)
+                if found:
+                    values[node_name] = value
+                    hit = True
+            if hit:
+                execution_order = self._execution_order(outputs, values)
+
+        # Execute nodes
+        if executor is None:
+            for step in execution_order:
+                values[step.name] = step(
+                    {dep: values[dep] for dep in step.dependencies}
+                )
+        else:
+            self._execute_concurrent(execution_order, values, executor)
+
+        # Store memoizable outputs
+        for step in execution_order:
+            if step.name in memo_keys:
+                memo.put(memo_keys[step.name], values[step.name])
+
+    def _execution_order(
+        self, outputs: list[str], values: dict[str, Any]
+    ) -> list[_Step]:
+        """
+        Collect the nodes required to compute outputs, in topological order.
+        The search stops at nodes and virtual inputs with available values.
+        """
+        required = set()
+        missing = set()
+        stack = [name for name in outputs if name not in values]
+
+        while stack:
+            name = stack.pop()
+            if name in required:
+                continue
+            if name not in self._index:
+                missing.add(name)
+                continue
+            required.add(name)
+            stack.extend(
+                dep
+                for dep in self.steps[self._index[name]].dependencies
+                if dep not in values and dep not in required
+            )
+
+        if missing:
+            raise ValueError(
+                f"Missing required virtual inputs: {sorted(missing)}. "
+                f"These must be provided in inputs."
+            )
+
+        return [self.steps[i] for i in sorted(self._index[name] for name in required)]
+
+    def _execute_concurrent(
+        self,
+        execution_order: list[_Step],
+        values: dict[str, Any],
+        executor: concurrent.futures.Executor,
+    ) -> None:
+        """
+        Execute nodes with an executor, submitting each node as soon as its
+        dependencies are available. Results are stored by the calling thread.
+        """
+        steps = {step.name: step for step in execution_order}
+        waiting = {
+            step.name: {dep for dep in step.dependencies if dep not in values}
+            for step in execution_order
+        }
+        futures = {}
+
+        def submit(step: _Step) -> None:
+            inputs = {dep: values[dep] for dep in step.dependencies}
+            futures[executor.submit(step, inputs)] = step.name
+
+        for step in execution_order:
+            if not waiting[step.name]:
+                submit(step)
+
+        while futures:
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+
+            for future in done:
+                node_name = futures.pop(future)
+
+                try:
+                    values[node_name] = future.result()
+                except BaseException:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+
+                for successor in self._successors.get(node_name, ()):
+                    if successor in waiting:
+                        waiting[successor].discard(node_name)
+                        if not waiting[successor] and successor not in values:
+                            submit(steps[successor])
+
+    def _memo_keys(
+        self, execution_order: list[_Step], values: dict[str, Any]
+    ) -> dict[str, str]:
+        """
+        Compute the memo keys of memoizable nodes. A node key combines its name
+        and the keys of its dependencies; available values are keyed by their
+        fingerprint. Nodes which (transitively) depend on a value which cannot
+        be fingerprinted get no key.
+        """
+        keys: dict[str, str | None] = {}
+
+        def key(name: str) -> str | None:
+            if name not in keys:
+                if name in values:
+                    try:
+                        keys[name] = fingerprint((name, values[name]))
+                    except TypeError:
+                        keys[name] = None
+                else:
+                    dep_keys = [
+                        key(dep) for dep in self.steps[self._index[name]].dependencies
+                    ]
+                    keys[name] = (
+                        None if None in dep_keys else fingerprint((name, dep_keys))
+                    )
+            return keys[name]
+
+        result = {}
+        for step in execution_order:
+            if step.memoize and key(step.name) is not None:
+                result[step.name] = keys[step.name]
+        return result
+
+
 @attrs.define
 class Pipeline:
     """
@@ -149,6 +529,7 @@ class Pipeline:
         validate: bool = True,
         metadata: dict[str, Any] | None = None,
         outputs: list[str] | dict[str, str | Callable] | None = None,
+        memoize: bool = False,
     ) -> Pipeline:
         """
         Add a computation node to the pipeline.
@@ -205,6 +586,11 @@ class Pipeline:
               that receives the full dict and returns the node value.
               ``{"x": lambda d: d["x"]}`` for full control.
 
+        memoize : bool, default: False
+            Whether the node output may be stored in a :class:`.PipelineMemo`
+            (see :meth:`execute`). Only set this for nodes whose function is a
+            pure function of its dependencies.
+
         Returns
         -------
         Pipeline
@@ -287,6 +673,7 @@ class Pipeline:
             post_funcs=post_funcs or [],
             validate=validate,
             metadata=metadata or {},
+            memoize=memoize,
         )
 
         # Add to graph
@@ -321,7 +708,7 @@ class Pipeline:
             }
 
             # Wrap each extractor so the engine can call it with **inputs.
-            # _execute_node calls func(**{name: dict_value}), but user-supplied
+            # Nodes are called with func(**{name: dict_value}), but user-supplied
             # extractors expect the dict as a plain positional argument.
             def _make_extractor(src: str, ext: Callable) -> Callable:
                 def wrapped(**kwargs: Any) -> Any:
@@ -448,12 +835,17 @@ class Pipeline:
                     post_funcs=node.post_funcs,
                     validate=node.validate,
                     metadata=node.metadata,
+                    memoize=node.memoize,
                 )
 
         return new_pipeline
 
     def execute(
-        self, outputs: list[str] | None = None, inputs: dict[str, Any] | None = None
+        self,
+        outputs: list[str] | None = None,
+        inputs: dict[str, Any] | None = None,
+        executor: concurrent.futures.Executor | None = None,
+        memo: PipelineMemo | None = None,
     ) -> dict[str, Any]:
         """
         Execute the pipeline and return results.
@@ -473,6 +865,18 @@ class Pipeline:
             - For regular nodes: the node will not be executed; the provided
               value is used instead, effectively bypassing its computation.
 
+        executor : concurrent.futures.Executor, optional
+            If set, nodes are submitted to this executor as soon as their
+            dependencies are available, so that independent branches run
+            concurrently. Node functions are called with keyword arguments and
+            results are shared in memory: a
+            :class:`~concurrent.futures.ThreadPoolExecutor` is expected. By
+            default, nodes are executed sequentially in topological order.
+
+        memo : .PipelineMemo, optional
+            If set, outputs of nodes created with ``memoize=True`` are looked
+            up in and stored to this memo (see :class:`.PipelineMemo`).
+
         Returns
         -------
         dict
@@ -525,78 +929,29 @@ class Pipeline:
         self._cache.update(node_bypasses)
         self._cache.update(virtual_input_values)
 
-        # Determine execution order
-        required_nodes = set()
-        for output in outputs:
-            required_nodes.add(output)
-            if output in node_bypasses:
-                # Output is bypassed; its ancestors don't need to be executed
-                continue
-            # Only add ancestors that aren't bypassed or virtual
-            for ancestor in nx.ancestors(self._graph, output):
-                if ancestor not in inputs and ancestor not in self._virtual_inputs:
-                    required_nodes.add(ancestor)
-
-        # Get topological order (exclude virtual inputs and bypassed nodes)
-        execution_order = [
-            n
-            for n in nx.topological_sort(self._graph)
-            if n in required_nodes and n not in inputs and n not in self._virtual_inputs
-        ]
-
-        # Execute nodes
-        for node_name in execution_order:
-            self._execute_node(node_name)
+        # Run the compiled plan (ancestors of bypassed nodes are not executed)
+        self.compile()._run(outputs, self._cache, executor, memo)
 
         # Return requested outputs
         return {name: self._cache[name] for name in outputs}
 
-    def _execute_node(self, node_name: str) -> Any:
+    def compile(self) -> CompiledPipeline:
         """
-        Execute a single node.
-
-        Parameters
-        ----------
-        node_name : str
-            Name of the node to execute.
+        Compile the pipeline to an immutable execution plan.
 
         Returns
         -------
-        Any
-            The computed result.
+        .CompiledPipeline
+            A flat, topologically sorted representation of the pipeline,
+            which can be executed repeatedly (and concurrently) without graph
+            operations. Later modifications of this pipeline do not affect it.
         """
-        if node_name in self._cache:
-            return self._cache[node_name]
-
-        node = self._nodes[node_name]
-
-        # Gather inputs
-        inputs = {}
-        for dep in node.dependencies:
-            # Recursively execute dependencies if not cached
-            if dep not in self._cache:
-                self._execute_node(dep)
-            inputs[dep] = self._cache[dep]
-
-        validate = self.validate and node.validate
-
-        # Run pre-funcs
-        if validate:
-            for func in node.pre_funcs:
-                func(inputs)
-
-        # Execute node function
-        result = node.func(**inputs)
-
-        # Run post-funcs
-        if validate:
-            for func in node.post_funcs:
-                func(result)
-
-        # Cache result
-        self._cache[node_name] = result
-
-        return result
+        steps = tuple(
+            _Step.from_node(self._nodes[name], self.validate)
+            for name in nx.topological_sort(self._graph)
+            if name in self._nodes
+        )
+        return CompiledPipeline(steps, frozenset(self._virtual_inputs))
 
     def _resolve_outputs(self, outputs: list[str] | None) -> list[str]:
         """
@@ -4,16 +4,18 @@ Basic components of post-processing pipeline assembly.
 
 from __future__ import annotations
 
-import itertools
-from collections import OrderedDict
-
+import attrs
+import mitsuba as mi
 import numpy as np
+import numpy.typing as npt
+import pandas as pd
 import pint
 import pinttrs
 import xarray as xr
 from pinttr.util import always_iterable
 
 from .._mode import Mode
+from ..attrs import define
 from ..exceptions import UnsupportedModeError
 from ..kernel import bitmap_to_dataarray
 from ..quad import Quad
@@ -121,51 +123,56 @@ def aggregate_ckd_quad(
         result.name = result_name
         return raw_data
 
-    # Get dimensions of current variable
-    sizes = OrderedDict((y, len(raw_data.coords[y])) for y in raw_data.sizes)
-
     for dim in ["w", "g"]:
-        if dim not in sizes:
+        if dim not in raw_data.dims:
             raise ValueError(
                 f"CKD quadrature computation requires dimension {dim}, missing "
                 "from input data"
             )
 
-    # Init storage
-    del sizes["w"]
-    del sizes["g"]
-
     # -- Collect wavelengths associated with each bin
-    wavelength_units = ucc.get("wavelength")
-    bin_wmins = spectral_grid.wmins.m_as(wavelength_units)
-    bin_wmaxs = spectral_grid.wmaxs.m_as(wavelength_units)
-
-    # -- Proceed with actual storage initialization
-    result = xr.full_like(raw_data, np.nan).isel(g=0, drop=True)
-
-    # For each bin and each pixel, compute quadrature and store the result
-    for i_bin, (w, quad) in enumerate(zip(spectral_grid.wcenters, ckd_quads)):
-        values_at_nodes = raw_data.sel(w=w).values
-
-        # Rationale: Avoid using xarray's indexing in this loop for
-        # performance reasons (wrong data indexing method will result in
-        # 10x+ speed reduction)
-        for indexes in itertools.product(*[list(range(n)) for n in sizes.values()]):
-            interval = (0.0, 1.0)
-
-            if is_variance:
-                weights = quad.weights.copy()
-                if interval is not None:
-                    weights *= 0.5 * (interval[1] - interval[0])
-
-                variance = values_at_nodes[(slice(None), *indexes)]
-                weighted_sum = float(np.dot(weights**2, variance))
-                result.values[(i_bin, *indexes)] = weighted_sum
-            else:
-                result.values[(i_bin, *indexes)] = quad.integrate(
-                    values_at_nodes[(slice(None), *indexes)],
-                    interval=interval,
-                )
+    bin_wcenters = spectral_grid.wcenters.m_as(ucc.get("wavelength"))
+
+    # -- Proceed with actual storage initialization: data is ordered like
+    #    spectral grid bins and spectral dimensions are moved to the front so
+    #    that we operate on contiguous pixel blocks
+    result_dims = [dim for dim in raw_data.dims if dim != "g"]
+    w_index = raw_data.get_index("w")
+    data = raw_data.transpose("w", "g", ...).isel(
+        w=[w_index.get_loc(w) for w in bin_wcenters]
+    )
+    values = data.values
+    result = xr.full_like(data, np.nan).isel(g=0, drop=True)
+
+    # Group bins which share the same quadrature rule
+    groups = {}
+    for i_bin, quad in enumerate(ckd_quads):
+        groups.setdefault(quad.weights.tobytes(), (quad, []))[1].append(i_bin)
+
+    # For each group of bins, contract the g dimension of all pixels at once.
+    # Rationale: Avoid Python-level loops on pixels, which dominate the cost of
+    # this step for large films.
+    g_index = data.get_index("g")
+
+    for quad, i_bins in groups.values():
+        # With adaptive quadrature policies, bins have different g-point
+        # counts and the g dimension spans the union of all bins' nodes:
+        # select the nodes of the current quadrature rule
+        i_nodes = _quad_node_positions(quad, g_index)
+        values_at_nodes = values[i_bins][:, i_nodes]
+
+        # Quadrature weights are scaled to the [0, 1] interval
+        if is_variance:
+            weights = 0.5 * quad.weights
+            result.values[i_bins] = np.tensordot(
+                weights**2, values_at_nodes, axes=(0, 1)
+            )
+        else:
+            result.values[i_bins] = 0.5 * np.tensordot(
+                quad.weights, values_at_nodes, axes=(0, 1)
+            )
+
+    result = result.transpose(*result_dims)
 
     if is_variance:  # At the moment, we do not populate metadata for variance
         result.attrs.clear()
@@ -178,12 +185,43 @@ def aggregate_ckd_quad(
     # with xr.set_options(keep_attrs=True):
     #     result["spp"] = gathered_bitmaps.spp.mean(dim="index")
 
-    # Add spectral coordinates
-    result = result.assign_coords(
+    # Add spectral coordinates and reorder by ascending "w"
+    return _assign_bin_coords(result, spectral_grid)
+
+
+def _quad_node_positions(quad: Quad, g_index: pd.Index) -> np.ndarray:
+    """
+    Locate the nodes of a quadrature rule scaled to [0, 1] in the index of a
+    ``g`` dimension.
+    """
+    i_nodes = g_index.get_indexer(quad.eval_nodes([0.0, 1.0]))
+
+    if np.all(i_nodes >= 0):
+        return i_nodes
+
+    # Fall back to positional alignment if g coordinates are not node values
+    if len(quad.nodes) == len(g_index):
+        return np.arange(len(g_index))
+
+    raise ValueError(
+        f"CKD quadrature computation: could not locate the {len(quad.nodes)} "
+        "nodes of the quadrature rule in the g coordinate of input data"
+    )
+
+
+def _assign_bin_coords(data: xr.DataArray, spectral_grid: SpectralGrid) -> xr.DataArray:
+    """
+    Attach spectral bin bounds to CKD data ordered like the bins of
+    ``spectral_grid`` along the ``w`` dimension, then reorder it by ascending
+    ``w`` values.
+    """
+    wavelength_units = ucc.get("wavelength")
+
+    result = data.assign_coords(
         {
             "bin_wmin": (
                 "w",
-                bin_wmins,
+                spectral_grid.wmins.m_as(wavelength_units),
                 {
                     "standard_name": "bin_wmin",
                     "long_name": "spectral bin lower bound",
@@ -192,7 +230,7 @@ def aggregate_ckd_quad(
             ),
             "bin_wmax": (
                 "w",
-                bin_wmaxs,
+                spectral_grid.wmaxs.m_as(wavelength_units),
                 {
                     "standard_name": "bin_wmax",
                     "long_name": "spectral bin upper bound",
@@ -202,10 +240,174 @@ def aggregate_ckd_quad(
         }
     )
 
-    # Reorder by ascending "w"
-    result = result.sortby("w")
+    return result.sortby("w")
 
-    return result
+
+@define(eq=False)
+class CKDQuadAccumulator:
+    """
+    Incremental CKD quadrature evaluator.
+
+    This class evaluates the CKD quadrature on the fly during the spectral
+    loop: each rendered image is weighted by the quadrature weight of its
+    *g*-point as soon as it is added (images yielded by a variance computation
+    are weighted by the squared weight), and only per-bin aggregates are kept.
+    Aggregates are consumed by :func:`gather_ckd_aggregates`.
+
+    Parameters
+    ----------
+    spectral_grid : .CKDSpectralGrid
+        Spectral grid walked by the spectral loop.
+
+    ckd_quads : list of .Quad
+        List of quadrature rules matching the spectral bins held by
+        ``spectral_grid``.
+
+    calculate_variance : bool
+        If ``True``, the variance is aggregated as well, using second moment
+        images stored under the ``"m2"`` key.
+
+    calculate_stokes : bool
+        If ``True``, images are Stokes vector components stored under the
+        ``"I"``, ``"Q"``, ``"U"`` and ``"V"`` keys; otherwise, the image is
+        stored under the ``"bitmap"`` key.
+
+    Notes
+    -----
+    Aggregates match the output of :func:`aggregate_ckd_quad` up to
+    floating-point rounding. Bins for which not all *g*-points were added are
+    filled with NaN.
+    """
+
+    spectral_grid: SpectralGrid = attrs.field()
+    ckd_quads: list[Quad] = attrs.field(converter=list)
+    calculate_variance: bool = attrs.field(default=False)
+    calculate_stokes: bool = attrs.field(default=False)
+
+    # Maps spectral index hashables to (bin wavelength, quadrature weight)
+    _weights: dict = attrs.field(init=False, repr=False)
+
+    # Maps bin wavelengths to the expected g-point count
+    _counts: dict = attrs.field(init=False, repr=False)
+
+    # Maps bin wavelengths to aggregated images and added g-point count
+    _aggregates: dict = attrs.field(factory=dict, init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self._weights = {}
+        self._counts = {}
+
+        for w, quad in zip(self.spectral_grid.wcenters, self.ckd_quads):
+            w = float(w.m_as(ureg.nm))  # Consistent with spectral index hash
+            self._counts[w] = len(quad.weights)
+
+            # Quadrature weights are scaled to the [0, 1] interval
+            for g, weight in zip(quad.eval_nodes([0, 1]), 0.5 * quad.weights):
+                self._weights[(w, g)] = (w, weight)
+
+    @property
+    def image_names(self) -> list[str]:
+        """
+        Names of the aggregated images.
+        """
+        return ["I", "Q", "U", "V"] if self.calculate_stokes else ["bitmap"]
+
+    def add(self, spectral_index: tuple[float, float], result_dict: dict) -> None:
+        """
+        Add the images rendered for a spectral index to the aggregates.
+
+        Parameters
+        ----------
+        spectral_index : tuple
+            Hashable representation of the CKD spectral index the images were
+            rendered for (see :attr:`.CKDSpectralIndex.as_hashable`).
+
+        result_dict : dict
+            Images and sample count, structured like the values of the
+            ``bitmaps`` argument of :func:`gather_bitmaps`.
+
+        Raises
+        ------
+        ValueError
+            If ``spectral_index`` is not part of the spectral grid.
+        """
+        try:
+            w, weight = self._weights[tuple(spectral_index)]
+        except KeyError:
+            raise ValueError(
+                f"spectral index {spectral_index} is not part of the spectral "
+                "grid of this accumulator"
+            ) from None
+
+        spp = result_dict["spp"]
+        images = {
+            name: np.array(result_dict[name], dtype=np.float64)
+            for name in self.image_names
+        }
+        contributions = {name: weight * img for name, img in images.items()}
+
+        if self.calculate_variance:
+            expectation = images[self.image_names[0]]
+            m2 = np.array(result_dict["m2"], dtype=np.float64)
+            contributions["var"] = weight**2 * (m2 - expectation * expectation) / spp
+
+        aggregate = self._aggregates.get(w)
+        if aggregate is None:
+            self._aggregates[w] = {"spp": spp, "count": 1, **contributions}
+        else:
+            aggregate["count"] += 1
+            # Sample counts are summed, then averaged upon retrieval
+            aggregate["spp"] += spp
+            for name, contribution in contributions.items():
+                aggregate[name] += contribution
+
+    def aggregates(self, wavelengths: npt.ArrayLike | None = None) -> dict:
+        """
+        Return aggregated images.
+
+        Parameters
+        ----------
+        wavelengths : array-like, optional
+            If set, only the aggregates of the bins with these central
+            wavelengths (in nm) are returned.
+
+        Returns
+        -------
+        dict
+            A dictionary mapping bin wavelengths (in nm) to aggregated images
+            and sample counts. The sample count of a bin is the (rounded) mean
+            of those of its *g*-points, which may differ if adaptive sampling
+            is used. The variance, if computed, is stored under the ``"var"``
+            key.
+        """
+        result = {}
+        selected = (
+            None
+            if wavelengths is None
+            else {float(w) for w in np.atleast_1d(wavelengths)}
+        )
+
+        for w, aggregate in self._aggregates.items():
+            if selected is not None and w not in selected:
+                continue
+
+            complete = aggregate["count"] == self._counts[w]
+            result[w] = {"spp": round(aggregate["spp"] / aggregate["count"])}
+
+            for name, img in aggregate.items():
+                if name in {"spp", "count"}:
+                    continue
+                if not complete:
+                    img = np.full_like(img, np.nan)
+                result[w][name] = mi.Bitmap(img, mi.Bitmap.PixelFormat.Y)
+
+        return result
+
+    def clear(self) -> None:
+        """
+        Reset aggregates.
+        """
+        self._aggregates.clear()
 
 
 def apply_spectral_response(
@@ -654,11 +856,39 @@ def gather_bitmaps(
     """
     mode = Mode.new(mode_id)
 
+    return _gather_images(
+        mode,
+        _spectral_dims(mode),
+        var_name,
+        var_metadata,
+        gather_variance,
+        calculate_stokes,
+        bitmaps,
+        viewing_angles,
+        solar_angles,
+    )
+
+
+def _gather_images(
+    mode: Mode,
+    spectral_dims_spec: tuple,
+    var_name: str,
+    var_metadata: dict,
+    gather_variance: bool,
+    calculate_stokes: bool,
+    bitmaps: dict,
+    viewing_angles: xr.Dataset,
+    solar_angles: xr.Dataset,
+) -> dict:
+    """
+    Implementation of :func:`gather_bitmaps` for an arbitrary set of spectral
+    dimensions (specified like the output of :func:`_spectral_dims`).
+    """
     # Set up spectral dimensions
     spectral_dims = []
     spectral_dim_metadata = {}
 
-    for y in _spectral_dims(mode):
+    for y in spectral_dims_spec:
         if isinstance(y, str):
             spectral_dims.append(y)
             spectral_dim_metadata[y] = {}
@@ -666,61 +896,72 @@ def gather_bitmaps(
             spectral_dims.append(y[0])
             spectral_dim_metadata[y[0]] = y[1]
 
-    # Loop on spectral indexes and collect all bitmap contents in data arrays
-    sensor_data = {
-        "spp": [],
-        "weights_raw": [],
-        f"{var_name}_raw": [],
-        f"{var_name}_m2_raw": [],
+    # Build spectral coordinates: spectral indexes are laid out on the sorted
+    # outer product of their components (missing combinations are NaN-filled)
+    spectral_keys = [tuple(always_iterable(k)) for k in bitmaps.keys()]
+    spectral_coords = {
+        spectral_dim: np.unique([key[i] for key in spectral_keys])
+        for i, spectral_dim in enumerate(spectral_dims)
     }
-
-    for spectral_index_hashable, result_dict in bitmaps.items():
-        spectral_index = spectral_index_hashable
-
-        # Define spectral coordinates
-        spectral_coords = {
-            spectral_dim: [spectral_coord]
-            for spectral_dim, spectral_coord in zip(
-                spectral_dims, always_iterable(spectral_index)
-            )
-        }
-
-        # Define Stokes vector coordinates
-        stokes_coords = {} if not calculate_stokes else {"stokes": ["I", "Q", "U", "V"]}
-
-        # Package spp in a data array
-        spp = result_dict["spp"]
-        all_dims = list(spectral_coords.keys())
-        spp_shape = [1 for _ in all_dims]
-        sensor_data["spp"].append(
-            xr.DataArray(np.reshape(spp, spp_shape), coords=spectral_coords)
+    spectral_shape = tuple(len(v) for v in spectral_coords.values())
+    spectral_locs = [
+        tuple(
+            int(np.searchsorted(spectral_coords[spectral_dim], key[i]))
+            for i, spectral_dim in enumerate(spectral_dims)
+        )
+        for key in spectral_keys
+    ]
+    complete = len(set(spectral_locs)) == int(np.prod(spectral_shape))
+
+    # Define Stokes vector coordinates
+    stokes_coords = {} if not calculate_stokes else {"stokes": ["I", "Q", "U", "V"]}
+    stokes_names = stokes_coords.get("stokes", ["bitmap"])
+
+    # Get film dimensions and coordinates from the first bitmap
+    result_dicts = list(bitmaps.values())
+    film = bitmap_to_dataarray(result_dicts[0][stokes_names[0]])
+    film_shape = film.shape
+    film_coords = {k: v.variable for k, v in film.coords.items()}
+
+    def new_dataarray(data, extra_coords):
+        return xr.DataArray(
+            data,
+            dims=(*spectral_dims, *extra_coords.keys(), *film.dims),
+            coords={**spectral_coords, **extra_coords, **film_coords},
         )
 
-        # Collect bitmaps
-        if not calculate_stokes:
-            name = "bitmap"
-            da = bitmap_to_dataarray(result_dict[name])
-        else:
-            components = stokes_coords["stokes"]
-            stokes = [bitmap_to_dataarray(result_dict[s]) for s in components]
-            da = xr.concat(stokes, "stokes")
-            da = da.assign_coords(stokes_coords)
-
-        # Add spectral and sensor dimensions to img array
-        sensor_data[f"{var_name}_raw"].append(da.expand_dims(dim=spectral_coords))
+    # Preallocate buffers and copy each bitmap to its slot
+    spp = np.full(spectral_shape, np.nan)
+    img = np.full((*spectral_shape, len(stokes_names), *film_shape), np.nan)
+    img_m2 = (
+        np.full((*spectral_shape, 1, *film_shape), np.nan) if gather_variance else None
+    )
 
+    for loc, result_dict in zip(spectral_locs, result_dicts):
+        spp[loc] = result_dict["spp"]
+        for i, name in enumerate(stokes_names):
+            img[loc][i] = np.reshape(np.asarray(result_dict[name]), film_shape)
         if gather_variance:
-            name = "m2"
-            da_m2 = bitmap_to_dataarray(result_dict[name])
-            coords = (
-                spectral_coords
-                if not calculate_stokes
-                else {**spectral_coords, "stokes": ["I"]}
-            )
-            sensor_data[f"{var_name}_m2_raw"].append(da_m2.expand_dims(dim=coords))
+            img_m2[loc][0] = np.reshape(np.asarray(result_dict["m2"]), film_shape)
+
+    if complete:  # Restore integer type if no value is missing
+        spp = spp.astype(np.int64)
+
+    result = {
+        "spp": xr.DataArray(spp, coords=spectral_coords),
+        "weights_raw": None,
+        f"{var_name}_raw": new_dataarray(
+            img if calculate_stokes else img.squeeze(len(spectral_dims)),
+            stokes_coords,
+        ),
+        f"{var_name}_m2_raw": None,
+    }
 
-    # Combine all the data
-    result = {k: xr.combine_by_coords(v) if v else None for k, v in sensor_data.items()}
+    if gather_variance:
+        result[f"{var_name}_m2_raw"] = new_dataarray(
+            img_m2 if calculate_stokes else img_m2.squeeze(len(spectral_dims)),
+            {"stokes": ["I"]} if calculate_stokes else {},
+        )
 
     keys = [f"{var_name}_raw"]
     if gather_variance:
@@ -760,6 +1001,115 @@ def gather_bitmaps(
     return result
 
 
+def gather_ckd_aggregates(
+    mode_id: str,
+    var_name: str,
+    var_metadata: dict,
+    gather_variance: bool,
+    calculate_stokes: bool,
+    accumulator: CKDQuadAccumulator,
+    spectral_grid: SpectralGrid,
+    viewing_angles: xr.Dataset,
+    solar_angles: xr.Dataset,
+) -> dict:
+    """
+    Gather CKD quadrature aggregates evaluated during the spectral loop into
+    xarray data arrays.
+
+    This step replaces the combination of :func:`gather_bitmaps`,
+    :func:`moment2_to_variance` and :func:`aggregate_ckd_quad` when raw
+    per-*g*-point results are not retained.
+
+    Parameters
+    ----------
+    mode_id : str
+        Eradiate mode from which this pipeline step is configured.
+
+    var_name : str
+        Name of the processed physical variable.
+
+    var_metadata : dict
+        A metadata dictionary to be attached to the data array holding the
+        processed physical variable.
+
+    gather_variance : bool
+        Flag that specifies whether the variance should be gathered as well.
+
+    calculate_stokes : bool
+        Flag that specifies whether the variable is calculated as a Stokes
+        vector or not.
+
+    accumulator : .CKDQuadAccumulator
+        Accumulator populated during the spectral loop.
+
+    spectral_grid : .CKDSpectralGrid
+        Spectral set for which the CKD quadrature is computed.
+
+    viewing_angles : Dataset, optional
+        A dataset holding the viewing angles associated with each pixel in the
+        processed bitmaps.
+
+    solar_angles : Dataset, optional
+        A dataset holding the solar angles associated with the processed
+        observation data.
+
+    Returns
+    -------
+    data_vars : dict[str, DataArray]
+        A dictionary mapping data variable names (``<var>`` and, if relevant,
+        ``<var>_var``) to data arrays matching the output of
+        :func:`aggregate_ckd_quad`.
+    """
+    mode = Mode.new(mode_id)
+
+    if not mode.is_ckd:
+        raise UnsupportedModeError(supported="ckd")
+
+    # Aggregates are gathered like bitmaps, with only a wavelength dimension;
+    # the variance takes the slot of the second moment. Only the bins of the
+    # spectral grid are gathered.
+    aggregates = {
+        w: {("m2" if k == "var" else k): v for k, v in aggregate.items()}
+        for w, aggregate in accumulator.aggregates(
+            spectral_grid.wcenters.m_as(ureg.nm)
+        ).items()
+    }
+    gathered = _gather_images(
+        mode,
+        _spectral_dims(mode)[:1],
+        var_name,
+        var_metadata,
+        gather_variance,
+        calculate_stokes,
+        aggregates,
+        viewing_angles,
+        solar_angles,
+    )
+
+    # Order data like spectral grid bins and add bin coordinates
+    bin_wcenters = spectral_grid.wcenters.m_as(ucc.get("wavelength"))
+    result = {}
+
+    for src, dst in [
+        (f"{var_name}_raw", var_name),
+        (f"{var_name}_m2_raw", f"{var_name}_var"),
+    ]:
+        da = gathered[src]
+        if da is None:
+            continue
+
+        w_index = da.get_index("w")
+        da = _assign_bin_coords(
+            da.isel(w=[w_index.get_loc(w) for w in bin_wcenters]), spectral_grid
+        )
+        if dst != var_name:  # At the moment, we do not populate metadata for variance
+            da.attrs.clear()
+        da.name = dst
+        result[dst] = da
+
+    return result
+
+
 def radiosity(sector_radiosity: xr.DataArray) -> xr.DataArray:
     """
     Aggregate sector radiosity into a full-hemisphere radiosity dataset.
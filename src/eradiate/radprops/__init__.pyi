@@ -1,6 +1,7 @@
 from . import rayleigh as rayleigh
 from ._absorption import absdb_factory as absdb_factory
 from ._absorption import get_default_absdb as get_default_absdb
+from ._absorption import preload_absdb as preload_absdb
 from ._array import ArrayRadProfile as ArrayRadProfile
 from ._atmosphere import AtmosphereRadProfile as AtmosphereRadProfile
 from ._core import RadProfile as RadProfile
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
 from typing import Literal
 
+import numpy as np
+import pint
 from axsdb import (
     AbsorptionDatabase,
     AbsorptionDatabaseFactory,
@@ -16,6 +23,8 @@ import eradiate
 from .._mode import Mode
 from ..data import fresolver
 from ..exceptions import UnsupportedModeError
+from ..units import unit_registry as ureg
+from ..util.misc import fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -129,3 +138,147 @@ def get_default_absdb(
         raise mode_error
 
     return absdb_factory.create(default)
+
+
+def _group_by_file(db: MonoAbsorptionDatabase, w: np.ndarray) -> dict[str, np.ndarray]:
+    # Map database file names to the wavelengths w [nm] they are looked up for
+    filenames = np.array(db.lookup_filenames(wl=w * ureg.nm))
+    return {filename: w[filenames == filename] for filename in np.unique(filenames)}
+
+
+def _slice_positions(ds, w: np.ndarray) -> np.ndarray:
+    # Positions, along the w dimension of a dataset, of the spectral points
+    # required to interpolate at wavelengths w [nm]: for each wavelength, the
+    # two bracketing points are selected. Like eval_sigma_a_mono(), wavelengths
+    # are converted to the units of the dataset's w coordinate, which may be a
+    # wavenumber.
+    w_u = ureg(ds["w"].units)
+    w = w * ureg.nm
+    w_m = np.atleast_1d(
+        (1.0 / w).m_as(w_u) if w_u.check("[length]^-1") else w.m_as(w_u)
+    )
+
+    # The w coordinate may be ordered by descending values
+    w_ds = ds["w"].values
+    order = np.argsort(w_ds)
+    i = np.searchsorted(w_ds[order], w_m)
+    positions = np.concatenate(
+        (
+            order[np.clip(i - 1, 0, w_ds.size - 1)],
+            order[np.clip(i, 0, w_ds.size - 1)],
+        )
+    )
+    return np.unique(positions)
+
+
+def _write_slice(ds, w: np.ndarray, filename: Path) -> None:
+    # Write the spectral slice of a dataset required to interpolate at
+    # wavelengths w [nm], without compression
+    ds = ds.isel(w=_slice_positions(ds, w)).load()
+    for var in ds.variables.values():
+        var.encoding = {}
+    ds.to_netcdf(filename)
+
+
+def _source_stamp(db: MonoAbsorptionDatabase, filenames: list[str]) -> list:
+    # Identify the contents of a database: its location, the contents of its
+    # index files and the size and modification time of the data files used
+    dir_path = Path(db.dir_path).resolve()
+    stamp = [str(dir_path)]
+
+    for name in ["index.csv", "spectral.csv", "metadata.json"]:
+        path = dir_path / name
+        if path.is_file():
+            stamp.append((name, hashlib.sha256(path.read_bytes()).hexdigest()))
+
+    for filename in sorted(filenames):
+        stat = (dir_path / filename).stat()
+        stamp.append((filename, stat.st_size, stat.st_mtime_ns))
+
+    return stamp
+
+
+def preload_absdb(
+    db: AbsorptionDatabase,
+    w: pint.Quantity,
+    path: os.PathLike | str | None = None,
+) -> AbsorptionDatabase:
+    """
+    Extract the spectral slices of a monochromatic absorption database required
+    to evaluate absorption coefficients at given wavelengths, and return an
+    in-memory database holding only these slices.
+
+    Slices are extracted once and stored uncompressed in a subdirectory of
+    ``path`` keyed by the source database (location, index files, size and
+    modification time of data files) and the requested wavelengths:
+    subsequent calls with the same arguments only load the slices and skip
+    decoding the source NetCDF files.
+
+    Parameters
+    ----------
+    db : AbsorptionDatabase
+        Source absorption database. CKD databases and monochromatic databases
+        which are not lazy are returned unchanged.
+
+    w : quantity
+        Wavelengths at which absorption coefficients will be evaluated.
+
+    path : path-like, optional
+        Path to the slice cache directory. If unset, the
+        ``absorption_mono_slices`` subdirectory of the data path (see the
+        ``data_path`` setting) is used.
+
+    Returns
+    -------
+    AbsorptionDatabase
+        A database evaluating to the same values as ``db`` at wavelengths ``w``.
+        If slices cannot be extracted, a warning is emitted and ``db`` is
+        returned.
+    """
+    if not isinstance(db, MonoAbsorptionDatabase) or not getattr(db, "lazy", True):
+        return db
+
+    if path is None:
+        from ..config import settings
+
+        path = Path(settings.data_path) / "absorption_mono_slices"
+
+    w = np.unique(np.atleast_1d(w.m_as(ureg.nm)).astype(float))
+
+    try:
+        slices = _group_by_file(db, w)
+        key = fingerprint((_source_stamp(db, list(slices.keys())), w))
+        slice_dir = Path(path).expanduser().resolve() / key
+
+        if not slice_dir.is_dir():
+            slice_dir.parent.mkdir(parents=True, exist_ok=True)
+            tmp_dir = Path(tempfile.mkdtemp(dir=slice_dir.parent, suffix=".tmp"))
+
+            try:
+                for filename, w_file in slices.items():
+                    _write_slice(db.load_dataset(filename), w_file, tmp_dir / filename)
+                os.replace(tmp_dir, slice_dir)
+            except BaseException:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                # Another process may have written the same slices concurrently
+                if not slice_dir.is_dir():
+                    raise
+
+            logger.debug("Wrote absorption database slices to '%s'", slice_dir)
+
+        else:
+            logger.debug("Using absorption database slices from '%s'", slice_dir)
+
+        return MonoAbsorptionDatabase.from_directory(
+            slice_dir,
+            lazy=False,
+            error_handling_config=db.error_handling_config,
+        )
+
+    except Exception as e:
+        logger.warning(
+            "Could not preload absorption database slices (%s); the database "
+            "will be accessed lazily",
+            e,
+        )
+        return db
@@ -12,13 +12,13 @@ from axsdb import AbsorptionDatabase
 from joseki.profiles.core import interp
 
 from ._absorption import get_default_absdb
-from ._core import RadProfile, ZGrid, make_dataset
+from ._core import RadProfile, ZGrid, make_dataset, make_dataset_batch
 from .rayleigh import compute_sigma_s_air, depolarization_bates, depolarization_bodhaine
 from .. import converters
 from ..attrs import define, documented
 from ..units import to_quantity
 from ..units import unit_registry as ureg
-from ..util.misc import cache_by_id, summary_repr
+from ..util.misc import cache_by_value, summary_repr
 
 _THERMOPROPS_DEFAULT = {
     "identifier": "afgl_1986-us_standard",
@@ -106,9 +106,9 @@ class AtmosphereRadProfile(RadProfile):
 
     rayleigh_depolarization: np.ndarray | str = documented(
         attrs.field(
-            converter=lambda x: x
-            if isinstance(x, str)
-            else np.array(x, dtype=np.float64),
+            converter=lambda x: (
+                x if isinstance(x, str) else np.array(x, dtype=np.float64)
+            ),
             kw_only=True,
             factory=lambda: np.array(0.0),
         ),
@@ -130,6 +130,7 @@ class AtmosphereRadProfile(RadProfile):
 
     def update(self) -> None:
         self._zgrid = ZGrid(levels=self.levels)
+        self._thermoprops_interp.cache_clear()
 
     @property
     def zbounds(self) -> tuple[pint.Quantity, pint.Quantity]:
@@ -145,7 +146,7 @@ class AtmosphereRadProfile(RadProfile):
         # Inherit docstring
         return self._zgrid
 
-    @cache_by_id
+    @cache_by_value
     def _thermoprops_interp(self, zgrid: ZGrid) -> xr.Dataset:
         # Interpolate thermophysical profile on specified altitude grid
         # Note: this value is cached so that repeated calls with the same zgrid
@@ -260,6 +261,91 @@ class AtmosphereRadProfile(RadProfile):
             sigma_s=self.eval_sigma_s_ckd(w=w, g=g, zgrid=zgrid),
         ).squeeze()
 
+    def _eval_sigma_a_levels_batch(
+        self, w: pint.Quantity, g: np.ndarray | None, thermoprops: xr.Dataset
+    ) -> np.ndarray:
+        # Evaluate the absorption coefficient [km^-1] on altitude levels; the
+        # result is shaped (n_w, n_levels) if g is None (all wavelengths at
+        # once), or (n_g, n_levels) for the g-points of the single bin w
+        n_levels = thermoprops.sizes["z"]
+
+        if g is None:
+            if not self.has_absorption:
+                return np.zeros((w.size, n_levels))
+            values = self.absorption_data.eval_sigma_a_mono(w, thermoprops)
+            return to_quantity(values.transpose("w", "z")).m_as("km^-1")
+
+        if not self.has_absorption:
+            return np.zeros((g.size, n_levels))
+
+        # The bin's g-points share the interpolated thermophysical profile
+        w = np.atleast_1d(w)
+        return np.stack(
+            [
+                to_quantity(
+                    self.absorption_data.eval_sigma_a_ckd(w, x, thermoprops)
+                ).m_as("km^-1")[0]
+                for x in g
+            ]
+        )
+
+    def _eval_sigma_s_levels_batch(
+        self, w: pint.Quantity, thermoprops: xr.Dataset
+    ) -> np.ndarray:
+        # Evaluate the scattering coefficient [km^-1] on altitude levels for all
+        # wavelengths at once; the result is shaped (n_w, n_levels)
+        if not self.has_scattering:
+            return np.zeros((w.size, thermoprops.sizes["z"]))
+
+        sigma_s = compute_sigma_s_air(
+            wavelength=w, number_density=to_quantity(thermoprops.n)
+        )
+        return np.atleast_2d(sigma_s.m_as("km^-1")).reshape(
+            (w.size, thermoprops.sizes["z"])
+        )
+
+    def eval_dataset_batch_mono(
+        self, w: pint.Quantity, zgrid: ZGrid | None = None
+    ) -> xr.Dataset:
+        # Inherit docstring
+        # Thermophysical properties are interpolated once; absorption and
+        # scattering are evaluated for all wavelengths in one call each
+        zgrid = self.zgrid if zgrid is None else zgrid
+        w = np.atleast_1d(w)
+        thermoprops = self._thermoprops_interp(zgrid)
+
+        sigma_a = self._eval_sigma_a_levels_batch(w, None, thermoprops)
+        sigma_s = self._eval_sigma_s_levels_batch(w, thermoprops)
+
+        # Project on altitude layers
+        sigma_a = 0.5 * (sigma_a[..., 1:] + sigma_a[..., :-1])
+        sigma_s = 0.5 * (sigma_s[..., 1:] + sigma_s[..., :-1])
+
+        return make_dataset_batch(w, None, zgrid, sigma_a / ureg.km, sigma_s / ureg.km)
+
+    def eval_dataset_batch_ckd(
+        self,
+        w: pint.Quantity,
+        g: np.typing.ArrayLike,
+        zgrid: ZGrid | None = None,
+    ) -> xr.Dataset:
+        # Inherit docstring
+        # Thermophysical properties are interpolated once; scattering does not
+        # depend on g and is evaluated once for the bin
+        zgrid = self.zgrid if zgrid is None else zgrid
+        g = np.atleast_1d(g)
+        thermoprops = self._thermoprops_interp(zgrid)
+
+        sigma_a = self._eval_sigma_a_levels_batch(w, g, thermoprops)
+        sigma_s = self._eval_sigma_s_levels_batch(np.atleast_1d(w), thermoprops)
+
+        # Project on altitude layers
+        sigma_a = 0.5 * (sigma_a[..., 1:] + sigma_a[..., :-1])
+        sigma_s = 0.5 * (sigma_s[..., 1:] + sigma_s[..., :-1])
+        sigma_s = np.broadcast_to(sigma_s, sigma_a.shape)
+
+        return make_dataset_batch(w, g, zgrid, sigma_a / ureg.km, sigma_s / ureg.km)
+
     def eval_depolarization_factor_mono(
         self, w: pint.Quantity, zgrid: ZGrid
     ) -> pint.Quantity:
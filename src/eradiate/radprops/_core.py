@@ -162,6 +162,114 @@ def make_dataset(
     )
 
 
+def make_dataset_batch(
+    w: pint.Quantity,
+    g: np.typing.ArrayLike | None,
+    zgrid: ZGrid,
+    sigma_a: pint.Quantity,
+    sigma_s: pint.Quantity,
+) -> xr.Dataset:
+    """
+    Make a radiative property data set evaluated for several spectral
+    coordinates at once.
+
+    Parameters
+    ----------
+    w : quantity
+        Wavelengths, shaped (n_w,) if ``g`` is ``None``; otherwise, the scalar
+        central wavelength of a CKD bin.
+
+    g : array-like or None
+        *g*-point values of the bin, shaped (n_g,). If ``None``, the data set
+        has no ``g`` dimension.
+
+    zgrid : .ZGrid
+        Altitude grid.
+
+    sigma_a : quantity
+        Absorption coefficient values, shaped (n_w, n_layers) if ``g`` is
+        ``None``, or (n_g, n_layers) otherwise.
+
+    sigma_s : quantity
+        Scattering coefficient values, with the same shape as ``sigma_a``.
+
+    Returns
+    -------
+    Dataset
+        Radiative property data set with (``w``, ``z_layer``) dimensions if
+        ``g`` is ``None``, or (``g``, ``z_layer``) dimensions and a scalar
+        ``w`` coordinate otherwise.
+    """
+    sigma_a = sigma_a.m_as("km^-1")
+    sigma_s = sigma_s.m_as("km^-1")
+    sigma_t = sigma_a + sigma_s
+    albedo = np.divide(
+        sigma_s, sigma_t, where=sigma_t != 0.0, out=np.zeros_like(sigma_s)
+    )
+
+    dims = ("w", "z_layer") if g is None else ("g", "z_layer")
+    coords = {
+        "w": (
+            "w" if g is None else (),
+            np.atleast_1d(w.m_as("nm")) if g is None else float(w.m_as("nm")),
+            dict(
+                standard_name="radiation_wavelength",
+                units="nm",
+                long_name="wavelength",
+            ),
+        ),
+        "z_layer": (
+            "z_layer",
+            zgrid.layers.m_as("km"),
+            dict(
+                standard_name="layer_altitude",
+                units="km",
+                long_name="layer altitude",
+            ),
+        ),
+    }
+    if g is not None:
+        coords["g"] = ("g", np.atleast_1d(g), dict(long_name="g-point"))
+
+    return xr.Dataset(
+        data_vars={
+            "sigma_a": (
+                dims,
+                sigma_a,
+                dict(
+                    standard_name="absorption_coefficient",
+                    units="km^-1",
+                    long_name="absorption coefficient",
+                ),
+            ),
+            "sigma_s": (
+                dims,
+                sigma_s,
+                dict(
+                    standard_name="scattering_coefficient",
+                    units="km^-1",
+                    long_name="scattering coefficient",
+                ),
+            ),
+            "sigma_t": (
+                dims,
+                sigma_t,
+                dict(
+                    standard_name="extinction_coefficient",
+                    units="km^-1",
+                    long_name="extinction coefficient",
+                ),
+            ),
+            "albedo": (
+                dims,
+                albedo,
+                dict(standard_name="albedo", units="", long_name="albedo"),
+            ),
+        },
+        coords=coords,
+    )
+
+
 @frozen(eq=False, init=False)
 class ZGrid:
     """
@@ -172,6 +280,8 @@ class ZGrid:
     * Instances are immutable.
     * Instances are hashable by ID. This is required to allow for using them as
       an argument of an LRU-cached function.
+    * The :attr:`as_hashable` property provides a value-based representation
+      suitable for use as a cache key (see :class:`.cache_by_value`).
     * This class is used as the argument of the ``eval()`` family of methods.
     """
 
@@ -268,6 +378,18 @@ class ZGrid:
         """
         return self._total_height
 
+    @property
+    def as_hashable(self) -> tuple:
+        """
+        Returns
+        -------
+        tuple
+            Hashable representation of the altitude grid, based on its level
+            values. Two grids with identical levels have the same
+            representation.
+        """
+        return (np.asarray(self.levels.m).tobytes(), str(self.levels.u))
+
 
 @attrs.define(eq=False)
 class RadProfile(ABC):
@@ -568,3 +690,90 @@ class RadProfile(ABC):
         zgrid: ZGrid,
     ) -> xr.Dataset:
         raise NotImplementedError
+
+    def eval_dataset_batch_mono(
+        self, w: pint.Quantity, zgrid: ZGrid | None = None
+    ) -> xr.Dataset:
+        """
+        Evaluate radiative properties at several wavelengths at once in
+        monochromatic modes.
+
+        Parameters
+        ----------
+        w : quantity
+            Wavelengths, shaped (n_w,).
+
+        zgrid : .ZGrid, optional
+            The altitude grid for which the radiative profile is evaluated.
+            If unset, a profile-specific default is used.
+
+        Returns
+        -------
+        Dataset
+            Radiative property dataset with (``w``, ``z_layer``) dimensions
+            (see ``make_dataset_batch()``).
+
+        Notes
+        -----
+        The default implementation loops over wavelengths; derived classes may
+        override it with a vectorized implementation.
+        """
+        zgrid = self.zgrid if zgrid is None else zgrid
+        w = np.atleast_1d(w)
+        sigma_units = ureg.km**-1
+        sigma_a = np.stack(
+            [self.eval_sigma_a_mono(x, zgrid).m_as(sigma_units) for x in w]
+        ).reshape((w.size, zgrid.n_layers))
+        sigma_s = np.stack(
+            [self.eval_sigma_s_mono(x, zgrid).m_as(sigma_units) for x in w]
+        ).reshape((w.size, zgrid.n_layers))
+        return make_dataset_batch(
+            w, None, zgrid, sigma_a * sigma_units, sigma_s * sigma_units
+        )
+
+    def eval_dataset_batch_ckd(
+        self,
+        w: pint.Quantity,
+        g: np.typing.ArrayLike,
+        zgrid: ZGrid | None = None,
+    ) -> xr.Dataset:
+        """
+        Evaluate radiative properties for all the *g*-points of a CKD bin at
+        once.
+
+        Parameters
+        ----------
+        w : quantity
+            Bin central wavelength (scalar).
+
+        g : array-like
+            *g*-point values of the bin's quadrature, shaped (n_g,).
+
+        zgrid : .ZGrid, optional
+            The altitude grid for which the radiative profile is evaluated.
+            If unset, a profile-specific default is used.
+
+        Returns
+        -------
+        Dataset
+            Radiative property dataset with (``g``, ``z_layer``) dimensions
+            (see ``make_dataset_batch()``).
+
+        Notes
+        -----
+        The default implementation loops over *g*-points;
+        derived classes may override it with a vectorized implementation.
+        """
+        zgrid = self.zgrid if zgrid is None else zgrid
+        g = np.atleast_1d(g)
+        sigma_units = ureg.km**-1
+        shape = (g.size, zgrid.n_layers)
+        sigma_a = np.stack(
+            [self.eval_sigma_a_ckd(w, y, zgrid).m_as(sigma_units) for y in g]
+        ).reshape(shape)
+        sigma_s = np.stack(
+            [self.eval_sigma_s_ckd(w, y, zgrid).m_as(sigma_units) for y in g]
+        ).reshape(shape)
+        return make_dataset_batch(
+            w, g, zgrid, sigma_a * sigma_units, sigma_s * sigma_units
+        )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import typing as t
 from abc import ABC, abstractmethod
 from typing import Literal
 
@@ -28,7 +29,7 @@ from ...kernel import (
     SearchSceneParameter,
 )
 from ...radprops import ZGrid
-from ...spectral.index import SpectralIndex
+from ...spectral.index import CKDSpectralIndex, SpectralIndex
 from ...units import symbol
 from ...units import unit_context_config as ucc
 from ...units import unit_context_kernel as uck
@@ -324,6 +325,29 @@ class Atmosphere(CompositeSceneElement, ABC):
         )
 
 
+@attrs.frozen
+class _RadPropsTable:
+    """
+    Precomputed radiative property table (see
+    :meth:`.AbstractHeterogeneousAtmosphere.prefetch_radprops`).
+    """
+
+    #: Map of spectral index hashable representations to table rows
+    index: dict[t.Hashable, int]
+
+    #: Altitude grid on which properties are evaluated
+    zgrid: ZGrid
+
+    #: Units in which the extinction coefficient is stored
+    sigma_t_units: pint.Unit
+
+    #: Extinction coefficient as a (n_si, n_layers) array
+    sigma_t: np.ndarray = attrs.field(repr=False)
+
+    #: Albedo as a (n_si, n_layers) array
+    albedo: np.ndarray = attrs.field(repr=False)
+
+
 @define(eq=False, slots=False)
 class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
     """
@@ -358,11 +382,16 @@ class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
         init_type="bool, optional",
     )
 
+    _radprops_table: _RadPropsTable | None = attrs.field(
+        default=None, init=False, repr=False
+    )
+
     def update(self) -> None:
         """
         Update internal state.
         """
-        pass
+        # Invalidate precomputed radiative properties
+        self._radprops_table = None
 
     # --------------------------------------------------------------------------
     #                    Spatial and thermophysical properties
@@ -489,6 +518,150 @@ class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
             },
         )
 
+    def eval_radprops_batch(
+        self, sis: t.Sequence[SpectralIndex], zgrid: ZGrid | None = None
+    ) -> tuple[pint.Quantity, pint.Quantity]:
+        """
+        Evaluate the extinction coefficient and albedo profiles for a batch of
+        spectral indexes.
+
+        Parameters
+        ----------
+        sis : sequence of :class:`.SpectralIndex`
+            Spectral indexes. In CKD modes, they must all belong to the same
+            bin.
+
+        zgrid : .ZGrid, optional
+            Altitude grid on which evaluation is performed. If unset, an
+            instance-specific default is used
+            (see :meth:`zgrid <.AbstractHeterogeneousAtmosphere.zgrid>`).
+
+        Returns
+        -------
+        sigma_t : quantity
+            Extinction coefficient, shaped (n_si, n_layers).
+
+        albedo : quantity
+            Albedo, shaped (n_si, n_layers).
+
+        Notes
+        -----
+        The default implementation loops over spectral indexes; derived classes
+        may override it with a vectorized implementation.
+        """
+        if zgrid is None:
+            zgrid = self.geometry.zgrid
+
+        sigma_units = ucc.get("collision_coefficient")
+        sigma_t = np.stack(
+            [self.eval_sigma_t(si, zgrid).m_as(sigma_units) for si in sis]
+        ).reshape((len(sis), zgrid.n_layers))
+        albedo = np.stack(
+            [self.eval_albedo(si, zgrid).m_as(ureg.dimensionless) for si in sis]
+        ).reshape((len(sis), zgrid.n_layers))
+
+        return sigma_t * sigma_units, albedo * ureg.dimensionless
+
+    def prefetch_radprops(self, sis: t.Iterable[SpectralIndex]) -> None:
+        """
+        Precompute the extinction coefficient and albedo profiles for a
+        sequence of spectral indexes.
+
+        Values are evaluated on the default altitude grid with
+        :meth:`eval_radprops_batch`, with a single batch in monochromatic modes
+        and one batch per bin in CKD modes. They are stored as contiguous
+        single-precision ``(n_si, n_layers)`` arrays, from which the medium
+        scene parameters are then looked up during the spectral loop. Spectral
+        indexes already present in the table are skipped, so that tables can
+        be extended as measures are processed. The table is discarded when
+        :meth:`update` is called.
+
+        Parameters
+        ----------
+        sis : iterable of :class:`.SpectralIndex`
+            Spectral indexes for which radiative properties are precomputed.
+            Duplicates are skipped.
+        """
+        zgrid = self.geometry.zgrid
+        sigma_t_units = uck.get("collision_coefficient")
+        table = self._radprops_table
+
+        if (
+            table is None
+            or table.zgrid is not zgrid
+            or table.sigma_t_units != sigma_t_units
+        ):
+            table = _RadPropsTable(
+                index={},
+                zgrid=zgrid,
+                sigma_t_units=sigma_t_units,
+                sigma_t=np.empty((0, zgrid.n_layers), dtype=np.float32),
+                albedo=np.empty((0, zgrid.n_layers), dtype=np.float32),
+            )
+
+        # Group new spectral indexes by batch: a single one in monochromatic
+        # modes, one per bin in CKD modes
+        index = dict(table.index)
+        batches = {}
+        for si in sis:
+            key = si.as_hashable
+            if key not in index:
+                index[key] = len(index)
+                batch = key[0] if isinstance(si, CKDSpectralIndex) else None
+                batches.setdefault(batch, []).append(si)
+
+        if not batches:
+            self._radprops_table = table
+            return
+
+        n_si = len(index) - len(table.index)
+        sigma_t = np.empty((n_si, zgrid.n_layers), dtype=np.float32)
+        albedo = np.empty((n_si, zgrid.n_layers), dtype=np.float32)
+        offset = len(table.index)
+
+        for batch in batches.values():
+            rows = [index[si.as_hashable] - offset for si in batch]
+            batch_sigma_t, batch_albedo = self.eval_radprops_batch(batch, zgrid)
+            sigma_t[rows] = batch_sigma_t.m_as(sigma_t_units)
+            albedo[rows] = batch_albedo.m_as(ureg.dimensionless)
+
+        self._radprops_table = _RadPropsTable(
+            index=index,
+            zgrid=zgrid,
+            sigma_t_units=sigma_t_units,
+            sigma_t=np.concatenate([table.sigma_t, sigma_t]),
+            albedo=np.concatenate([table.albedo, albedo]),
+        )
+
+    def _eval_kernel_sigma_t(self, si: SpectralIndex) -> np.ndarray:
+        # Evaluate the extinction coefficient in kernel units as a
+        # single-precision array, using the precomputed table if possible
+        units = uck.get("collision_coefficient")
+        table = self._radprops_table
+
+        if (
+            table is not None
+            and table.zgrid is self.geometry.zgrid
+            and table.sigma_t_units == units
+        ):
+            i = table.index.get(si.as_hashable)
+            if i is not None:
+                return table.sigma_t[i]
+
+        return self.eval_sigma_t(si).m_as(units).astype(np.float32)
+
+    def _eval_kernel_albedo(self, si: SpectralIndex) -> np.ndarray:
+        # Evaluate the albedo as a single-precision array, using the
+        # precomputed table if possible
+        table = self._radprops_table
+
+        if table is not None and table.zgrid is self.geometry.zgrid:
+            i = table.index.get(si.as_hashable)
+            if i is not None:
+                return table.albedo[i]
+
+        return self.eval_albedo(si).m_as(ureg.dimensionless).astype(np.float32)
+
     @abstractmethod
     def eval_albedo(
         self, si: SpectralIndex, zgrid: ZGrid | None = None
@@ -654,9 +827,9 @@ class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
                     "grid": DictParameter(
                         lambda ctx: mi.VolumeGrid(
                             np.reshape(
-                                self.eval_albedo(ctx.si).m_as(ureg.dimensionless),
+                                self._eval_kernel_albedo(ctx.si),
                                 (-1, 1, 1),
-                            ).astype(np.float32)
+                            )
                         ),
                     ),
                     "to_world": to_world,
@@ -667,11 +840,9 @@ class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
                     "grid": DictParameter(
                         lambda ctx: mi.VolumeGrid(
                             np.reshape(
-                                self.eval_sigma_t(ctx.si).m_as(
-                                    uck.get("collision_coefficient")
-                                ),
+                                self._eval_kernel_sigma_t(ctx.si),
                                 (-1, 1, 1),
-                            ).astype(np.float32)
+                            )
                         ),
                     ),
                     "to_world": to_world,
@@ -692,9 +863,9 @@ class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
                         "grid": DictParameter(
                             lambda ctx: mi.VolumeGrid(
                                 np.reshape(
-                                    self.eval_albedo(ctx.si).m_as(ureg.dimensionless),
+                                    self._eval_kernel_albedo(ctx.si),
                                     (1, 1, -1),
-                                ).astype(np.float32)
+                                )
                             ),
                         ),
                         "filter_type": "nearest",
@@ -709,11 +880,9 @@ class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
                         "grid": DictParameter(
                             lambda ctx: mi.VolumeGrid(
                                 np.reshape(
-                                    self.eval_sigma_t(ctx.si).m_as(
-                                        uck.get("collision_coefficient")
-                                    ),
+                                    self._eval_kernel_sigma_t(ctx.si),
                                     (1, 1, -1),
-                                ).astype(np.float32)
+                                )
                             ),
                         ),
                         "filter_type": "nearest",
@@ -748,9 +917,9 @@ class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
             return {
                 "albedo.data": SceneParameter(
                     lambda ctx: np.reshape(
-                        self.eval_albedo(ctx.si).m_as(ureg.dimensionless),
+                        self._eval_kernel_albedo(ctx.si),
                         (-1, 1, 1, 1),
-                    ).astype(np.float32),
+                    ),
                     KernelSceneParameterFlags.SPECTRAL,
                     search=SearchSceneParameter(
                         node_type=mi.Medium,
@@ -760,11 +929,9 @@ class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
                 ),
                 "sigma_t.data": SceneParameter(
                     lambda ctx: np.reshape(
-                        self.eval_sigma_t(ctx.si).m_as(
-                            uck.get("collision_coefficient")
-                        ),
+                        self._eval_kernel_sigma_t(ctx.si),
                         (-1, 1, 1, 1),
-                    ).astype(np.float32),
+                    ),
                     KernelSceneParameterFlags.SPECTRAL,
                     search=SearchSceneParameter(
                         node_type=mi.Medium,
@@ -778,9 +945,9 @@ class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
             return {
                 "albedo.volume.data": SceneParameter(
                     lambda ctx: np.reshape(
-                        self.eval_albedo(ctx.si).m_as(ureg.dimensionless),
+                        self._eval_kernel_albedo(ctx.si),
                         (1, 1, -1, 1),
-                    ).astype(np.float32),
+                    ),
                     KernelSceneParameterFlags.SPECTRAL,
                     search=SearchSceneParameter(
                         node_type=mi.Medium,
@@ -790,11 +957,9 @@ class AbstractHeterogeneousAtmosphere(Atmosphere, ABC):
                 ),
                 "sigma_t.volume.data": SceneParameter(
                     lambda ctx: np.reshape(
-                        self.eval_sigma_t(ctx.si).m_as(
-                            uck.get("collision_coefficient")
-                        ),
+                        self._eval_kernel_sigma_t(ctx.si),
                         (1, 1, -1, 1),
-                    ).astype(np.float32),
+                    ),
                     KernelSceneParameterFlags.SPECTRAL,
                     search=SearchSceneParameter(
                         node_type=mi.Medium,
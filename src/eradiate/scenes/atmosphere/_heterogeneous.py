@@ -25,7 +25,7 @@ from ...radprops import ZGrid
 from ...spectral.index import SpectralIndex
 from ...units import unit_context_config as ucc
 from ...units import unit_registry as ureg
-from ...util.misc import cache_by_id
+from ...util.misc import cache_by_value
 
 if TYPE_CHECKING:
     from axsdb import AbsorptionDatabase
@@ -151,6 +151,11 @@ class HeterogeneousAtmosphere(AbstractHeterogeneousAtmosphere):
         if not self.components:
             raise ValueError("HeterogeneousAtmosphere must have at least one component")
 
+        # Invalidate cached radiative properties
+        super().update()
+        self._eval_sigma_t_impl.cache_clear()
+        self._eval_sigma_s_impl.cache_clear()
+
         # Force component IDs
         for i, component in enumerate(self.components):
             component.update()
@@ -214,16 +219,14 @@ class HeterogeneousAtmosphere(AbstractHeterogeneousAtmosphere):
 
         return albedo * ureg.dimensionless
 
-    @cache_by_id
-    def _eval_sigma_t_impl(self, si: SpectralIndex) -> pint.Quantity:
-        result = np.zeros((len(self.components), self.geometry.zgrid.n_layers))
+    @cache_by_value
+    def _eval_sigma_t_impl(self, si: SpectralIndex, zgrid: ZGrid) -> pint.Quantity:
+        result = np.zeros((len(self.components), zgrid.n_layers))
         sigma_units = ucc.get("collision_coefficient")
 
         # Evaluate extinction for current component
         for i, component in enumerate(self.components):
-            result[i] = component.eval_sigma_t(si, self.geometry.zgrid).m_as(
-                sigma_units
-            )
+            result[i] = component.eval_sigma_t(si, zgrid).m_as(sigma_units)
 
         return result * sigma_units
 
@@ -233,7 +236,7 @@ class HeterogeneousAtmosphere(AbstractHeterogeneousAtmosphere):
         # Inherit docstring
         if zgrid is not None and zgrid is not self.geometry.zgrid:
             raise ValueError("zgrid must be left unset or set to self.geometry.zgrid")
-        return self._eval_sigma_t_impl(si).sum(axis=0)
+        return self._eval_sigma_t_impl(si, self.geometry.zgrid).sum(axis=0)
 
     def eval_sigma_a(
         self, si: SpectralIndex, zgrid: ZGrid | None = None
@@ -243,23 +246,21 @@ class HeterogeneousAtmosphere(AbstractHeterogeneousAtmosphere):
             raise ValueError("zgrid must be left unset or set to self.geometry.zgrid")
         return self.eval_sigma_t(si) - self.eval_sigma_s(si)
 
-    @cache_by_id
-    def _eval_sigma_s_impl(self, si: SpectralIndex) -> pint.Quantity:
-        result = np.zeros((len(self.components), self.geometry.zgrid.n_layers))
+    @cache_by_value
+    def _eval_sigma_s_impl(self, si: SpectralIndex, zgrid: ZGrid) -> pint.Quantity:
+        result = np.zeros((len(self.components), zgrid.n_layers))
         sigma_units = ucc.get("collision_coefficient")
 
         # Evaluate scattering coefficient for current component
         for i, component in enumerate(self.components):
-            result[i] = component.eval_sigma_s(si, self.geometry.zgrid).m_as(
-                sigma_units
-            )
+            result[i] = component.eval_sigma_s(si, zgrid).m_as(sigma_units)
 
         return result * sigma_units
 
     def _eval_sigma_s_component(
         self, si: SpectralIndex, n_component: int
     ) -> pint.Quantity:
-        return self._eval_sigma_s_impl(si)[n_component]
+        return self._eval_sigma_s_impl(si, self.geometry.zgrid)[n_component]
 
     def eval_sigma_s(
         self, si: SpectralIndex, zgrid: ZGrid | None = None
@@ -267,7 +268,33 @@ class HeterogeneousAtmosphere(AbstractHeterogeneousAtmosphere):
         # Inherit docstring
         if zgrid is not None and zgrid is not self.geometry.zgrid:
             raise ValueError("zgrid must be left unset or set to self.geometry.zgrid")
-        return self._eval_sigma_s_impl(si).sum(axis=0)
+        return self._eval_sigma_s_impl(si, self.geometry.zgrid).sum(axis=0)
+
+    def eval_radprops_batch(
+        self, sis: cabc.Sequence[SpectralIndex], zgrid: ZGrid | None = None
+    ) -> tuple[pint.Quantity, pint.Quantity]:
+        # Inherit docstring
+        if zgrid is not None and zgrid is not self.geometry.zgrid:
+            raise ValueError("zgrid must be left unset or set to self.geometry.zgrid")
+
+        zgrid = self.geometry.zgrid
+        sigma_units = ucc.get("collision_coefficient")
+        sigma_t = np.zeros((len(sis), zgrid.n_layers))
+        sigma_s = np.zeros((len(sis), zgrid.n_layers))
+
+        # Each component is evaluated for the whole batch
+        for component in self.components:
+            component_sigma_t, component_albedo = component.eval_radprops_batch(
+                sis, zgrid
+            )
+            component_sigma_t = component_sigma_t.m_as(sigma_units)
+            sigma_t += component_sigma_t
+            sigma_s += component_albedo.m_as(ureg.dimensionless) * component_sigma_t
+
+        albedo = np.zeros_like(sigma_s)
+        np.divide(sigma_s, sigma_t, where=sigma_t != 0.0, out=albedo)
+
+        return sigma_t * sigma_units, albedo * ureg.dimensionless
 
     # --------------------------------------------------------------------------
     #                       Kernel dictionary generation
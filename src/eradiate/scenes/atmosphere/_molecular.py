@@ -4,6 +4,8 @@ Molecular atmospheres.
 
 from __future__ import annotations
 
+import typing as t
+
 import attrs
 import joseki
 import numpy as np
@@ -18,7 +20,8 @@ from ... import converters
 from ...attrs import define, documented
 from ...contexts import KernelContext
 from ...radprops import AtmosphereRadProfile, RadProfile, ZGrid, get_default_absdb
-from ...spectral.index import SpectralIndex
+from ...spectral.index import CKDSpectralIndex, SpectralIndex
+from ...units import to_quantity
 from ...units import unit_registry as ureg
 from ...util.misc import summary_repr
 
@@ -116,9 +119,9 @@ class MolecularAtmosphere(AbstractHeterogeneousAtmosphere):
 
     rayleigh_depolarization: np.ndarray | str = documented(
         attrs.field(
-            converter=lambda x: x
-            if isinstance(x, str)
-            else np.array(x, dtype=np.float64),
+            converter=lambda x: (
+                x if isinstance(x, str) else np.array(x, dtype=np.float64)
+            ),
             kw_only=True,
             factory=lambda: np.array(0.0),
         ),
@@ -192,6 +195,7 @@ class MolecularAtmosphere(AbstractHeterogeneousAtmosphere):
 
     def update(self) -> None:
         # Inherit docstring
+        super().update()
         self.phase.id = self.phase_id
 
         if self.thermoprops is not None:
@@ -289,6 +293,30 @@ class MolecularAtmosphere(AbstractHeterogeneousAtmosphere):
             zgrid=self.geometry.zgrid if zgrid is None else zgrid,
         )
 
+    def eval_radprops_batch(
+        self, sis: t.Sequence[SpectralIndex], zgrid: ZGrid | None = None
+    ) -> tuple[pint.Quantity, pint.Quantity]:
+        # Inherit docstring
+        # Monochromatic indexes are evaluated in a single call, CKD indexes
+        # with a single call for all the g-points of their bin
+        zgrid = self.geometry.zgrid if zgrid is None else zgrid
+
+        if isinstance(sis[0], CKDSpectralIndex):
+            w = sis[0].w
+            if any(si.w != w for si in sis):
+                raise ValueError(
+                    "CKD spectral indexes evaluated in a batch must belong to "
+                    "the same bin"
+                )
+            ds = self.radprops_profile.eval_dataset_batch_ckd(
+                w, [si.g for si in sis], zgrid
+            )
+        else:
+            w = np.array([si.w.m_as(ureg.nm) for si in sis]) * ureg.nm
+            ds = self.radprops_profile.eval_dataset_batch_mono(w, zgrid)
+
+        return to_quantity(ds.sigma_t), ds.albedo.values * ureg.dimensionless
+
     def eval_depolarization_factor(
         self, si: SpectralIndex, zgrid: ZGrid | None = None
     ) -> pint.Quantity:
@@ -31,7 +31,7 @@ from ...spectral.index import (
 from ...units import to_quantity
 from ...units import unit_context_config as ucc
 from ...units import unit_registry as ureg
-from ...util.misc import cache_by_id, summary_repr
+from ...util.misc import cache_by_value, summary_repr
 from ...validators import is_positive
 
 
@@ -242,6 +242,12 @@ class ParticleLayer(AbstractHeterogeneousAtmosphere):
     _phase: TabulatedPhaseFunction | None = attrs.field(default=None, init=False)
 
     def update(self) -> None:
+        super().update()
+
+        # Invalidate cached radiative properties
+        self._eval_albedo_impl.cache_clear()
+        self._eval_sigma_t_impl.cache_clear()
+
         self._phase = TabulatedPhaseFunction(
             id=self.phase_id,
             data=self.dataset.phase,
@@ -275,7 +281,7 @@ class ParticleLayer(AbstractHeterogeneousAtmosphere):
     #                       Radiative properties
     # --------------------------------------------------------------------------
 
-    @cache_by_id
+    @cache_by_value
     def _eval_albedo_impl(self, w: pint.Quantity, zgrid: ZGrid) -> pint.Quantity:
         # Return albedo from dataset (without accounting for bypass switches)
         # This routine is vectorized and returns an array of shape
@@ -290,7 +296,7 @@ class ParticleLayer(AbstractHeterogeneousAtmosphere):
         where_present = np.reshape(self.eval_fractions(zgrid) > 0, (1, -1))
         return interpolated * where_present
 
-    @cache_by_id
+    @cache_by_value
     def _eval_sigma_t_impl(self, w: pint.Quantity, zgrid: ZGrid) -> pint.Quantity:
         # Return extinction coefficient from dataset (without accounting
         # for bypass switches). This routine is vectorized and returns an
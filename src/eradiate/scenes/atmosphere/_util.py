@@ -135,8 +135,13 @@ def eval_transmittance_ckd(
     result = xr.full_like(da, np.nan).isel(g=0, drop=True)
     w_u = ucc.get("wavelength")
 
-    for i, (w, quad) in enumerate(spectral_grid.walk_quads(ckd_quad_config)):
-        values_at_nodes = da.sel(w=w.m).values
+    g_index = da.indexes["g"]
+
+    for i, (w, quad) in enumerate(spectral_grid.walk_quads(ckd_quad_config, abs_db)):
+        # Bins may have different quadrature point counts: select the values
+        # evaluated at the nodes of the current bin's quadrature
+        i_nodes = g_index.get_indexer(quad.eval_nodes([0.0, 1.0]))
+        values_at_nodes = da.sel(w=w.m).values[i_nodes]
 
         # Rationale: Avoid using xarray's indexing in this loop for
         # performance reasons (wrong data indexing method will result in
@@ -16,7 +16,14 @@ from ..core import SceneElement, traverse
 from ..spectra import Spectrum, spectrum_factory
 from ... import validators
 from ...attrs import define, documented, get_doc
-from ...kernel import SceneParameter, SearchSceneParameter
+from ...contexts import KernelContext
+from ...kernel import (
+    DictParameter,
+    KernelDict,
+    SceneParameter,
+    SearchSceneParameter,
+    mi_load_dict,
+)
 from ...units import unit_context_config as ucc
 from ...units import unit_context_kernel as uck
 from ...units import unit_registry as ureg
@@ -208,6 +215,44 @@ def _leaf_cloud_radii(n_leaves, leaf_radius):
     return np.full((n_leaves,), leaf_radius)
 
 
+def _leaf_cloud_mesh(positions, orientations, radii, n_vertices):
+    """
+    Triangulate leaves as regular polygons with ``n_vertices`` vertices and
+    the same area as the disks they represent. Inputs are unitless arrays
+    (positions and radii in the same length units). Returns vertex positions
+    as a (n_leaves * n_vertices, 3)-array and faces as a
+    (n_leaves * (n_vertices - 2), 3)-array.
+    """
+    n_leaves = len(positions)
+    normals = orientations / np.linalg.norm(orientations, axis=1, keepdims=True)
+
+    # Tangent frames, oriented such that s × t = n (same construction as
+    # mitsuba.coordinate_system(), vectorized)
+    nx, ny, nz = normals.T
+    sign = np.where(nz >= 0.0, 1.0, -1.0)
+    a = -1.0 / (sign + nz)
+    b = nx * ny * a
+    s = np.stack([1.0 + sign * nx * nx * a, sign * b, -sign * nx], axis=1)
+    t = np.stack([b, sign + ny * ny * a, -ny], axis=1)
+
+    # Circumradius scaling factor which preserves the leaf area
+    angle = 2.0 * np.pi / n_vertices
+    scale = np.sqrt(2.0 * np.pi / (n_vertices * np.sin(angle)))
+    phi = angle * np.arange(n_vertices)
+
+    vertices = positions[:, None, :] + (radii * scale)[:, None, None] * (
+        np.cos(phi)[None, :, None] * s[:, None, :]
+        + np.sin(phi)[None, :, None] * t[:, None, :]
+    )
+
+    # Counter-clockwise triangle fans: face normals match leaf normals
+    k = np.arange(1, n_vertices - 1)
+    fan = np.stack([np.zeros_like(k), k, k + 1], axis=1)
+    faces = (np.arange(n_leaves) * n_vertices)[:, None, None] + fan[None, :, :]
+
+    return vertices.reshape(-1, 3), faces.reshape(-1, 3)
+
+
 @define
 class LeafCloudParams:
     """
@@ -600,6 +645,13 @@ class LeafCloud(CanopyElement):
     A container class for leaf clouds in abstract discrete canopies.
     Holds parameters completely characterizing the leaf cloud's leaves.
 
+    Leaves are disks. By default, each leaf is expanded as an individual disk
+    shape. For large leaf clouds, setting ``leaf_geometry`` to ``"mesh"``
+    expands all leaves as a single triangulated mesh, in which each leaf is
+    approximated by a regular polygon with the same area. This drastically
+    reduces kernel scene loading time and memory footprint. Both
+    representations can be instanced with :class:`.InstancedCanopyElement`.
+
     In practice, this class should rarely be instantiated directly using its
     constructor. Instead, several class method constructors are available:
 
@@ -735,6 +787,32 @@ class LeafCloud(CanopyElement):
         default="0.5",
     )
 
+    leaf_geometry: str = documented(
+        attrs.field(
+            default="disk",
+            kw_only=True,
+            validator=attrs.validators.in_({"disk", "mesh"}),
+        ),
+        doc='Leaf representation in the kernel scene: ``"disk"`` expands each '
+        'leaf as a disk shape; ``"mesh"`` expands all leaves as a single '
+        "triangulated mesh with one area-preserving polygon per leaf.",
+        type="str",
+        default='"disk"',
+    )
+
+    leaf_mesh_vertices: int = documented(
+        attrs.field(
+            default=8,
+            kw_only=True,
+            converter=int,
+            validator=attrs.validators.ge(3),
+        ),
+        doc="Number of vertices of the polygons approximating leaves if "
+        '``leaf_geometry`` is ``"mesh"``.',
+        type="int",
+        default="8",
+    )
+
     # --------------------------------------------------------------------------
     #                          Properties and accessors
     # --------------------------------------------------------------------------
@@ -793,6 +871,10 @@ class LeafCloud(CanopyElement):
             If ``avoid_overlap`` is ``True``, number of attempts made at placing
             a leaf without collision before giving up. Default: 1e5.
 
+        leaf_geometry : {"disk", "mesh"}
+            Leaf representation in the kernel scene (see
+            :attr:`.LeafCloud.leaf_geometry`). Default: ``"disk"``.
+
         **kwargs
             Keyword arguments interpreted by :class:`.CuboidLeafCloudParams`.
 
@@ -807,6 +889,7 @@ class LeafCloud(CanopyElement):
         """
         rng = np.random.default_rng(seed=seed)
         n_attempts = kwargs.pop("n_attempts", int(1e5))
+        leaf_geometry = kwargs.pop("leaf_geometry", "disk")
 
         params = CuboidLeafCloudParams(**kwargs)
 
@@ -838,6 +921,7 @@ class LeafCloud(CanopyElement):
             leaf_radii=leaf_radii,
             leaf_reflectance=params.leaf_reflectance,
             leaf_transmittance=params.leaf_transmittance,
+            leaf_geometry=leaf_geometry,
         )
 
     @classmethod
@@ -858,6 +942,10 @@ class LeafCloud(CanopyElement):
         seed : int
             Seed for the random number generator.
 
+        leaf_geometry : {"disk", "mesh"}
+            Leaf representation in the kernel scene (see
+            :attr:`.LeafCloud.leaf_geometry`). Default: ``"disk"``.
+
         **kwargs
             Keyword arguments interpreted by :class:`.SphereLeafCloudParams`.
 
@@ -871,6 +959,7 @@ class LeafCloud(CanopyElement):
         :class:`.SphereLeafCloudParams`
         """
         rng = np.random.default_rng(seed=seed)
+        leaf_geometry = kwargs.pop("leaf_geometry", "disk")
         params = SphereLeafCloudParams(**kwargs)
         leaf_positions = _leaf_cloud_positions_ellipsoid(
             params.n_leaves, rng, params.radius, params.radius, params.radius
@@ -888,6 +977,7 @@ class LeafCloud(CanopyElement):
             leaf_radii=leaf_radii,
             leaf_reflectance=params.leaf_reflectance,
             leaf_transmittance=params.leaf_transmittance,
+            leaf_geometry=leaf_geometry,
         )
 
     @classmethod
@@ -910,6 +1000,10 @@ class LeafCloud(CanopyElement):
         seed : int
             Seed for the random number generator.
 
+        leaf_geometry : {"disk", "mesh"}
+            Leaf representation in the kernel scene (see
+            :attr:`.LeafCloud.leaf_geometry`). Default: ``"disk"``.
+
         **kwargs
             Keyword arguments interpreted by :class:`.EllipsoidLeafCloudParams`.
 
@@ -923,6 +1017,7 @@ class LeafCloud(CanopyElement):
         :class:`.EllipsoidLeafCloudParams`
         """
         rng = np.random.default_rng(seed=seed)
+        leaf_geometry = kwargs.pop("leaf_geometry", "disk")
         params = EllipsoidLeafCloudParams(**kwargs)
         leaf_positions = _leaf_cloud_positions_ellipsoid(
             params.n_leaves, rng, params.a, params.b, params.c
@@ -940,6 +1035,7 @@ class LeafCloud(CanopyElement):
             leaf_radii=leaf_radii,
             leaf_reflectance=params.leaf_reflectance,
             leaf_transmittance=params.leaf_transmittance,
+            leaf_geometry=leaf_geometry,
         )
 
     @classmethod
@@ -961,6 +1057,10 @@ class LeafCloud(CanopyElement):
         seed : int
             Seed for the random number generator.
 
+        leaf_geometry : {"disk", "mesh"}
+            Leaf representation in the kernel scene (see
+            :attr:`.LeafCloud.leaf_geometry`). Default: ``"disk"``.
+
         **kwargs
             Keyword arguments interpreted by :class:`.CylinderLeafCloudParams`.
 
@@ -974,6 +1074,7 @@ class LeafCloud(CanopyElement):
         :class:`.CylinderLeafCloudParams`
         """
         rng = np.random.default_rng(seed=seed)
+        leaf_geometry = kwargs.pop("leaf_geometry", "disk")
         params = CylinderLeafCloudParams(**kwargs)
         leaf_positions = _leaf_cloud_positions_cylinder(
             params.n_leaves, params.radius, params.l_vertical, rng
@@ -991,6 +1092,7 @@ class LeafCloud(CanopyElement):
             leaf_radii=leaf_radii,
             leaf_reflectance=params.leaf_reflectance,
             leaf_transmittance=params.leaf_transmittance,
+            leaf_geometry=leaf_geometry,
         )
 
     @classmethod
@@ -1012,6 +1114,10 @@ class LeafCloud(CanopyElement):
         seed : int
             Seed for the random number generator.
 
+        leaf_geometry : {"disk", "mesh"}
+            Leaf representation in the kernel scene (see
+            :attr:`.LeafCloud.leaf_geometry`). Default: ``"disk"``.
+
         **kwargs
             Keyword arguments interpreted by :class:`.ConeLeafCloudParams`.
 
@@ -1025,6 +1131,7 @@ class LeafCloud(CanopyElement):
         :class:`.ConeLeafCloudParams`
         """
         rng = np.random.default_rng(seed=seed)
+        leaf_geometry = kwargs.pop("leaf_geometry", "disk")
         params = ConeLeafCloudParams(**kwargs)
         leaf_positions = _leaf_cloud_positions_cone(
             params.n_leaves, params.radius, params.l_vertical, rng
@@ -1043,6 +1150,7 @@ class LeafCloud(CanopyElement):
             leaf_radii=leaf_radii,
             leaf_reflectance=params.leaf_reflectance,
             leaf_transmittance=params.leaf_transmittance,
+            leaf_geometry=leaf_geometry,
         )
 
     @classmethod
@@ -1052,6 +1160,7 @@ class LeafCloud(CanopyElement):
         leaf_transmittance: float | Spectrum = 0.5,
         leaf_reflectance: float | Spectrum = 0.5,
         id: str = "leaf_cloud",
+        leaf_geometry: str = "disk",
     ) -> LeafCloud:
         """
         Construct a :class:`.LeafCloud` from a text file specifying the leaf
@@ -1087,6 +1196,10 @@ class LeafCloud(CanopyElement):
         id : str
             ID of the created :class:`.LeafCloud` instance.
 
+        leaf_geometry : {"disk", "mesh"}
+            Leaf representation in the kernel scene (see
+            :attr:`.LeafCloud.leaf_geometry`). Default: ``"disk"``.
+
         Returns
         -------
         :class:`.LeafCloud`:
@@ -1123,6 +1236,7 @@ class LeafCloud(CanopyElement):
             leaf_radii=radii,
             leaf_reflectance=leaf_reflectance,
             leaf_transmittance=leaf_transmittance,
+            leaf_geometry=leaf_geometry,
         )
 
     # --------------------------------------------------------------------------
@@ -1135,6 +1249,14 @@ class LeafCloud(CanopyElement):
 
     @property
     def _template_bsdfs(self) -> dict:
+        if self.leaf_geometry == "mesh":
+            # The BSDF is attached to the leaf mesh (see _leaf_mesh())
+            return {}
+
+        return self._template_bsdf
+
+    @property
+    def _template_bsdf(self) -> dict:
         objects = {
             "reflectance": traverse(self.leaf_reflectance)[0].data,
             "transmittance": traverse(self.leaf_transmittance)[0].data,
@@ -1150,6 +1272,11 @@ class LeafCloud(CanopyElement):
 
     @property
     def _template_shapes(self) -> dict:
+        if self.leaf_geometry == "mesh":
+            if self.n_leaves() == 0:
+                return {}
+            return {f"{self.id}_leaves": DictParameter(self._leaf_mesh)}
+
         length_units = uck.get("length")
         result = {}
         bsdf_dict = {"type": "ref", "id": self.bsdf_id}
@@ -1174,6 +1301,38 @@ class LeafCloud(CanopyElement):
 
         return result
 
+    def _leaf_mesh(self, ctx: KernelContext) -> mi.Mesh:
+        # Build a mesh holding all leaves. Vertex generation is vectorized; the
+        # BSDF is loaded and attached to the mesh because meshes created from
+        # Python cannot reference other scene nodes
+        length_units = uck.get("length")
+        vertices, faces = _leaf_cloud_mesh(
+            self.leaf_positions.m_as(length_units),
+            self.leaf_orientations,
+            self.leaf_radii.m_as(length_units),
+            self.leaf_mesh_vertices,
+        )
+
+        bsdf_dict = KernelDict(self._template_bsdf).render(ctx)[self.bsdf_id]
+        bsdf_dict["id"] = self.bsdf_id
+        props = mi.Properties()
+        props["mesh_bsdf"] = mi_load_dict(bsdf_dict)
+
+        mesh = mi.Mesh(
+            name=f"{self.id}_leaves",
+            face_count=faces.shape[0],
+            vertex_count=vertices.shape[0],
+            has_vertex_normals=False,
+            has_vertex_texcoords=False,
+            props=props,
+        )
+        mesh_params = mi.traverse(mesh)
+        mesh_params["vertex_positions"] = vertices.ravel()
+        mesh_params["faces"] = faces.ravel()
+        mesh_params.update()
+
+        return mesh
+
     @property
     def _params_bsdfs(self) -> dict:
         objects = {
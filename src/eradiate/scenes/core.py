@@ -135,7 +135,8 @@ class NodeSceneElement(SceneElement, ABC):
 
     def traverse(self, callback: SceneTraversal) -> None:
         # Inherit docstring
-        callback.put_template(self.template)
+        if callback.templates:
+            callback.put_template(self.template)
 
         if self.params is not None:
             callback.put_params(self.params)
@@ -167,7 +168,8 @@ class InstanceSceneElement(SceneElement, ABC):
 
     def traverse(self, callback):
         # Inherit docstring
-        callback.put_instance(self.instance)
+        if callback.templates:
+            callback.put_instance(self.instance)
 
         if self.params is not None:
             callback.put_params(self.params)
@@ -215,7 +217,8 @@ class CompositeSceneElement(SceneElement, ABC):
 
     def traverse(self, callback):
         # Inherit docstring
-        callback.put_template(self.template)
+        if callback.templates:
+            callback.put_template(self.template)
 
         if self.params is not None:
             callback.put_params(self.params)
@@ -226,7 +229,7 @@ class CompositeSceneElement(SceneElement, ABC):
                     callback.put_object(name, obj)
 
                 else:
-                    template, params = traverse(obj)
+                    template, params = traverse(obj, templates=callback.templates)
                     callback.put_template(
                         {f"{name}.{k}": v for k, v in template.items()}
                     )
@@ -313,6 +316,9 @@ class SceneTraversal:
     #: Dictionary mapping nodes to their defined parameters
     params: dict = attrs.field(factory=dict)
 
+    #: If ``False``, kernel dictionary template contributions are not evaluated
+    templates: bool = attrs.field(default=True)
+
     def __attrs_post_init__(self):
         self.hierarchy[self.node] = (self.parent, self.depth)
 
@@ -353,10 +359,12 @@ class SceneTraversal:
                 hierarchy=self.hierarchy,
                 template=self.template,
                 params=self.params,
+                templates=self.templates,
             )
 
             if isinstance(node, InstanceSceneElement):
-                cb.put_instance(node.instance)
+                if self.templates:
+                    cb.put_instance(node.instance)
                 cb.put_params(node.params)
 
             else:
@@ -371,7 +379,9 @@ class SceneTraversal:
         self.template[self.name] = obj
 
 
-def traverse(node: NodeSceneElement) -> tuple[KernelDict, KernelSceneParameterMap]:
+def traverse(
+    node: NodeSceneElement, templates: bool = True
+) -> tuple[KernelDict, KernelSceneParameterMap]:
     """
     Traverse a scene element tree and collect kernel dictionary template and
     parameter update table data.
@@ -381,6 +391,12 @@ def traverse(node: NodeSceneElement) -> tuple[KernelDict, KernelSceneParameterMa
     node : .SceneElement
         Scene element where to start traversal.
 
+    templates : bool, optional
+        If ``False``, kernel dictionary template contributions are not
+        evaluated and the returned template is empty. This is useful to
+        collect the parameter update table only, *e.g.* when the kernel
+        dictionary is loaded from a cache.
+
     Returns
     -------
     kdict_template : .KernelDict
@@ -390,7 +406,7 @@ def traverse(node: NodeSceneElement) -> tuple[KernelDict, KernelSceneParameterMa
         Kernel parameter table associated with the traversed scene element.
     """
     # Traverse scene element tree
-    cb = SceneTraversal(node)
+    cb = SceneTraversal(node, templates=templates)
     node.traverse(cb)
 
     # Use collected data to generate the kernel dictionary
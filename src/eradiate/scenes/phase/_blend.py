@@ -14,7 +14,7 @@ from ...attrs import documented
 from ...contexts import KernelContext
 from ...kernel import DictParameter, KernelSceneParameterFlags, SceneParameter
 from ...spectral.index import SpectralIndex
-from ...util.misc import cache_by_id
+from ...util.misc import cache_by_value
 
 
 @attrs.define(eq=False, slots=False)
@@ -105,6 +105,7 @@ class BlendPhaseFunction(PhaseFunction):
 
     def update(self) -> None:
         super().update()
+        self._eval_conditional_weights_impl.cache_clear()
 
         # Synchronize geometries
         for component in self.components:
@@ -113,7 +114,7 @@ class BlendPhaseFunction(PhaseFunction):
             if isinstance(component, BlendPhaseFunction):
                 component.geometry = self.geometry
 
-    @cache_by_id
+    @cache_by_value
     def _eval_conditional_weights_impl(self, si: SpectralIndex) -> np.ndarray:
         """
         Memoised weight evaluation, used if weights are defined as callables.
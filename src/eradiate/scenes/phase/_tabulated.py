@@ -12,13 +12,18 @@ import eradiate
 
 from ._core import PhaseFunction
 from ...attrs import define, documented
-from ...kernel import DictParameter, KernelSceneParameterFlags, SceneParameter
+from ...kernel import (
+    DictParameter,
+    KernelSceneParameterFlags,
+    SceneParameter,
+    SpectralDependency,
+)
 from ...spectral.index import (
     CKDSpectralIndex,
     MonoSpectralIndex,
     SpectralIndex,
 )
-from ...util.misc import summary_repr
+from ...util.misc import cache_by_value, summary_repr
 
 
 def _convert_data(da: xr.DataArray) -> xr.DataArray:
@@ -100,6 +105,12 @@ class TabulatedPhaseFunction(PhaseFunction):
 
     _is_irregular: bool = attrs.field(default=False, init=False, repr=False)
 
+    # Sorted wavelengths (in data units) and contiguous (w, i, j, mu) value
+    # table, built upon first evaluation
+    _table: tuple[np.ndarray, np.ndarray] | None = attrs.field(
+        default=None, init=False, repr=False
+    )
+
     @property
     def has_polarized_data(self) -> bool:
         return self.data.i.shape[0] == 4 or self.data.j.shape[0] == 4
@@ -110,13 +121,105 @@ class TabulatedPhaseFunction(PhaseFunction):
             self.has_polarized_data or self.force_polarized_phase
         )
 
-    def __attrs_post_init__(self):
+    def update(self) -> None:
+        super().update()
+
         # Check whether mu coordinate spacing is regular
         mu = self.data.mu.values
         dmu = mu[1:] - mu[:-1]
 
         self._is_irregular = not np.allclose(dmu, dmu[0]) or self.is_polarized
 
+        # Reset evaluation tables and caches
+        self._table = None
+        self._eval_matrix_impl.cache_clear()
+
+    def _get_table(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._table is None:
+            data = self.data.sortby("w").transpose("w", "i", "j", "mu")
+            self._table = (
+                np.ascontiguousarray(data.w.values, dtype=np.float64),
+                np.ascontiguousarray(data.values, dtype=np.float64),
+            )
+        return self._table
+
+    def eval_matrix_mono(self, w: pint.Quantity) -> np.ndarray:
+        """
+        Evaluate all phase matrix components in monochromatic modes.
+
+        Parameters
+        ----------
+        w : :class:`pint.Quantity`
+            Wavelength.
+
+        Returns
+        -------
+        ndarray
+            Evaluated phase matrix as an array of shape ``(i, j, mu)`` or
+            ``(w, i, j, mu)`` depending on the shape of `w`.
+
+        Raises
+        ------
+        ValueError
+            If `w` is outside of the wavelength range covered by the data.
+
+        Notes
+        -----
+        Values are linearly interpolated along the wavelength dimension: the
+        interpolation weights are computed once for all components, which are
+        then evaluated with a single weighted sum.
+        """
+        w_table, table = self._get_table()
+        w_m = np.atleast_1d(w.m_as(self.data.w.attrs["units"])).astype(np.float64)
+
+        if np.any((w_m < w_table[0]) | (w_m > w_table[-1])):
+            raise ValueError(
+                f"wavelength {w} is out of the range covered by phase function "
+                f"data [{w_table[0]}, {w_table[-1]}] {self.data.w.attrs['units']}"
+            )
+
+        if len(w_table) == 1:
+            result = np.repeat(table, len(w_m), axis=0)
+        else:
+            idx = np.clip(
+                np.searchsorted(w_table, w_m, side="right") - 1, 0, len(w_table) - 2
+            )
+            weight = ((w_m - w_table[idx]) / (w_table[idx + 1] - w_table[idx]))[
+                :, None, None, None
+            ]
+            result = (1.0 - weight) * table[idx] + weight * table[idx + 1]
+
+        return result[0] if np.isscalar(w.magnitude) else result
+
+    def eval_matrix(self, si: SpectralIndex) -> np.ndarray:
+        """
+        Evaluate all phase matrix components at a given spectral index.
+
+        Parameters
+        ----------
+        si : :class:`.SpectralIndex`
+            Spectral index.
+
+        Returns
+        -------
+        ndarray
+            Evaluated phase matrix as a read-only array of shape
+            ``(i, j, mu)``.
+
+        Notes
+        -----
+        Phase function data only depend on wavelength: results are cached by
+        wavelength and shared by all components and, in CKD modes, by all
+        *g*-points of a bin.
+        """
+        return self._eval_matrix_impl(si.w)
+
+    @cache_by_value
+    def _eval_matrix_impl(self, w: pint.Quantity) -> np.ndarray:
+        result = self.eval_matrix_mono(w)
+        result.flags.writeable = False
+        return result
+
     @singledispatchmethod
     def eval(self, si: SpectralIndex, i: int, j: int) -> np.ndarray:
         """
@@ -140,12 +243,9 @@ class TabulatedPhaseFunction(PhaseFunction):
         raise NotImplementedError
 
     @eval.register(MonoSpectralIndex)
-    def _(self, si, i, j) -> np.ndarray:
-        return self.eval_mono(w=si.w, i=i, j=j)
-
     @eval.register(CKDSpectralIndex)
     def _(self, si, i, j) -> np.ndarray:
-        return self.eval_ckd(w=si.w, g=si.g, i=i, j=j)
+        return self.eval_matrix(si)[i, j]
 
     def eval_mono(self, w: pint.Quantity, i, j) -> np.ndarray:
         """
@@ -168,15 +268,7 @@ class TabulatedPhaseFunction(PhaseFunction):
             Evaluated phase function as a 1D or 2D array depending on the shape
             of `w` (angle dimension comes last).
         """
-        w_units = self.data.w.attrs["units"]
-        result = (
-            self.data.isel(i=i, j=j)
-            .interp(w=np.atleast_1d(w.m_as(w_units)), kwargs={"bounds_error": True})
-            .data
-        )
-
-        # Squeeze result if input was scalar
-        return result.squeeze() if np.isscalar(w.magnitude) else result
+        return self.eval_matrix_mono(w)[..., i, j, :]
 
     def eval_ckd(self, w: pint.Quantity, g: float, i: int, j: int) -> np.ndarray:
         """
@@ -290,6 +382,7 @@ class TabulatedPhaseFunction(PhaseFunction):
             values_name: SceneParameter(
                 lambda ctx: self.eval(ctx.si, 0, 0),
                 KernelSceneParameterFlags.SPECTRAL,
+                spectral_dependency=SpectralDependency.BIN,
             )
         }
 
@@ -298,34 +391,41 @@ class TabulatedPhaseFunction(PhaseFunction):
                 result["m12"] = SceneParameter(
                     lambda ctx: self.eval(ctx.si, 0, 1),
                     KernelSceneParameterFlags.SPECTRAL,
+                    spectral_dependency=SpectralDependency.BIN,
                 )
                 result["m33"] = SceneParameter(
                     lambda ctx: self.eval(ctx.si, 2, 2),
                     KernelSceneParameterFlags.SPECTRAL,
+                    spectral_dependency=SpectralDependency.BIN,
                 )
                 result["m34"] = SceneParameter(
                     lambda ctx: self.eval(ctx.si, 2, 3),
                     KernelSceneParameterFlags.SPECTRAL,
+                    spectral_dependency=SpectralDependency.BIN,
                 )
 
                 if self.particle_shape == "spheroidal":
                     result["m22"] = SceneParameter(
                         lambda ctx: self.eval(ctx.si, 1, 1),
                         KernelSceneParameterFlags.SPECTRAL,
+                        spectral_dependency=SpectralDependency.BIN,
                     )
                     result["m44"] = SceneParameter(
                         lambda ctx: self.eval(ctx.si, 3, 3),
                         KernelSceneParameterFlags.SPECTRAL,
+                        spectral_dependency=SpectralDependency.BIN,
                     )
 
                 elif self.particle_shape == "spherical":
                     result["m22"] = SceneParameter(
                         lambda ctx: self.eval(ctx.si, 0, 0),
                         KernelSceneParameterFlags.SPECTRAL,
+                        spectral_dependency=SpectralDependency.BIN,
                     )
                     result["m44"] = SceneParameter(
                         lambda ctx: self.eval(ctx.si, 2, 2),
                         KernelSceneParameterFlags.SPECTRAL,
+                        spectral_dependency=SpectralDependency.BIN,
                     )
 
                 else:
@@ -338,16 +438,19 @@ class TabulatedPhaseFunction(PhaseFunction):
                 result["m22"] = SceneParameter(
                     lambda ctx: self.eval(ctx.si, 0, 0),
                     KernelSceneParameterFlags.SPECTRAL,
+                    spectral_dependency=SpectralDependency.BIN,
                 )
 
                 result["m33"] = SceneParameter(
                     lambda ctx: self.eval(ctx.si, 0, 0),
                     KernelSceneParameterFlags.SPECTRAL,
+                    spectral_dependency=SpectralDependency.BIN,
                 )
 
                 result["m44"] = SceneParameter(
                     lambda ctx: self.eval(ctx.si, 0, 0),
                     KernelSceneParameterFlags.SPECTRAL,
+                    spectral_dependency=SpectralDependency.BIN,
                 )
 
         return result
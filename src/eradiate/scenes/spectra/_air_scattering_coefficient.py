@@ -5,7 +5,12 @@ import pint
 
 from ._core import Spectrum
 from ...attrs import define
-from ...kernel import DictParameter, KernelSceneParameterFlags, SceneParameter
+from ...kernel import (
+    DictParameter,
+    KernelSceneParameterFlags,
+    SceneParameter,
+    SpectralDependency,
+)
 from ...radprops.rayleigh import compute_sigma_s_air
 from ...units import PhysicalQuantity
 from ...units import unit_context_kernel as uck
@@ -61,5 +66,6 @@ class AirScatteringCoefficientSpectrum(Spectrum):
                     self.eval(ctx.si).m_as(uck.get("collision_coefficient"))
                 ),
                 flags=KernelSceneParameterFlags.SPECTRAL,
+                spectral_dependency=SpectralDependency.BIN,
             )
         }
@@ -9,7 +9,12 @@ import xarray as xr
 from ._core import Spectrum
 from ... import converters, validators
 from ...attrs import define, documented
-from ...kernel import DictParameter, KernelSceneParameterFlags, SceneParameter
+from ...kernel import (
+    DictParameter,
+    KernelSceneParameterFlags,
+    SceneParameter,
+    SpectralDependency,
+)
 from ...units import PhysicalQuantity, to_quantity
 from ...units import unit_context_config as ucc
 from ...units import unit_context_kernel as uck
@@ -278,5 +283,6 @@ class InterpolatedSpectrum(Spectrum):
             "value": SceneParameter(
                 func=lambda ctx: float(self.eval(ctx.si).m_as(uck.get(self.quantity))),
                 flags=KernelSceneParameterFlags.SPECTRAL,
+                spectral_dependency=SpectralDependency.BIN,
             )
         }
@@ -16,11 +16,16 @@ from ... import converters, validators
 from ...attrs import define, documented
 from ...config import settings
 from ...exceptions import DataError
-from ...kernel import DictParameter, KernelSceneParameterFlags, SceneParameter
-from ...units import PhysicalQuantity, to_quantity
+from ...kernel import (
+    DictParameter,
+    KernelSceneParameterFlags,
+    SceneParameter,
+    SpectralDependency,
+)
+from ...units import PhysicalQuantity
 from ...units import unit_context_kernel as uck
 from ...units import unit_registry as ureg
-from ...util.misc import summary_repr
+from ...util.misc import cache_by_value, summary_repr
 
 # Cache for Skyfield ephemeris loader (initialized lazily)
 _SKYFIELD_LOADER = None
@@ -69,6 +74,62 @@ def _dataset_converter(value: Any):
     return result
 
 
+@cache_by_value(maxsize=64)
+def _earth_sun_distance_scale(dt: datetime.datetime) -> float:
+    """
+    Compute the irradiance scaling factor associated with the Earth-Sun
+    distance at a given date. Results are cached by date.
+    """
+    # Note: The import is optional to avoid loading ephemeris data
+    # unless needed.
+    from skyfield.api import Loader, utc
+
+    # Suppress ResourceWarning from Skyfield's file handling
+    # Skyfield keeps ephemeris files open for performance reasons
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore", category=ResourceWarning, message=".*de421.bsp.*"
+        )
+
+        # Use cached ephemeris loader to avoid repeated file opens
+        global _SKYFIELD_LOADER, _SKYFIELD_EPHEMERIS
+        if _SKYFIELD_LOADER is None:
+            try:
+                # Use the skyfield-data package if available
+                from skyfield_data import get_skyfield_data_path
+
+                skyfield_cache_dir = get_skyfield_data_path()
+            except ImportError:
+                # Otherwise store ephemeris files in Eradiate's cache directory
+                skyfield_cache_dir = Path(settings["data_path"]) / "cached" / "skyfield"
+                skyfield_cache_dir.mkdir(parents=True, exist_ok=True)
+
+            _SKYFIELD_LOADER = Loader(skyfield_cache_dir)
+
+        if _SKYFIELD_EPHEMERIS is None:
+            _SKYFIELD_EPHEMERIS = _SKYFIELD_LOADER("de421.bsp")
+
+        # Get timescale
+        ts = _SKYFIELD_LOADER.timescale()
+
+        # Get Earth and Sun positions
+        earth = _SKYFIELD_EPHEMERIS["earth"]
+        sun = _SKYFIELD_EPHEMERIS["sun"]
+
+        # Convert datetime to skyfield time (ensure UTC timezone)
+        dt_utc = dt.replace(tzinfo=utc) if dt.tzinfo is None else dt
+        t = ts.from_datetime(dt_utc)
+
+        # Calculate Earth-Sun distance in AU
+        astrometric = earth.at(t).observe(sun)
+        distance_au = astrometric.distance().au
+
+    # The irradiance scales as the inverse of d**2, where d is the
+    # Earth-Sun distance divided by the AU (reference distance for all
+    # Solar irradiance spectra in Eradiate).
+    return (1.0 / distance_au) ** 2
+
+
 @define(eq=False, slots=False)
 class SolarIrradianceSpectrum(Spectrum):
     """
@@ -169,6 +230,32 @@ class SolarIrradianceSpectrum(Spectrum):
         "scaling controlled by the *scale* parameter.",
     )
 
+    # Sorted wavelengths and irradiance values of the dataset, their units and
+    # the cumulative integral of the irradiance at wavelength nodes; built
+    # upon first evaluation
+    _table: tuple | None = attrs.field(default=None, init=False, repr=False)
+
+    def update(self) -> None:
+        super().update()
+        self._table = None
+
+    def _get_table(self) -> tuple:
+        if self._table is None:
+            ssi = self.dataset.ssi.sortby("w")
+            w = np.ascontiguousarray(ssi.w.values, dtype=np.float64)
+            values = np.ascontiguousarray(ssi.values, dtype=np.float64)
+            cumulative = np.concatenate(
+                ([0.0], np.cumsum(0.5 * (values[1:] + values[:-1]) * np.diff(w)))
+            )
+            self._table = (
+                w,
+                values,
+                cumulative,
+                ureg(ssi.w.attrs["units"]).units,
+                ureg(ssi.attrs["units"]).units,
+            )
+        return self._table
+
     def _scale_earth_sun_distance(self) -> float:
         """
         Compute scaling factor applied to the irradiance spectrum based on the
@@ -178,85 +265,94 @@ class SolarIrradianceSpectrum(Spectrum):
         # Earth-Sun distance of 1 AU
         if self.datetime is None:
             return 1.0
-
         else:
-            # Note: The import is optional to avoid loading ephemeris data
-            # unless needed.
-            from skyfield.api import Loader, utc
-
-            # Suppress ResourceWarning from Skyfield's file handling
-            # Skyfield keeps ephemeris files open for performance reasons
-            with warnings.catch_warnings():
-                warnings.filterwarnings(
-                    "ignore", category=ResourceWarning, message=".*de421.bsp.*"
-                )
-
-                # Use cached ephemeris loader to avoid repeated file opens
-                global _SKYFIELD_LOADER, _SKYFIELD_EPHEMERIS
-                if _SKYFIELD_LOADER is None:
-                    try:
-                        # Use the skyfield-data package if available
-                        from skyfield_data import get_skyfield_data_path
-
-                        skyfield_cache_dir = get_skyfield_data_path()
-                    except ImportError:
-                        # Otherwise store ephemeris files in Eradiate's cache directory
-                        skyfield_cache_dir = (
-                            Path(settings["data_path"]) / "cached" / "skyfield"
-                        )
-                        skyfield_cache_dir.mkdir(parents=True, exist_ok=True)
-
-                    _SKYFIELD_LOADER = Loader(skyfield_cache_dir)
-
-                if _SKYFIELD_EPHEMERIS is None:
-                    _SKYFIELD_EPHEMERIS = _SKYFIELD_LOADER("de421.bsp")
-
-                # Get timescale
-                ts = _SKYFIELD_LOADER.timescale()
-
-                # Get Earth and Sun positions
-                earth = _SKYFIELD_EPHEMERIS["earth"]
-                sun = _SKYFIELD_EPHEMERIS["sun"]
-
-                # Convert datetime to skyfield time (ensure UTC timezone)
-                dt_utc = (
-                    self.datetime.replace(tzinfo=utc)
-                    if self.datetime.tzinfo is None
-                    else self.datetime
-                )
-                t = ts.from_datetime(dt_utc)
-
-                # Calculate Earth-Sun distance in AU
-                astrometric = earth.at(t).observe(sun)
-                distance_au = astrometric.distance().au
-
-            # The irradiance scales as the inverse of d**2, where d is the
-            # Earth-Sun distance divided by the AU (reference distance for all
-            # Solar irradiance spectra in Eradiate).
-            return (1.0 / distance_au) ** 2
+            return _earth_sun_distance_scale(self.datetime)
 
     def eval_mono(self, w: pint.Quantity) -> pint.Quantity:
         # Inherit docstring
 
-        w_units = ureg(self.dataset.ssi.w.attrs["units"])
-        irradiance = to_quantity(
-            self.dataset.ssi.interp(w=np.atleast_1d(w.m_as(w_units)), method="linear")
-        )
+        w_table, values, _, w_units, ssi_units = self._get_table()
+        w_m = np.atleast_1d(w.m_as(w_units))
 
         # Raise if out of bounds or ill-formed dataset
-        if np.any(np.isnan(irradiance.magnitude)):
+        if np.any((w_m < w_table[0]) | (w_m > w_table[-1])):
+            raise ValueError(
+                "solar irradiance dataset does not cover the requested wavelengths"
+            )
+
+        irradiance = np.interp(w_m, w_table, values)
+        if np.any(np.isnan(irradiance)):
             raise ValueError("interpolation of solar irradiance dataset returned nan")
 
         result = irradiance * self.scale * self._scale_earth_sun_distance()
 
         # Squeeze result if input was scalar
-        return result.squeeze() if np.isscalar(w.magnitude) else result
+        result = result.squeeze() if np.isscalar(w.magnitude) else result
+        return result * ssi_units
 
     def eval_ckd(self, w: pint.Quantity, g: float) -> pint.Quantity:
         return self.eval_mono(w=w)
 
     def integral(self, wmin: pint.Quantity, wmax: pint.Quantity) -> pint.Quantity:
-        raise NotImplementedError
+        # Inherit docstring
+
+        w_table, values, cumulative, w_units, ssi_units = self._get_table()
+
+        def antiderivative(x):
+            # Integral of the piecewise linear irradiance from the first node
+            if np.any((x < w_table[0]) | (x > w_table[-1])):
+                raise ValueError(
+                    "solar irradiance integral bounds are out of the spectral "
+                    "range covered by the dataset"
+                )
+            k = np.clip(
+                np.searchsorted(w_table, x, side="right") - 1, 0, len(w_table) - 1
+            )
+            return cumulative[k] + 0.5 * (values[k] + np.interp(x, w_table, values)) * (
+                x - w_table[k]
+            )
+
+        wmin_m = np.asarray(wmin.m_as(w_units), dtype=np.float64)
+        wmax_m = np.asarray(wmax.m_as(w_units), dtype=np.float64)
+        result = (antiderivative(wmax_m) - antiderivative(wmin_m)) * (
+            self.scale * self._scale_earth_sun_distance()
+        )
+
+        return result * ssi_units * w_units
+
+    def eval_bin_average(
+        self, wmins: pint.Quantity, wmaxs: pint.Quantity
+    ) -> pint.Quantity:
+        """
+        Evaluate the average irradiance over spectral bins. The irradiance is
+        integrated with a trapezoid rule over the dataset wavelength nodes, for
+        all bins at once.
+
+        Parameters
+        ----------
+        wmins : quantity
+            Bin lower bounds.
+
+        wmaxs : quantity
+            Bin upper bounds.
+
+        Returns
+        -------
+        quantity
+            Bin-averaged irradiance, with the same shape as the bound arrays.
+
+        Raises
+        ------
+        ValueError
+            If bin bounds are out of the spectral range covered by the dataset.
+
+        Notes
+        -----
+        With a CKD spectral grid ``grid``, the bin-averaged irradiance of the
+        whole grid is obtained with
+        ``spectrum.eval_bin_average(grid.wmins, grid.wmaxs)``.
+        """
+        return self.integral(wmins, wmaxs) / (wmaxs - wmins)
 
     @property
     def template(self) -> dict:
@@ -277,5 +373,6 @@ class SolarIrradianceSpectrum(Spectrum):
             "value": SceneParameter(
                 func=lambda ctx: float(self.eval(ctx.si).m_as(uck.get("irradiance"))),
                 flags=KernelSceneParameterFlags.SPECTRAL,
+                spectral_dependency=SpectralDependency.BIN,
             )
         }
@@ -7,7 +7,12 @@ import pinttrs
 
 from ._core import Spectrum
 from ...attrs import define, documented
-from ...kernel import DictParameter, KernelSceneParameterFlags, SceneParameter
+from ...kernel import (
+    DictParameter,
+    KernelSceneParameterFlags,
+    SceneParameter,
+    SpectralDependency,
+)
 from ...units import PhysicalQuantity
 from ...units import unit_context_config as ucc
 from ...units import unit_context_kernel as uck
@@ -109,5 +114,6 @@ class UniformSpectrum(Spectrum):
             "value": SceneParameter(
                 func=lambda ctx: float(self.eval(ctx.si).m_as(uck.get(self.quantity))),
                 flags=KernelSceneParameterFlags.SPECTRAL,
+                spectral_dependency=SpectralDependency.NONE,
             )
         }
@@ -4,12 +4,22 @@ import enum
 import warnings
 
 import attrs
+import numpy as np
 import pint
 import xarray as xr
 from axsdb import CKDAbsorptionDatabase
+from pinttr.util import ensure_units
 
+from .. import validators
 from ..attrs import documented, frozen
 from ..quad import Quad, QuadType
+from ..units import unit_context_config as ucc
+from ..units import unit_registry as ureg
+
+#: Name of the CKD absorption database variable holding, for each bin, the
+#: error on the total column transmittance w.r.t. absorption achieved with
+#: ``ng`` quadrature points.
+ERROR_VARIABLE = "error"
 
 
 class CKDQuadPolicy(enum.Enum):
@@ -26,11 +36,11 @@ class CKDQuadPolicy(enum.Enum):
 
     FIXED = "fixed"  #: Fixed number of quadrature points.
     MINIMIZE_ERROR = "minimize_error"
-    """Number of quadrature points that minimizes the error in each spectral bin
-    (not implemented yet)."""
+    """Number of quadrature points that minimizes the error in each spectral
+    bin."""
     ERROR_THRESHOLD = "error_threshold"
-    """Optimal number of quadrature points that achieves the error threshold
-    (not implemented yet)."""
+    """Smallest number of quadrature points that achieves the error threshold
+    in each spectral bin."""
 
 
 @frozen
@@ -40,6 +50,11 @@ class CKDQuadConfig:
     the quadrature definition is set, it can query an absorption database to
     generate a quadrature rule for a specified spectral bin using its
     :meth:`.get_quad` method.
+
+    Adaptive policies read the transmittance error achieved with each number
+    of quadrature points from the :data:`ERROR_VARIABLE` variable of the CKD
+    absorption database, indexed by the ``w`` and ``ng`` dimensions. If it is
+    missing, they fall back to :attr:`ng_max` quadrature points.
     """
 
     type: QuadType = documented(
@@ -65,6 +80,17 @@ class CKDQuadConfig:
         default="fixed",
     )
 
+    error_threshold: float = documented(
+        attrs.field(
+            default=1e-3,
+            converter=float,
+            validator=validators.is_positive,
+        ),
+        doc="Transmittance error threshold used by the ``error_threshold`` policy.",
+        type="float",
+        default="1e-3",
+    )
+
     @classmethod
     def convert(self, value) -> CKDQuadConfig:
         """
@@ -100,32 +126,69 @@ class CKDQuadConfig:
         -------
         .CKDQuad
         """
-        if abs_db is None:
+        if abs_db is None or self.policy is CKDQuadPolicy.FIXED:
             # If no spectral information is passed, use default policy
             ng = self.ng_max
         else:
-            if self.policy is not CKDQuadPolicy.FIXED:
-                # TODO: Temporary, implement advanced quadrature point count
-                #  policies when sample count allocation is refactored
+            error = _transmittance_error(abs_db, wcenter)
+
+            if error is None:
                 warnings.warn(
-                    "An advanced spectral quadrature configuration was defined, "
-                    "but this feature is currently disabled. Falling back to a "
-                    f"fixed quadrature point policy with {self.ng_max} g-points."
+                    f"The '{self.policy.value}' spectral quadrature policy "
+                    f"requires a '{ERROR_VARIABLE}' variable, missing from the "
+                    "absorption database. Falling back to a fixed quadrature "
+                    f"point policy with {self.ng_max} g-points."
                 )
-            ng = self.ng_max
+                ng = self.ng_max
+            elif self.policy is CKDQuadPolicy.MINIMIZE_ERROR:
+                ng = ng_minimum(error, self.ng_max)
+            else:
+                ng = ng_threshold(error, self.error_threshold, self.ng_max)
 
         return Quad.new(type=self.type, n=ng)
 
 
-# TODO: Refactor to use new absorption database format
-def ng_minimum(error: xr.DataArray, ng_max: int | None = None):
+def _transmittance_error(
+    abs_db: CKDAbsorptionDatabase, wcenter: pint.Quantity | float
+) -> xr.DataArray | None:
+    """
+    Look up the transmittance error data of the bin closest to ``wcenter``.
+    Return ``None`` if the database holds no error data.
+    """
+    w = ensure_units(wcenter, default_units=ucc.get("wavelength"))
+    ds = abs_db.lookup_datasets(wl=w)[0]
+
+    if ERROR_VARIABLE not in ds.data_vars:
+        return None
+
+    # The spectral coordinate may be a wavelength or a wavenumber
+    w_u = ureg.Unit(ds["w"].units)
+    w_m = (1.0 / w).m_as(w_u) if w_u.is_compatible_with("1/m") else w.m_as(w_u)
+
+    return ds[ERROR_VARIABLE].sel(w=w_m, method="nearest")
+
+
+def _error_candidates(error: xr.DataArray, ng_max: int | None) -> xr.DataArray:
+    # Absolute error for all candidate quadrature point counts of a single bin
+    if "w" in error.dims:
+        error = error.isel(w=0)
+    error = np.abs(error)
+
+    if ng_max is not None:
+        error = error.where(error.ng <= ng_max, drop=True)
+
+    return error
+
+
+def ng_minimum(error: xr.DataArray, ng_max: int | None = None) -> int:
     """
     Find the number of quadrature points that minimizes the error.
 
     Parameters
     ----------
     error : DataArray
-        Error data.
+        Error data for a single spectral bin, indexed by the ``ng`` dimension.
+        If a ``w`` dimension is present, the first bin is selected.
 
     ng_max : int, optional
         Maximum number of quadrature points. If not provided, it will be
@@ -134,19 +197,21 @@ def ng_minimum(error: xr.DataArray, ng_max: int | None = None):
     Returns
     -------
     int
-        Number of quadrature points that minimizes the error.
+        Number of quadrature points, not greater than ``ng_max``, that
+        minimizes the absolute error. If several values achieve the minimum,
+        the smallest one is returned.
     """
+    error = _error_candidates(error, ng_max)
 
-    if ng_max is None:
-        ng_max = int(error.ng.max())
+    if error.size == 0 or bool(error.isnull().all()):
+        return int(ng_max) if ng_max is not None else 1
 
-    error_w0 = error.isel(w=0)
-    ng_min = int(error.ng.where(error_w0 == error_w0.min(), drop=True)[0])
-    return ng_max if ng_min > ng_max else ng_min
+    return int(error.ng[int(error.fillna(np.inf).argmin())])
 
 
-# TODO: Refactor to use new absorption database format
-def ng_threshold(error: xr.DataArray, threshold: float, ng_max: int | None = None):
+def ng_threshold(
+    error: xr.DataArray, threshold: float, ng_max: int | None = None
+) -> int:
     """
     Find the number of quadrature points so that the error is (strictly) below
     a specified threshold value.
@@ -154,7 +219,8 @@ def ng_threshold(error: xr.DataArray, threshold: float, ng_max: int | None = Non
     Parameters
     ----------
     error : DataArray
-        Error data.
+        Error data for a single spectral bin, indexed by the ``ng`` dimension.
+        If a ``w`` dimension is present, the first bin is selected.
 
     threshold : float
         Error threshold.
@@ -166,17 +232,14 @@ def ng_threshold(error: xr.DataArray, threshold: float, ng_max: int | None = Non
     Returns
     -------
     int
-        Number of quadrature points so that the error is below the threshold.
+        Smallest number of quadrature points so that the absolute error is
+        below the threshold. If the threshold cannot be achieved, ``ng_max``
+        is returned.
     """
-
     if ng_max is None:
         ng_max = int(error.ng.max())
 
-    error_w0 = error.isel(w=0)
-    ng = error.ng.where(error_w0 < threshold, drop=True)
+    error = _error_candidates(error, ng_max)
+    ng = error.ng.where(error < threshold, drop=True)
 
-    if ng.size == 0:
-        return ng_max
-    else:
-        ng = int(ng[0])
-        return ng_max if ng > ng_max else ng
+    return ng_max if ng.size == 0 else int(ng.min())
@@ -4,15 +4,22 @@ A collection of tools which don't really fit anywhere else.
 
 from __future__ import annotations
 
+import enum
 import functools
+import hashlib
 import inspect
 import os
+import pickle
 import re
+import sys
+import threading
 import typing as t
-from collections import OrderedDict
+import weakref
+from collections import OrderedDict, namedtuple
 from numbers import Number
 from pathlib import Path
 
+import attrs
 import numpy as np
 import numpy.typing as npt
 import pint
@@ -81,6 +88,266 @@ class cache_by_id:
         return functools.partial(self.__call__, instance)
 
 
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "maxsize", "maxbytes", "currsize", "nbytes"]
+)
+CacheInfo.__doc__ = "Statistics of a :class:`.cache_by_value` cache."
+
+
+def _cache_key(arg: t.Any) -> t.Hashable:
+    # Convert an argument to a value-stable hashable key; raise a TypeError if
+    # the argument has no value representation
+    if isinstance(arg, pint.Quantity):
+        return ("quantity", _cache_key(arg.magnitude), str(arg.units))
+
+    if isinstance(arg, np.ndarray):
+        return ("ndarray", arg.dtype.str, arg.shape, arg.tobytes())
+
+    as_hashable = getattr(arg, "as_hashable", None)
+    if as_hashable is not None:
+        return (type(arg).__qualname__, as_hashable)
+
+    # Unhashable objects without a value representation raise: keying them by
+    # ID would return stale entries once the ID is reused
+    hash(arg)
+    return arg
+
+
+def _nbytes(value: t.Any) -> int:
+    # Estimate the memory footprint of a cached value
+    if isinstance(value, pint.Quantity):
+        return _nbytes(value.magnitude)
+
+    if isinstance(value, (np.ndarray, xr.Dataset, xr.DataArray)):
+        return int(value.nbytes)
+
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(x) for x in value)
+
+    return sys.getsizeof(value)
+
+
+class _LRUStore:
+    # A bounded LRU mapping with entry count and memory caps, and statistics
+
+    def __init__(self, maxsize: int | None, maxbytes: int | None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.data: OrderedDict[t.Hashable, tuple[t.Any, int]] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+
+    def miss(self) -> None:
+        with self.lock:
+            self.misses += 1
+
+    def get(self, key: t.Hashable) -> tuple[bool, t.Any]:
+        with self.lock:
+            try:
+                value, _ = self.data[key]
+            except KeyError:
+                self.misses += 1
+                return False, None
+            self.data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key: t.Hashable, value: t.Any) -> None:
+        if self.maxsize == 0:
+            return
+
+        size = _nbytes(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            return  # Too large to be cached
+
+        with self.lock:
+            if key in self.data:
+                self.nbytes -= self.data.pop(key)[1]
+            self.data[key] = (value, size)
+            self.nbytes += size
+
+            while (self.maxsize is not None and len(self.data) > self.maxsize) or (
+                self.maxbytes is not None and self.nbytes > self.maxbytes
+            ):
+                _, (_, evicted_size) = self.data.popitem(last=False)
+                self.nbytes -= evicted_size
+
+    def clear(self) -> None:
+        with self.lock:
+            self.data.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self.lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.maxsize,
+                self.maxbytes,
+                len(self.data),
+                self.nbytes,
+            )
+
+
+class cache_by_value:
+    """
+    Cache the result of a function in a bounded LRU store keyed by the value of
+    its arguments.
+
+    Contrary to :class:`.cache_by_id`, which holds a single entry referenced by
+    argument IDs, this decorator holds multiple entries and derives keys from
+    argument values:
+
+    * objects with an ``as_hashable`` property (*e.g.*
+      :class:`.SpectralIndex`, :class:`.ZGrid`) are keyed by its value;
+    * NumPy arrays and :class:`pint.Quantity` objects are keyed by their
+      contents (and units);
+    * other hashable objects are used as is;
+    * calls with unhashable objects bypass the cache and count as misses.
+
+    The cache is bounded by an entry count (``maxsize``) and an estimated memory
+    footprint (``maxbytes``); least recently used entries are evicted first.
+    When decorating a method, each instance gets its own cache, which can be
+    inspected with ``cache_info()`` and reset with ``cache_clear()``.
+
+    Parameters
+    ----------
+    func : callable, optional
+        Wrapped function. If unset, the decorator is called with keyword
+        arguments only and returns a decorator.
+
+    maxsize : int or None, optional, default: 16
+        Maximum number of cached entries. If ``None``, the entry count is
+        unbounded.
+
+    maxbytes : int or None, optional, default: None
+        Maximum estimated memory footprint of cached values, in bytes. If
+        ``None``, the memory footprint is unbounded. Values larger than this
+        limit are not cached.
+
+    Warnings
+    --------
+    Cached values are returned without copy: mutating them will corrupt the
+    cache.
+
+    Notes
+    -----
+    * Meant to be used as a decorator.
+    * The wrapped function may only have positional arguments.
+    * Works with functions and methods.
+    * Cache operations are thread-safe.
+
+    Examples
+    --------
+    >>> @cache_by_value(maxsize=2)
+    ... def f(x):
+    ...     print("Calling f")
+    ...     return x
+    >>> f(1)
+    Calling f
+    1
+    >>> f(2)
+    Calling f
+    2
+    >>> f(1)
+    1
+    >>> f.cache_info().hits, f.cache_info().misses
+    (1, 2)
+    """
+
+    def __init__(
+        self,
+        func: t.Callable | None = None,
+        *,
+        maxsize: int | None = 16,
+        maxbytes: int | None = None,
+    ):
+        self.func = func
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._store = _LRUStore(maxsize, maxbytes)
+        self._instance_stores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+        if func is not None:
+            functools.update_wrapper(self, func)
+
+    def _call(self, store: _LRUStore, bound: tuple, args: tuple) -> t.Any:
+        # Bound arguments (i.e. the instance) are not part of the key: each
+        # instance has its own store
+        try:
+            key = tuple(_cache_key(arg) for arg in args)
+        except TypeError:
+            store.miss()
+            return self.func(*bound, *args)
+
+        found, value = store.get(key)
+
+        if not found:
+            value = self.func(*bound, *args)
+            store.put(key, value)
+
+        return value
+
+    def __call__(self, *args):
+        if self.func is None:  # Decorator called with keyword arguments only
+            (func,) = args
+            return cache_by_value(func, maxsize=self.maxsize, maxbytes=self.maxbytes)
+
+        return self._call(self._store, (), args)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Return cache statistics (for a function, not a method).
+        """
+        return self._store.info()
+
+    def cache_clear(self) -> None:
+        """
+        Clear the cache and reset statistics (for a function, not a method).
+        """
+        self._store.clear()
+
+    def _get_store(self, instance: t.Any) -> _LRUStore:
+        with self._lock:
+            try:
+                return self._instance_stores[instance]
+            except KeyError:
+                store = _LRUStore(self.maxsize, self.maxbytes)
+                self._instance_stores[instance] = store
+                return store
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        return _BoundCache(self, instance, self._get_store(instance))
+
+
+class _BoundCache:
+    # Method bound to an instance-specific cache_by_value store
+
+    __slots__ = ("_cache", "_instance", "_store")
+
+    def __init__(self, cache: cache_by_value, instance: t.Any, store: _LRUStore):
+        self._cache = cache
+        self._instance = instance
+        self._store = store
+
+    def __call__(self, *args):
+        return self._cache._call(self._store, (self._instance,), args)
+
+    def cache_info(self) -> CacheInfo:
+        return self._store.info()
+
+    def cache_clear(self) -> None:
+        self._store.clear()
+
+
 class LoggingContext(object):
     """
     This context manager allows for a temporary override of logger settings.
@@ -191,6 +458,165 @@ def deduplicate_sorted(value: t.Sequence, cmp: t.Callable | None = None) -> list
     return result
 
 
+def fingerprint(obj: t.Any) -> str:
+    """
+    Compute a stable digest of an object based on its contents.
+
+    Contrary to :func:`hash`, the returned digest does not depend on object
+    identity or on the interpreter session, which makes it suitable as a key
+    for persistent caches. Supported objects are:
+
+    * Python scalars, strings, bytes, paths, enum members and types;
+    * NumPy arrays, :class:`pint.Quantity` and xarray objects (by contents);
+    * mappings, sequences and sets (recursively);
+    * *attrs* instances (recursively, from their ``init=True`` fields);
+    * objects with an ``as_hashable`` property (*e.g.* :class:`.SpectralIndex`);
+    * other picklable objects (from their pickled representation).
+
+    Parameters
+    ----------
+    obj
+        Object to fingerprint.
+
+    Returns
+    -------
+    str
+        A SHA-256 hexadecimal digest.
+
+    Raises
+    ------
+    TypeError
+        If ``obj`` or one of its members has no stable content representation
+        (*e.g.* functions or Mitsuba objects).
+
+    Examples
+    --------
+    >>> fingerprint({"a": 1, "b": [1.0, "x"]}) == fingerprint({"b": [1.0, "x"], "a": 1})
+    True
+    >>> fingerprint(1) == fingerprint(1.0)
+    False
+    """
+    h = hashlib.sha256()
+    _fingerprint_update(h, obj, set())
+    return h.hexdigest()
+
+
+def _fingerprint_update(h, obj: t.Any, visiting: set) -> None:
+    # Feed the contents of obj to hash object h; visiting holds the IDs of the
+    # containers being processed, which is used to detect reference cycles
+
+    def put(tag: str, data: bytes = b"") -> None:
+        h.update(tag.encode())
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        put(type(obj).__name__, repr(obj).encode())
+        return
+
+    if isinstance(obj, bytes):
+        put("bytes", obj)
+        return
+
+    if isinstance(obj, enum.Enum):
+        put("enum", f"{fullname(type(obj))}.{obj.name}".encode())
+        return
+
+    if isinstance(obj, type):
+        put("type", fullname(obj).encode())
+        return
+
+    if isinstance(obj, Path):
+        put("path", str(obj).encode())
+        return
+
+    if isinstance(obj, (np.generic, np.ndarray)) and obj.dtype != object:
+        obj = np.ascontiguousarray(obj)
+        put("ndarray", f"{obj.dtype.str}{obj.shape}".encode())
+        h.update(obj.tobytes())
+        return
+
+    if inspect.isroutine(obj) or isinstance(obj, functools.partial):
+        raise TypeError(f"cannot fingerprint callable {obj!r}")
+
+    if id(obj) in visiting:
+        raise TypeError(f"cannot fingerprint self-referencing object {obj!r}")
+    visiting.add(id(obj))
+
+    try:
+        if isinstance(obj, pint.Quantity):
+            put("quantity", str(obj.units).encode())
+            _fingerprint_update(h, obj.magnitude, visiting)
+
+        elif isinstance(obj, np.ndarray):  # Object arrays
+            put("ndarray", f"object{obj.shape}".encode())
+            for x in obj.flat:
+                _fingerprint_update(h, x, visiting)
+
+        elif isinstance(obj, xr.DataArray):
+            put("xarray.DataArray")
+            _fingerprint_update(
+                h,
+                {
+                    "name": obj.name,
+                    "dims": obj.dims,
+                    "values": obj.values,
+                    "coords": {k: (v.dims, v.values) for k, v in obj.coords.items()},
+                    "attrs": obj.attrs,
+                },
+                visiting,
+            )
+
+        elif isinstance(obj, xr.Dataset):
+            put("xarray.Dataset")
+            _fingerprint_update(
+                h,
+                {
+                    "variables": {
+                        k: (v.dims, v.values, v.attrs) for k, v in obj.variables.items()
+                    },
+                    "coords": list(obj.coords),
+                    "attrs": obj.attrs,
+                },
+                visiting,
+            )
+
+        elif isinstance(obj, t.Mapping):
+            put("mapping", str(len(obj)).encode())
+            for k in sorted(obj, key=lambda x: (type(x).__name__, repr(x))):
+                _fingerprint_update(h, k, visiting)
+                _fingerprint_update(h, obj[k], visiting)
+
+        elif isinstance(obj, (list, tuple)):
+            put(type(obj).__name__, str(len(obj)).encode())
+            for x in obj:
+                _fingerprint_update(h, x, visiting)
+
+        elif isinstance(obj, (set, frozenset)):
+            put("set", "".join(sorted(fingerprint(x) for x in obj)).encode())
+
+        elif attrs.has(type(obj)):
+            put("attrs", fullname(type(obj)).encode())
+            for field in attrs.fields(type(obj)):
+                if field.init:
+                    put("field", field.name.encode())
+                    _fingerprint_update(h, getattr(obj, field.name), visiting)
+
+        elif hasattr(obj, "as_hashable"):
+            put("hashable", fullname(type(obj)).encode())
+            _fingerprint_update(h, obj.as_hashable, visiting)
+
+        else:
+            try:
+                data = pickle.dumps(obj, protocol=4)
+            except Exception as e:
+                raise TypeError(f"cannot fingerprint object {obj!r}") from e
+            put("pickle", data)
+
+    finally:
+        visiting.discard(id(obj))
+
+
 def flatten(d: t.Mapping, sep: str = ".", name: str = "") -> dict:
     """
     Flatten a nested dictionary.
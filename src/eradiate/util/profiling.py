@@ -0,0 +1,297 @@
+"""
+Lightweight, opt-in instrumentation of processing stages.
+
+Instrumented code regions are wrapped with the :func:`stage` context manager.
+Timings are only recorded while a profiler is active (see :func:`profile`);
+otherwise, :func:`stage` returns a shared no-op context manager and the
+overhead is limited to a global variable lookup.
+
+Examples
+--------
+>>> with eradiate.util.profiling.profile("profile.json") as profiler:
+...     result = eradiate.run(exp)
+>>> profiler.to_dataset()  # Per-stage timing statistics
+
+Notes
+-----
+* Stages executed in worker processes (*e.g.* when :func:`.mi_render` is
+  called with ``processes > 1``) are not recorded.
+* Peak resident set size (RSS) is queried with :func:`resource.getrusage` and
+  is not available on Windows.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import sys
+import threading
+import time
+import typing as t
+
+import numpy as np
+import xarray as xr
+
+from eradiate.typing import PathLike
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_ACTIVE: Profiler | None = None
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def peak_rss() -> int | None:
+    """
+    Return the peak resident set size of the current process.
+
+    Returns
+    -------
+    int or None
+        Peak RSS in bytes, or ``None`` if it cannot be queried on the current
+        platform.
+    """
+    if resource is None:
+        return None
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is expressed in bytes on macOS and in kibibytes elsewhere
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+class _Stage:
+    # Context manager timing a code region and reporting to a profiler
+
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: Profiler, name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profiler.record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Profiler:
+    """
+    A collector of per-stage timing statistics and peak memory usage.
+
+    Profilers are usually created and activated with :func:`profile`. Each
+    stage is identified by its name; repeated executions of a stage are
+    aggregated and the following statistics are recorded:
+
+    * ``count``: number of executions;
+    * ``total``, ``mean``, ``min``, ``max``: execution time statistics [s];
+    * ``peak_rss``: peak RSS of the process observed upon stage exit [B].
+
+    Recording is thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Maps stage names to [count, total, min, max, peak_rss]
+        self._stats: dict[str, list] = {}
+        self._start = time.perf_counter()
+        self._stop = None
+
+    def stage(self, name: str) -> t.ContextManager:
+        """
+        Return a context manager recording the execution time of the wrapped
+        code region under the stage ``name``.
+        """
+        return _Stage(self, name)
+
+    def record(self, name: str, duration: float) -> None:
+        """
+        Record an execution of the stage ``name``.
+
+        Parameters
+        ----------
+        name : str
+            Stage name.
+
+        duration : float
+            Execution time in seconds.
+        """
+        rss = peak_rss()
+
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                self._stats[name] = [1, duration, duration, duration, rss]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+                stats[2] = min(stats[2], duration)
+                stats[3] = max(stats[3], duration)
+                if rss is not None:
+                    stats[4] = rss if stats[4] is None else max(stats[4], rss)
+
+    def stop(self) -> None:
+        """
+        Stop the wall clock of this profiler. This is done automatically by
+        :func:`profile` upon exit.
+        """
+        if self._stop is None:
+            self._stop = time.perf_counter()
+
+    @property
+    def wall_time(self) -> float:
+        """
+        float: Time elapsed since the profiler was created [s]. If the profiler
+        is stopped, the time elapsed until it was stopped.
+        """
+        stop = self._stop if self._stop is not None else time.perf_counter()
+        return stop - self._start
+
+    @property
+    def stages(self) -> list[str]:
+        """
+        list of str: Names of the recorded stages, in order of first execution.
+        """
+        with self._lock:
+            return list(self._stats.keys())
+
+    def to_dict(self) -> dict:
+        """
+        Return the profiling report as a JSON-serializable dictionary.
+
+        Returns
+        -------
+        dict
+            A dictionary with the ``wall_time`` [s], ``peak_rss`` [B] and
+            ``stages`` entries. The latter maps stage names to their
+            statistics.
+        """
+        with self._lock:
+            stats = {name: list(values) for name, values in self._stats.items()}
+
+        return {
+            "wall_time": self.wall_time,
+            "peak_rss": peak_rss(),
+            "stages": {
+                name: {
+                    "count": count,
+                    "total": total,
+                    "mean": total / count,
+                    "min": min_,
+                    "max": max_,
+                    "peak_rss": rss,
+                }
+                for name, (count, total, min_, max_, rss) in stats.items()
+            },
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Return the profiling report as a JSON string. Keyword arguments are
+        forwarded to :func:`json.dumps`.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_dataset(self) -> xr.Dataset:
+        """
+        Return the profiling report as an xarray dataset indexed by stage name.
+        """
+        report = self.to_dict()
+        stages = report["stages"]
+        names = list(stages.keys())
+
+        def column(field, dtype):
+            return ("stage", np.array([stages[n][field] for n in names], dtype=dtype))
+
+        rss = [stages[n]["peak_rss"] for n in names]
+        data_vars = {
+            "count": column("count", np.int64),
+            "total": column("total", np.float64),
+            "mean": column("mean", np.float64),
+            "min": column("min", np.float64),
+            "max": column("max", np.float64),
+            "peak_rss": (
+                "stage",
+                np.array([np.nan if x is None else x for x in rss], dtype=np.float64),
+            ),
+        }
+
+        ds = xr.Dataset(data_vars, coords={"stage": ("stage", names)})
+        for var in ["total", "mean", "min", "max"]:
+            ds[var].attrs["units"] = "s"
+        ds["peak_rss"].attrs["units"] = "B"
+        ds.attrs["wall_time"] = report["wall_time"]
+        if report["peak_rss"] is not None:
+            ds.attrs["peak_rss"] = report["peak_rss"]
+
+        return ds
+
+    def save(self, filename: PathLike) -> None:
+        """
+        Write the profiling report to a JSON file.
+        """
+        with open(filename, "w") as f:
+            f.write(self.to_json(indent=2))
+
+
+def get_profiler() -> Profiler | None:
+    """
+    Return the active profiler, or ``None`` if profiling is disabled.
+    """
+    return _ACTIVE
+
+
+def stage(name: str) -> t.ContextManager:
+    """
+    Return a context manager recording the execution time of the wrapped code
+    region with the active profiler. If no profiler is active, a shared no-op
+    context manager is returned.
+
+    Parameters
+    ----------
+    name : str
+        Stage name.
+    """
+    profiler = _ACTIVE
+    return _NULL_STAGE if profiler is None else _Stage(profiler, name)
+
+
+@contextlib.contextmanager
+def profile(filename: PathLike | None = None) -> t.Generator[Profiler]:
+    """
+    Activate a new profiler for the duration of a ``with`` block.
+
+    Parameters
+    ----------
+    filename : path-like, optional
+        If set, the profiling report is written to this JSON file upon exit.
+
+    Yields
+    ------
+    Profiler
+        The active profiler.
+
+    Notes
+    -----
+    The profiler is global to the process: stages executed by other threads
+    are also recorded. Upon exit, the previously active profiler (if any) is
+    restored.
+    """
+    global _ACTIVE
+
+    previous = _ACTIVE
+    profiler = Profiler()
+    _ACTIVE = profiler
+
+    try:
+        yield profiler
+    finally:
+        _ACTIVE = previous
+        profiler.stop()
+        if filename is not None:
+            profiler.save(filename)
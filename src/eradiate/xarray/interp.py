@@ -66,45 +66,39 @@ def film_to_angular(
     else:
         azimuth_convention = frame.AzimuthConvention.convert(azimuth_convention)
 
-    # Map angular grid points to (x, y) space and interpolate film data accordingly
-    das = []
-    for ph in phi:
-        xs = np.empty_like(theta)
-        ys = np.empty_like(theta)
-
-        angles = np.array([[th, ph] for th in theta.ravel()])
-        directions = frame.angles_to_direction(angles)
-        film_coords = uniform_hemisphere_to_square(directions)
-        xs.ravel()[:] = film_coords[:, 0]
-        ys.ravel()[:] = film_coords[:, 1]
-
-        # Interpolate at target angular coordinates
-        x = xr.DataArray(xs, dims=theta_label)
-        y = xr.DataArray(ys, dims=theta_label)
-        interpolated = da.interp(**{x_label: x, y_label: y})
-
-        # Introduce theta as dimension coordinate
-        interpolated = interpolated.assign_coords({theta_label: theta})
-
-        # Drop non-dimension coordinates
-        interpolated = interpolated.drop_vars(
-            [name for name in da.coords if name not in interpolated.dims]
-        )
-
-        # Add phi as dimension coordinate (used later when concatenating)
-        interpolated = interpolated.expand_dims(
-            {
-                phi_label: [
-                    frame.transform_azimuth(ph, to_convention=azimuth_convention)
-                ]
-            },
-            axis=-1,
-        )
-        das.append(interpolated)
-
-    # Concatenate all azimuth slices
-    result = xr.concat(das, dim=phi_label)
-    return result
+    theta = np.asarray(theta, dtype=float).ravel()
+    phi = np.asarray(phi, dtype=float).ravel()
+    angular_dims = (theta_label, phi_label)
+
+    # Map the whole angular grid to (x, y) space at once
+    thetas, phis = np.meshgrid(theta, phi, indexing="ij")
+    angles = np.stack((thetas.ravel(), phis.ravel()), axis=-1)
+    directions = frame.angles_to_direction(angles)
+    film_coords = uniform_hemisphere_to_square(directions).reshape(
+        (theta.size, phi.size, 2)
+    )
+
+    # Interpolate film data at target coordinates in a single call: extra
+    # dimensions (e.g. spectral, Stokes) are broadcast
+    x = xr.DataArray(film_coords[..., 0], dims=angular_dims)
+    y = xr.DataArray(film_coords[..., 1], dims=angular_dims)
+    result = da.interp(**{x_label: x, y_label: y})
+
+    # Drop non-dimension coordinates (including film coordinates)
+    result = result.drop_vars(
+        [name for name in result.coords if name not in result.dims]
+    )
+
+    # Introduce theta and phi as dimension coordinates
+    result = result.assign_coords(
+        {
+            theta_label: theta,
+            phi_label: frame.transform_azimuth(phi, to_convention=azimuth_convention),
+        }
+    )
+
+    # Angular dimensions come last
+    return result.transpose(..., *angular_dims)
 
 
 def dataarray_to_rgb(
@@ -5,8 +5,13 @@ import pytest
 import xarray as xr
 
 import eradiate
-from eradiate.experiments import AtmosphereExperiment, EarthObservationExperiment
+from eradiate.experiments import (
+    AtmosphereExperiment,
+    EarthObservationExperiment,
+    ResultSink,
+)
 from eradiate.experiments._core import MeasureRegistry
+from eradiate.rng import SeedState
 from eradiate.scenes.core import SceneElement
 from eradiate.units import unit_registry as ureg
 
@@ -62,6 +67,43 @@ def test_contexts(mode_mono):
             assert ctx.active_sensors == sensors, f"{measures = }, {w = }"
 
 
+def test_spectral_grids_lazy(modes_all_double):
+    """
+    Check that spectral grids are selected upon first access and shared by
+    measures with identical SRFs.
+    """
+    exp = ConcreteEarthObservationExperiment(
+        measures=[
+            {
+                "type": "mdistant",
+                "id": f"mes{i}",
+                "srf": {"type": "delta", "wavelengths": w},
+            }
+            for i, w in enumerate([[440.0, 550.0], [440.0, 550.0], [660.0]])
+        ]
+    )
+    assert not exp._spectral_cache
+
+    spectral_grids = exp.spectral_grids
+    assert list(spectral_grids) == [0, 1, 2]
+    assert spectral_grids[0] is spectral_grids[1]
+    assert spectral_grids[2] is not spectral_grids[0]
+    with pytest.raises(KeyError):
+        spectral_grids[3]
+
+    ckd_quads = exp.ckd_quads
+    assert ckd_quads[0] is ckd_quads[1]
+    assert len(ckd_quads[0]) == (2 if eradiate.mode().is_ckd else 0)
+
+    # Spectral indices are generated in spectral loop order
+    sis = list(exp.spectral_indices(0))
+    ws = [si.w.m_as(ureg.nm) for si in sis]
+    assert ws == sorted(ws)
+    assert [si.as_hashable for si in exp.spectral_indices(1)] == [
+        si.as_hashable for si in sis
+    ]
+
+
 @pytest.fixture()
 def srf():
     return {"type": "delta", "wavelengths": [540, 550] * ureg.nm}
@@ -123,3 +165,142 @@ def test_run_function_multiple_times(mode_mono, atmosphere_experiment):
     result = eradiate.run(atmosphere_experiment, measures=1, spp=4)
     assert isinstance(result, xr.Dataset)
     assert len(atmosphere_experiment.results) == 2
+
+
+@pytest.mark.parametrize("format", ["netcdf", "zarr"])
+def test_run_sink(modes_all_double, tmp_path, format):
+    pytest.importorskip("dask")
+    if format == "zarr":
+        pytest.importorskip("zarr")
+
+    # Spectral results span several chunks; in CKD modes, SRF-weighted
+    # variables are evaluated from stored data
+    srf = (
+        {"type": "delta", "wavelengths": [500.0, 550.0, 600.0]}
+        if eradiate.mode().is_mono
+        else {"type": "uniform", "wmin": 500.0, "wmax": 560.0}
+    )
+    exp = AtmosphereExperiment(
+        atmosphere=None,
+        measures={"type": "mdistant", "id": "mdistant", "srf": srf},
+    )
+
+    expected = eradiate.run(exp, spp=4, seed_state=SeedState(0))
+
+    sink = ResultSink(tmp_path / f"results.{format}", chunk_size=2)
+    assert sink.format == format
+    result = eradiate.run(exp, spp=4, seed_state=SeedState(0), sink=sink)
+
+    # Results are lazily opened from the store
+    assert result.radiance.chunks is not None
+    assert set(result.data_vars) == set(expected.data_vars)
+    if eradiate.mode().is_ckd:
+        assert "radiance_srf" in result.data_vars
+    assert result.attrs["convention"] == "CF-1.10"
+    xr.testing.assert_allclose(
+        result.compute()[list(expected.data_vars)], expected, rtol=1e-6
+    )
+
+
+def test_init_kernel_dict_cache(mode_mono, tmp_path):
+    def make_experiment(**kwargs):
+        return AtmosphereExperiment(
+            atmosphere=None,
+            measures={"type": "mdistant", "id": "mdistant", "spp": 4},
+            **kwargs,
+        )
+
+    settings = eradiate.config.settings
+    settings.kernel_cache_path = tmp_path
+
+    try:
+        # First initialization populates the cache
+        exp_ref = make_experiment()
+        exp_ref.init()
+        assert len(list(tmp_path.glob("*.pickle"))) == 1
+
+        # Second initialization uses it and yields the same scene
+        exp = make_experiment()
+        exp.init()
+        assert len(list(tmp_path.glob("*.pickle"))) == 1
+        assert set(exp.mi_scene.parameters.keys()) == set(
+            exp_ref.mi_scene.parameters.keys()
+        )
+        assert {k: v.parameter_id for k, v in exp.mi_scene.umap_template.items()} == {
+            k: v.parameter_id for k, v in exp_ref.mi_scene.umap_template.items()
+        }
+
+        # A different scene specification is cached separately
+        exp = make_experiment(surface={"type": "lambertian", "reflectance": 0.1})
+        exp.init()
+        assert len(list(tmp_path.glob("*.pickle"))) == 2
+
+    finally:
+        settings.kernel_cache_path = None
+
+
+def test_init_kernel_dict_cache_atmosphere(
+    mode_mono, tmp_path, atmosphere_us_standard_mono
+):
+    # Kernel dictionaries embedding volume grids (heterogeneous atmospheres)
+    # are cached
+    def make_experiment():
+        return AtmosphereExperiment(
+            atmosphere=atmosphere_us_standard_mono,
+            measures={"type": "mdistant", "id": "mdistant", "spp": 4},
+        )
+
+    settings = eradiate.config.settings
+    settings.kernel_cache_path = tmp_path
+
+    try:
+        exp_ref = make_experiment()
+        exp_ref.init()
+        assert len(list(tmp_path.glob("*.pickle"))) == 1
+
+        exp = make_experiment()
+        exp.init()
+        assert len(list(tmp_path.glob("*.pickle"))) == 1
+        assert set(exp.mi_scene.parameters.keys()) == set(
+            exp_ref.mi_scene.parameters.keys()
+        )
+
+        # Both scenes render the same results
+        results = [
+            eradiate.run(x, seed_state=SeedState(0)).radiance.values
+            for x in [exp_ref, exp]
+        ]
+        np.testing.assert_array_equal(*results)
+
+    finally:
+        settings.kernel_cache_path = None
+
+
+def test_process_prefetch_radprops(mode_mono, atmosphere_us_standard_mono):
+    # Atmosphere radiative properties are precomputed for processed measures only
+    exp = AtmosphereExperiment(
+        atmosphere=atmosphere_us_standard_mono,
+        measures=[
+            {
+                "type": "mdistant",
+                "id": mes_id,
+                "spp": 1,
+                "srf": {"type": "delta", "wavelengths": w},
+            }
+            for mes_id, w in [("mes1", [550.0]), ("mes2", [550.0, 660.0])]
+        ],
+    )
+    exp.init()
+    (atmosphere,) = exp._prefetch_atmospheres
+    assert atmosphere._radprops_table is None
+
+    exp.process("mes1")
+    assert list(atmosphere._radprops_table.index) == [550.0]
+
+    # Tables are extended with the spectral indexes of subsequent measures
+    exp.process("mes2")
+    assert list(atmosphere._radprops_table.index) == [550.0, 660.0]
+
+    # Prefetching can be disabled
+    exp.init(prefetch=False)
+    assert not exp._prefetch_atmospheres
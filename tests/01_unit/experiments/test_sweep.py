@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+import eradiate
+from eradiate.experiments import AtmosphereExperiment, _core
+
+
+@pytest.fixture
+def exp():
+    return AtmosphereExperiment(
+        atmosphere=None,
+        surface={"type": "lambertian", "reflectance": 0.5},
+        measures={
+            "type": "mdistant",
+            "id": "measure",
+            "construct": "hplane",
+            "zeniths": [-60, -30, 0, 30, 60],
+            "azimuth": 0.0,
+            "srf": {"type": "delta", "wavelengths": 550.0},
+        },
+    )
+
+
+@pytest.fixture
+def count_loads(monkeypatch):
+    # Count kernel scene loads
+    counter = {"value": 0}
+    mi_load_dict = _core.mi_load_dict
+
+    def wrapper(*args, **kwargs):
+        counter["value"] += 1
+        return mi_load_dict(*args, **kwargs)
+
+    monkeypatch.setattr(_core, "mi_load_dict", wrapper)
+    return counter
+
+
+def test_run_sweep_parameter_update(mode_mono, exp, count_loads):
+    reflectances = [0.2, 0.5, 0.8]
+    result = eradiate.run_sweep(
+        exp,
+        [{"surface": {"type": "lambertian", "reflectance": r}} for r in reflectances],
+        dim="reflectance",
+        coords=reflectances,
+        spp=1,
+    )
+
+    # The kernel scene is loaded once, then updated
+    assert count_loads["value"] == 1
+
+    # Results are concatenated along the sweep dimension
+    assert isinstance(result, xr.Dataset)
+    np.testing.assert_array_equal(result.reflectance.values, reflectances)
+
+    # Without an atmosphere, the BRF is equal to the surface reflectance
+    brf = result.brf.squeeze()
+    np.testing.assert_allclose(
+        brf.transpose("reflectance", ...).values.reshape(3, -1).mean(axis=1),
+        reflectances,
+        rtol=1e-5,
+    )
+
+
+def test_run_sweep_structural(mode_mono, exp, count_loads):
+    result = eradiate.run_sweep(
+        exp,
+        [
+            {"surface": {"type": "lambertian", "reflectance": 0.5}},
+            {"surface": {"type": "rpv"}},
+        ],
+        spp=1,
+    )
+
+    # A change of surface type requires reloading the kernel scene
+    assert count_loads["value"] == 2
+    assert result.sizes["sweep"] == 2
+
+    # The base experiment is left untouched
+    assert exp.mi_scene is None
+    assert not exp.results
+    assert not exp.measures[0].mi_results
+
+
+def test_run_sweep_atmosphere(mode_mono, atmosphere_us_standard_mono):
+    exp = AtmosphereExperiment(
+        atmosphere=atmosphere_us_standard_mono,
+        surface={"type": "lambertian", "reflectance": 0.5},
+        measures={
+            "type": "mdistant",
+            "id": "measure",
+            "srf": {"type": "delta", "wavelengths": 550.0},
+        },
+    )
+    result = eradiate.run_sweep(
+        exp,
+        [{"surface": {"type": "lambertian", "reflectance": r}} for r in [0.2, 0.8]],
+        spp=1,
+    )
+    assert result.sizes["sweep"] == 2
+
+    # Neither the base experiment's measures nor its atmosphere are modified
+    assert not exp.measures[0].mi_results
+    assert exp.atmosphere._radprops_table is None
+
+
+def test_run_sweep_errors(mode_mono, exp):
+    with pytest.raises(ValueError):
+        eradiate.run_sweep(exp, [])
+
+    with pytest.raises(ValueError, match="coords has length"):
+        eradiate.run_sweep(exp, [{}, {}], coords=[0.0])
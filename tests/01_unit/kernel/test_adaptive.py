@@ -0,0 +1,53 @@
+import math
+
+import numpy as np
+import pytest
+
+from eradiate.kernel import AdaptiveSampling
+
+
+def test_adaptive_sampling_construct():
+    adaptive = AdaptiveSampling(target_rse="0.01", spp_max=1024.0)
+    assert adaptive.target_rse == 0.01
+    assert adaptive.spp_max == 1024
+
+    with pytest.raises(ValueError):
+        AdaptiveSampling(target_rse=0.0, spp_max=1024)
+    with pytest.raises(ValueError):
+        AdaptiveSampling(target_rse=0.01, spp_max=0)
+
+
+def test_relative_standard_error():
+    expectation = np.array([[1.0, 3.0]])
+    # Per-sample variances are 4 and 12
+    m2 = np.array([[5.0, 21.0]])
+    rse = AdaptiveSampling.relative_standard_error(expectation, m2, 4)
+    assert rse == pytest.approx(math.sqrt((1.0 + 3.0) / 2.0) / 2.0)
+
+    # Noiseless films, including dark ones, have a zero error
+    assert AdaptiveSampling.relative_standard_error(expectation, expectation**2, 4) == 0
+    zeros = np.zeros((1, 2))
+    assert AdaptiveSampling.relative_standard_error(zeros, zeros, 4) == 0.0
+    # Noisy films with a zero mean have an infinite relative error
+    assert AdaptiveSampling.relative_standard_error(zeros, m2, 4) == math.inf
+
+
+@pytest.mark.parametrize(
+    "spp_total, rse, expected",
+    [
+        (16, 0.005, 0),  # Target met
+        (16, 0.02, 48),  # 4 times more samples are required
+        (16, 0.011, 16),  # At least the first pass's sample count is rendered
+        (16, 1.0, 112),  # The maximum sample count is not exceeded
+        (128, 1.0, 0),  # The maximum sample count is reached
+    ],
+)
+def test_next_spp(spp_total, rse, expected):
+    adaptive = AdaptiveSampling(target_rse=0.01, spp_max=128)
+    assert adaptive.next_spp(spp_total, 16, rse) == expected
+
+
+def test_first_spp():
+    adaptive = AdaptiveSampling(target_rse=0.01, spp_max=128)
+    assert adaptive.first_spp(16) == 16
+    assert adaptive.first_spp(256) == 128
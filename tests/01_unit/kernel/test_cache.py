@@ -0,0 +1,96 @@
+import mitsuba as mi
+import numpy as np
+
+from eradiate.kernel import KernelDictCache, mi_load_dict
+
+
+def test_kernel_dict_cache(mode_mono, tmp_path):
+    cache = KernelDictCache(tmp_path / "cache")
+    kdict = {
+        "type": "scene",
+        "disk": {
+            "type": "disk",
+            "to_world": mi.ScalarTransform4f().scale(2.0),
+            "bsdf": {
+                "type": "diffuse",
+                "reflectance": {"type": "uniform", "value": 0.5},
+            },
+        },
+    }
+    parameter_ids = {"bsdf.reflectance.value": "disk.bsdf.reflectance.value"}
+
+    # Keys are stable
+    key = cache.key({"spec": [1, 2, 3]})
+    assert key == cache.key({"spec": [1, 2, 3]})
+    assert key != cache.key({"spec": [1, 2, 4]})
+    assert cache.key({"spec": lambda x: x}) is None
+
+    # Missing entries are reported
+    assert cache.load(key) is None
+
+    # Entries are restored, including transforms
+    assert cache.save(key, kdict, parameter_ids)
+    kdict_cached, parameter_ids_cached = cache.load(key)
+    assert parameter_ids_cached == parameter_ids
+    np.testing.assert_allclose(
+        np.array(kdict_cached["disk"]["to_world"].matrix),
+        np.array(kdict["disk"]["to_world"].matrix),
+    )
+    assert mi.load_dict(kdict_cached) is not None
+
+    # Kernel dictionaries holding Mitsuba objects cannot be cached
+    assert not cache.save("instance", {"bsdf": mi.load_dict({"type": "diffuse"})}, {})
+
+    cache.clear()
+    assert cache.load(key) is None
+
+
+def test_kernel_dict_cache_objects(mode_mono, tmp_path):
+    # Volume grids, meshes and objects loaded with mi_load_dict() are cached
+    cache = KernelDictCache(tmp_path / "cache")
+    grid = np.arange(6, dtype=np.float32).reshape((6, 1, 1))
+
+    props = mi.Properties()
+    props["mesh_bsdf"] = mi_load_dict({"type": "diffuse", "reflectance": 0.2})
+    mesh = mi.Mesh(
+        name="mesh",
+        face_count=1,
+        vertex_count=3,
+        has_vertex_normals=False,
+        has_vertex_texcoords=False,
+        props=props,
+    )
+    mesh_params = mi.traverse(mesh)
+    mesh_params["vertex_positions"] = np.array(
+        [0, 0, 0, 1, 0, 0, 0, 1, 0], dtype=np.float32
+    )
+    mesh_params["faces"] = np.array([0, 1, 2], dtype=np.uint32)
+    mesh_params.update()
+
+    kdict = {
+        "type": "scene",
+        "medium": {
+            "type": "heterogeneous",
+            "albedo": {"type": "gridvolume", "grid": mi.VolumeGrid(grid)},
+        },
+        "mesh": mesh,
+        "bsdf": mi_load_dict({"type": "diffuse", "reflectance": 0.5}),
+    }
+    assert cache.save("objects", kdict, {})
+    kdict_cached, _ = cache.load("objects")
+
+    np.testing.assert_array_equal(
+        np.array(kdict_cached["medium"]["albedo"]["grid"]).squeeze(), grid.squeeze()
+    )
+    mesh_cached = kdict_cached["mesh"]
+    assert mesh_cached.id() == "mesh"
+    np.testing.assert_array_equal(
+        np.array(mi.traverse(mesh_cached)["vertex_positions"]),
+        np.array(mesh_params["vertex_positions"]),
+    )
+    np.testing.assert_allclose(
+        np.array(mi.traverse(mesh_cached.bsdf())["reflectance.value"]), 0.2
+    )
+    np.testing.assert_allclose(
+        np.array(mi.traverse(kdict_cached["bsdf"])["reflectance.value"]), 0.5
+    )
@@ -0,0 +1,52 @@
+import mitsuba as mi
+import numpy as np
+import pytest
+
+from eradiate.kernel import RenderCheckpoint
+
+
+def test_render_checkpoint(mode_mono, tmp_path):
+    checkpoint = RenderCheckpoint(tmp_path / "checkpoint", interval=2)
+    bitmap = mi.Bitmap(np.full((2, 3, 1), 0.5, dtype=np.float32))
+    seeds = {"sensor": 1}
+
+    assert len(checkpoint) == 0
+    assert not checkpoint.contains(550.0, seeds, 16)
+
+    # Entries are written every 2 contexts
+    checkpoint.add(550.0, {"sensor": bitmap}, seeds, 16)
+    assert not list(checkpoint.path.glob("*.npz"))
+    checkpoint.add(560.0, {"sensor": bitmap}, seeds, 16)
+    assert len(list(checkpoint.path.glob("*.npz"))) == 1
+
+    # Pending entries are written upon flush
+    checkpoint.add((570.0, 0.5), {"sensor": bitmap}, seeds, 16)
+    checkpoint.flush()
+
+    # Entries are read back by a new instance
+    restored = RenderCheckpoint(checkpoint.path)
+    assert len(restored) == 3
+    assert restored.contains(550.0, seeds, 16)
+    assert restored.contains((570.0, 0.5), seeds, 16)
+
+    # Entries are identified by seed, sample count and sensor
+    assert not restored.contains(550.0, {"sensor": 2}, 16)
+    assert not restored.contains(550.0, seeds, 32)
+    assert not restored.contains(550.0, {"sensor": 1, "other": 1}, 16)
+
+    result = restored.load((570.0, 0.5), seeds, 16)["sensor"]
+    assert isinstance(result, mi.Bitmap)
+    assert result.pixel_format() == bitmap.pixel_format()
+    np.testing.assert_array_equal(np.array(result), np.array(bitmap))
+
+    with pytest.raises(KeyError):
+        restored.load(580.0, seeds, 16)
+
+    restored.clear()
+    assert len(restored) == 0
+    assert not list(checkpoint.path.glob("*.npz"))
+
+
+def test_render_checkpoint_interval(tmp_path):
+    with pytest.raises(ValueError):
+        RenderCheckpoint(tmp_path, interval=0)
@@ -2,6 +2,7 @@ import re
 
 import pytest
 
+from eradiate.contexts import KernelContext
 from eradiate.kernel import (
     DictParameter,
     KernelDict,
@@ -9,6 +10,7 @@ from eradiate.kernel import (
     KernelSceneParameterMap,
     SceneParameter,
 )
+from eradiate.spectral import SpectralIndex
 
 
 def test_kernel_dict_init():
@@ -63,3 +65,46 @@ def test_scene_parameter_map_render():
     result = kpmap.render(ctx=1, flags=KernelSceneParameterFlags.SPECTRAL, drop=True)
     assert result["baz"] == 1
     assert "bar" not in result
+
+
+def test_scene_parameter_map_render_incremental(mode_ckd):
+    evaluated = []
+
+    def make_func(name):
+        def f(ctx):
+            evaluated.append(name)
+            return ctx.si.as_hashable
+
+        return f
+
+    kpmap = KernelSceneParameterMap(
+        {
+            name: SceneParameter(make_func(name), spectral_dependency=name)
+            for name in ["none", "bin", "index"]
+        }
+    )
+    kwargs = {}
+    ctxs = [
+        KernelContext(si=SpectralIndex.new(w=w, g=g), kwargs=kwargs)
+        for w, g in [(550.0, 0.1), (550.0, 0.5), (650.0, 0.5)]
+    ]
+
+    # Parameters are skipped when the spectral index does not change at their
+    # granularity
+    assert set(kpmap.render(ctxs[0], incremental=True)) == {"none", "bin", "index"}
+    assert set(kpmap.render(ctxs[1], incremental=True)) == {"index"}
+    assert set(kpmap.render(ctxs[2], incremental=True)) == {"bin", "index"}
+    assert kpmap.update_stats == {"evaluated": 6, "skipped": 3}
+    assert evaluated.count("none") == 1
+
+    # Non-incremental renders evaluate everything
+    assert set(kpmap.render(ctxs[2])) == {"none", "bin", "index"}
+
+    # A change of context keyword arguments invalidates all parameters
+    ctx = ctxs[2].evolve(kwargs={"foo": 0})
+    assert set(kpmap.render(ctx, incremental=True)) == {"none", "bin", "index"}
+
+    # Resetting forgets previous evaluations
+    kpmap.reset_incremental()
+    assert kpmap.update_stats == {"evaluated": 0, "skipped": 0}
+    assert set(kpmap.render(ctxs[2], incremental=True)) == {"none", "bin", "index"}
@@ -1,18 +1,26 @@
+import warnings
+
 import mitsuba as mi
 import numpy as np
 import pytest
 
+import eradiate
 from eradiate import KernelContext
 from eradiate.kernel import (
+    AdaptiveSampling,
+    KernelDict,
     KernelSceneParameterFlags,
     KernelSceneParameterMap,
     MitsubaObjectWrapper,
+    RenderCheckpoint,
     SceneParameter,
     SearchSceneParameter,
     mi_load_dict,
     mi_render,
     mi_traverse,
 )
+from eradiate.kernel._render import _context_batches
+from eradiate.rng import SeedState
 from eradiate.spectral.index import SpectralIndex
 from eradiate.units import unit_registry as ureg
 
@@ -332,3 +340,417 @@ class TestMiRender:
                 isinstance(result[spectral_key][sensor_key], mi.Bitmap)
                 for sensor_key in sensor_keys
             )
+
+    def test_processes(self, modes_all_single):
+        # The partially occluded target makes results seed-dependent
+        kdict_template = KernelDict(
+            {
+                "type": "scene",
+                "rectangle": {
+                    "type": "arectangle",
+                    "bsdf": {"type": "diffuse", "id": "my_bsdf"},
+                },
+                "disk": {
+                    "type": "disk",
+                    "to_world": mi.ScalarTransform4f()
+                    .translate([0, 0, 0.1])
+                    .scale(0.5),
+                    "bsdf": {"type": "diffuse", "reflectance": 0.2},
+                },
+                "sensor": {
+                    "type": "distant",
+                    "film": {"type": "hdrfilm", "width": 1, "height": 1},
+                    "direction": [0, 0, -1],
+                    "target": {"type": "rectangle"},
+                },
+                "illumination": {
+                    "type": "directional",
+                    "direction": [0, 0, -1],
+                    "irradiance": 1.0,
+                },
+                "integrator": {"type": "path"},
+            }
+        )
+
+        umap_template = KernelSceneParameterMap(
+            {
+                "my_bsdf.reflectance.value": SceneParameter(
+                    func=lambda ctx: ctx.kwargs["r"],
+                    flags=KernelSceneParameterFlags.ALL,
+                    search=SearchSceneParameter(
+                        node_type=mi.BSDF,
+                        node_id="my_bsdf",
+                        parameter_relpath="reflectance.value",
+                    ),
+                )
+            }
+        )
+
+        ctx_init = KernelContext()
+        mi_wrapper = mi_traverse(
+            mi_load_dict(kdict_template.render(ctx_init)), umap_template
+        )
+        if eradiate.mode().is_ckd:
+            # Contexts are dispatched to workers by bin
+            sis = [
+                SpectralIndex.new(w=w, g=g)
+                for (w, g) in zip(
+                    [500.0, 500.0, 500.0, 600.0, 600.0] * ureg.nm,
+                    [0.0, 0.5, 1.0, 0.0, 1.0],
+                )
+            ]
+            assert _context_batches([KernelContext(si=si) for si in sis]) == [
+                [0, 1, 2],
+                [3, 4],
+            ]
+        else:
+            sis = [
+                SpectralIndex.new(w=w)
+                for w in [400.0, 500.0, 600.0, 700.0, 800.0] * ureg.nm
+            ]
+        ctxs = [
+            KernelContext(si=si, kwargs={"r": r})
+            for (r, si) in zip([0.0, 0.25, 0.5, 0.75, 1.0], sis)
+        ]
+
+        # Without a template, the scene cannot be reloaded by workers
+        with pytest.raises(ValueError):
+            mi_render(mi_wrapper, ctxs, processes=2)
+
+        mi_wrapper.kdict_template = kdict_template
+        mi_wrapper.ctx_init = ctx_init
+
+        expected = mi_render(mi_wrapper, ctxs, spp=16, seed_state=SeedState(0))
+        result = mi_render(
+            mi_wrapper, ctxs, spp=16, seed_state=SeedState(0), processes=2
+        )
+
+        # Results are bit-identical to the sequential path, and in the same order
+        assert list(result.keys()) == list(expected.keys())
+        for siah in expected:
+            assert isinstance(result[siah]["sensor"], mi.Bitmap)
+            np.testing.assert_array_equal(
+                np.array(result[siah]["sensor"]), np.array(expected[siah]["sensor"])
+            )
+
+    def test_processes_after_parallel_load(self, mode_mono):
+        # Workers are forked after the kernel thread pool was started by a
+        # parallel scene load and a render in the parent process
+        kdict_template = KernelDict(
+            {
+                "type": "scene",
+                "rectangle": {
+                    "type": "arectangle",
+                    "bsdf": {"type": "diffuse", "id": "my_bsdf"},
+                },
+                "sensor": {
+                    "type": "distant",
+                    "film": {"type": "hdrfilm", "width": 4, "height": 4},
+                    "direction": [0, 0, -1],
+                    "target": [0, 0, 0],
+                },
+                "illumination": {
+                    "type": "directional",
+                    "direction": [0, 0, -1],
+                    "irradiance": 1.0,
+                },
+                "integrator": {"type": "path"},
+            }
+        )
+        umap_template = KernelSceneParameterMap(
+            {
+                "my_bsdf.reflectance.value": SceneParameter(
+                    func=lambda ctx: ctx.kwargs["r"],
+                    flags=KernelSceneParameterFlags.ALL,
+                    search=SearchSceneParameter(
+                        node_type=mi.BSDF,
+                        node_id="my_bsdf",
+                        parameter_relpath="reflectance.value",
+                    ),
+                )
+            }
+        )
+        ctx_init = KernelContext()
+        mi_wrapper = mi_traverse(
+            mi_load_dict(kdict_template.render(ctx_init), parallel=True),
+            umap_template,
+        )
+        mi_wrapper.kdict_template = kdict_template
+        mi_wrapper.ctx_init = ctx_init
+        ctxs = [
+            KernelContext(si=SpectralIndex.new(w=w), kwargs={"r": r})
+            for (r, w) in zip([0.2, 0.5, 0.8], [400.0, 500.0, 600.0] * ureg.nm)
+        ]
+
+        expected = mi_render(mi_wrapper, ctxs, spp=4, seed_state=SeedState(0))
+
+        # Consecutive worker pools are forked from the same parent process
+        for _ in range(2):
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", DeprecationWarning)
+                result = mi_render(
+                    mi_wrapper, ctxs, spp=4, seed_state=SeedState(0), processes=2
+                )
+
+            for siah in expected:
+                np.testing.assert_array_equal(
+                    np.array(result[siah]["sensor"]),
+                    np.array(expected[siah]["sensor"]),
+                )
+
+    def test_prefetch(self, mode_mono):
+        kdict_template = KernelDict(
+            {
+                "type": "scene",
+                "rectangle": {
+                    "type": "arectangle",
+                    "bsdf": {"type": "diffuse", "id": "my_bsdf"},
+                },
+                "sensor": {
+                    "type": "distant",
+                    "film": {"type": "hdrfilm", "width": 1, "height": 1},
+                    "direction": [0, 0, -1],
+                    "target": [0, 0, 0],
+                },
+                "illumination": {
+                    "type": "directional",
+                    "direction": [0, 0, -1],
+                    "irradiance": 1.0,
+                },
+                "integrator": {"type": "path"},
+            }
+        )
+
+        def reflectance(ctx):
+            r = ctx.kwargs["r"]
+            if r < 0.0:
+                raise ValueError("negative reflectance")
+            return r
+
+        umap_template = KernelSceneParameterMap(
+            {
+                "my_bsdf.reflectance.value": SceneParameter(
+                    func=reflectance,
+                    flags=KernelSceneParameterFlags.ALL,
+                    search=SearchSceneParameter(
+                        node_type=mi.BSDF,
+                        node_id="my_bsdf",
+                        parameter_relpath="reflectance.value",
+                    ),
+                )
+            }
+        )
+
+        mi_wrapper = mi_traverse(
+            mi_load_dict(kdict_template.render(KernelContext())), umap_template
+        )
+        ctxs = [
+            KernelContext(si=SpectralIndex.new(w=w), kwargs={"r": r})
+            for (r, w) in zip(
+                [0.0, 0.25, 0.5, 0.75, 1.0],
+                [400.0, 500.0, 600.0, 700.0, 800.0] * ureg.nm,
+            )
+        ]
+
+        expected = mi_render(mi_wrapper, ctxs, seed_state=SeedState(0))
+        expected_stats = dict(umap_template.update_stats)
+
+        # Prefetched updates are applied in context order, whatever the depth
+        for prefetch in [1, 2, 10]:
+            result = mi_render(
+                mi_wrapper, ctxs, seed_state=SeedState(0), prefetch=prefetch
+            )
+            assert list(result.keys()) == list(expected.keys())
+            for siah in expected:
+                np.testing.assert_array_equal(
+                    np.array(result[siah]["sensor"]),
+                    np.array(expected[siah]["sensor"]),
+                )
+            assert umap_template.update_stats == expected_stats
+
+        # Exceptions raised by the prefetch thread are propagated
+        ctxs[3] = KernelContext(si=ctxs[3].si, kwargs={"r": -1.0})
+        with pytest.raises(ValueError, match="negative reflectance"):
+            mi_render(mi_wrapper, ctxs, prefetch=2)
+
+    def test_checkpoint(self, mode_mono, tmp_path):
+        mi_scene = mi_load_dict(
+            {
+                "type": "scene",
+                "rectangle": {
+                    "type": "arectangle",
+                    "bsdf": {"type": "diffuse", "id": "my_bsdf"},
+                },
+                "sensor": {
+                    "type": "distant",
+                    "film": {"type": "hdrfilm", "width": 1, "height": 1},
+                    "direction": [0, 0, -1],
+                    "target": [0, 0, 0],
+                },
+                "illumination": {
+                    "type": "directional",
+                    "direction": [0, 0, -1],
+                    "irradiance": 1.0,
+                },
+                "integrator": {"type": "path"},
+            }
+        )
+
+        rendered = []
+
+        def reflectance(ctx):
+            rendered.append(ctx.kwargs["r"])
+            return ctx.kwargs["r"]
+
+        umap_template = KernelSceneParameterMap(
+            {
+                "my_bsdf.reflectance.value": SceneParameter(
+                    func=reflectance,
+                    flags=KernelSceneParameterFlags.ALL,
+                    search=SearchSceneParameter(
+                        node_type=mi.BSDF,
+                        node_id="my_bsdf",
+                        parameter_relpath="reflectance.value",
+                    ),
+                )
+            }
+        )
+        mi_wrapper = mi_traverse(mi_scene, umap_template)
+        ctxs = [
+            KernelContext(si=SpectralIndex.new(w=w), kwargs={"r": r})
+            for (r, w) in zip(
+                [0.0, 0.25, 0.5, 0.75], [400.0, 500.0, 600.0, 700.0] * ureg.nm
+            )
+        ]
+        expected = mi_render(mi_wrapper, ctxs, seed_state=SeedState(0))
+
+        # Simulate an interruption after the first and third contexts
+        checkpoint = RenderCheckpoint(tmp_path / "checkpoint", interval=2)
+        mi_render(mi_wrapper, ctxs[:1], seed_state=SeedState(0), checkpoint=checkpoint)
+        seed_state = SeedState(0)
+        seed_state.next(2)
+        mi_render(mi_wrapper, ctxs[2:3], seed_state=seed_state, checkpoint=checkpoint)
+
+        # Only missing contexts are rendered upon resume, and results are
+        # passed to the callback in context order
+        rendered.clear()
+        collected = []
+        mi_render(
+            mi_wrapper,
+            ctxs,
+            seed_state=SeedState(0),
+            checkpoint=tmp_path / "checkpoint",
+            callback=lambda ctx, bitmaps: collected.append((ctx, bitmaps)),
+        )
+        assert rendered == [0.25, 0.75]
+        assert [ctx for ctx, _ in collected] == ctxs
+        for ctx, bitmaps in collected:
+            np.testing.assert_array_equal(
+                np.array(bitmaps["sensor"]),
+                np.array(expected[ctx.si.as_hashable]["sensor"]),
+            )
+
+        # All contexts are now stored
+        rendered.clear()
+        mi_render(mi_wrapper, ctxs, seed_state=SeedState(0), checkpoint=checkpoint)
+        assert rendered == []
+
+    def test_adaptive(self, mode_mono, tmp_path):
+        def scene(integrator):
+            return mi_load_dict(
+                {
+                    "type": "scene",
+                    "rectangle": {
+                        "type": "arectangle",
+                        "bsdf": {"type": "diffuse", "id": "my_bsdf"},
+                    },
+                    "sensor": {
+                        "type": "distant",
+                        "film": {"type": "hdrfilm", "width": 2, "height": 2},
+                        "direction": [0, 0, -1],
+                        "target": [0, 0, 0],
+                    },
+                    "illumination": {"type": "constant", "radiance": 1.0},
+                    "integrator": integrator,
+                }
+            )
+
+        umap_template = KernelSceneParameterMap(
+            {
+                "my_bsdf.reflectance.value": SceneParameter(
+                    func=lambda ctx: ctx.kwargs["r"],
+                    flags=KernelSceneParameterFlags.ALL,
+                    search=SearchSceneParameter(
+                        node_type=mi.BSDF,
+                        node_id="my_bsdf",
+                        parameter_relpath="reflectance.value",
+                    ),
+                )
+            }
+        )
+        mi_wrapper = mi_traverse(
+            scene({"type": "moment", "nested": {"type": "path"}}), umap_template
+        )
+        # The dark context has no noise
+        ctxs = [
+            KernelContext(si=SpectralIndex.new(w=w), kwargs={"r": r})
+            for (r, w) in zip([0.0, 0.5], [400.0, 500.0] * ureg.nm)
+        ]
+
+        def render(adaptive):
+            collected = {}
+            mi_render(
+                mi_wrapper,
+                ctxs,
+                spp=4,
+                seed_state=SeedState(0),
+                adaptive=adaptive,
+                callback=lambda ctx, bitmaps, sample_counts: collected.update(
+                    {ctx.si.as_hashable: (bitmaps, sample_counts)}
+                ),
+            )
+            return collected
+
+        # A loose target is met after the first pass: results are those of a
+        # fixed sample count
+        expected = mi_render(mi_wrapper, ctxs, spp=4, seed_state=SeedState(0))
+        result = render(AdaptiveSampling(target_rse=100.0, spp_max=64))
+        for siah, (bitmaps, sample_counts) in result.items():
+            assert sample_counts == {"sensor": 4}
+            np.testing.assert_array_equal(
+                np.array(bitmaps["sensor"]), np.array(expected[siah]["sensor"])
+            )
+
+        # A tight target stops at the maximum sample count, except for the
+        # dark context
+        result = render(AdaptiveSampling(target_rse=1e-6, spp_max=64))
+        assert result[400.0][1] == {"sensor": 4}
+        assert result[500.0][1] == {"sensor": 64}
+        expectation, m2 = AdaptiveSampling.moments(result[500.0][0]["sensor"])
+        assert np.all(expectation > 0.0)
+        assert np.all(m2 >= expectation * expectation * (1.0 - 1e-5))
+
+        # Results are deterministic
+        for siah, (bitmaps, _) in render(
+            AdaptiveSampling(target_rse=1e-6, spp_max=64)
+        ).items():
+            np.testing.assert_array_equal(
+                np.array(bitmaps["sensor"]), np.array(result[siah][0]["sensor"])
+            )
+
+        # Second moment data is required
+        with pytest.raises(ValueError, match="moment integrator"):
+            mi_render(
+                mi_traverse(scene({"type": "path"}), umap_template),
+                ctxs,
+                adaptive=AdaptiveSampling(target_rse=0.01, spp_max=64),
+            )
+
+        # Checkpoints are not supported
+        with pytest.raises(ValueError, match="checkpoints"):
+            mi_render(
+                mi_wrapper,
+                ctxs,
+                adaptive=AdaptiveSampling(target_rse=0.01, spp_max=64),
+                checkpoint=tmp_path / "checkpoint",
+            )
@@ -0,0 +1,45 @@
+import pytest
+
+from eradiate.pipelines.definitions import (
+    build_pipeline,
+    compile_pipeline,
+    compile_pipeline_cache_clear,
+    compile_pipeline_cache_info,
+)
+
+
+@pytest.fixture
+def config():
+    return {
+        "mode_id": "mono",
+        "measure_distant": True,
+        "add_viewing_angles": True,
+        "var_name": "radiance",
+        "var_metadata": {"standard_name": "radiance", "long_name": "radiance"},
+        "apply_spectral_response": False,
+        "calculate_variance": False,
+        "calculate_stokes": False,
+    }
+
+
+def test_compile_pipeline(config):
+    compile_pipeline_cache_clear()
+
+    # Compiled plan has the same structure as the built pipeline
+    compiled = compile_pipeline(config)
+    pipeline = build_pipeline(config)
+    assert compiled.list_nodes() == [
+        x for x in pipeline.list_nodes() if not pipeline.is_virtual_input(x)
+    ]
+    assert compiled.get_virtual_inputs() == pipeline.get_virtual_inputs()
+    assert compiled.get_nodes_by_metadata(
+        final=True, kind="data"
+    ) == pipeline.get_nodes_by_metadata(final=True, kind="data")
+
+    # Equal configurations share the same plan
+    assert compile_pipeline(dict(config)) is compiled
+    assert compile_pipeline_cache_info().hits == 1
+
+    # Different configurations get a different plan
+    assert compile_pipeline({**config, "calculate_variance": True}) is not compiled
+    assert compile_pipeline_cache_info().currsize == 2
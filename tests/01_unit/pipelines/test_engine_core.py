@@ -1,8 +1,12 @@
 """Tests for core pipeline functionality."""
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from eradiate.pipelines.engine import Pipeline
+from eradiate.pipelines.engine import Pipeline, PipelineMemo
 
 # ------------------------------------------------------------------------------
 #                                 Shared fixtures
@@ -766,3 +770,201 @@ class TestExecutionContext:
         assert "c" in active
         assert "d" in active
         assert inactive == set()
+
+
+class TestConcurrentExecution:
+    """Tests for pipeline execution with an executor."""
+
+    def test_results_match_serial(self):
+        """Concurrent execution produces the same outputs as serial execution."""
+        p = Pipeline()
+        p.add_node("b", lambda a: a + 1, dependencies=["a"])
+        p.add_node("c", lambda a: a * 2, dependencies=["a"])
+        p.add_node("d", lambda b, c: b + c, dependencies=["b", "c"])
+        expected = p.execute(outputs=["d"], inputs={"a": 3})
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = p.execute(outputs=["d"], inputs={"a": 3}, executor=executor)
+
+        assert result == expected
+
+    def test_dependencies_respected(self):
+        """A node only starts once all its dependencies have completed."""
+        finished = []
+        lock = threading.Lock()
+
+        def make(name, delay):
+            def f(**kwargs):
+                time.sleep(delay)
+                with lock:
+                    finished.append(name)
+                return name
+
+            return f
+
+        p = Pipeline()
+        p.add_node("a", make("a", 0.0))
+        p.add_node("b", make("b", 0.05), dependencies=["a"])
+        p.add_node("c", make("c", 0.0), dependencies=["a"])
+        p.add_node("d", make("d", 0.0), dependencies=["b", "c"])
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            p.execute(outputs=["d"], executor=executor)
+
+        assert finished[0] == "a"
+        assert finished[-1] == "d"
+        assert set(finished[1:3]) == {"b", "c"}
+
+    def test_exception_propagates(self):
+        """Exceptions raised by a node are propagated to the caller."""
+
+        def fail(a):
+            raise ValueError("boom")
+
+        p = Pipeline()
+        p.add_node("a", lambda: 1)
+        p.add_node("b", fail, dependencies=["a"])
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with pytest.raises(ValueError, match="boom"):
+                p.execute(outputs=["b"], executor=executor)
+
+    def test_bypassed_ancestors_not_executed(self):
+        """Ancestors of a bypassed node are not executed."""
+        calls = []
+        p = Pipeline()
+        p.add_node("a", lambda: calls.append("a") or 1)
+        p.add_node("b", lambda a: a + 1, dependencies=["a"])
+        p.add_node("c", lambda b: b + 1, dependencies=["b"])
+
+        assert p.execute(outputs=["c"], inputs={"b": 10}) == {"c": 11}
+        assert calls == []
+
+
+class TestPipelineMemo:
+    """Tests for node output memoization."""
+
+    @pytest.fixture
+    def counted(self):
+        calls = []
+
+        def build():
+            p = Pipeline()
+            p.add_node("x", lambda s: calls.append("x") or s * 2, dependencies=["s"])
+            p.add_node(
+                "y",
+                lambda x: calls.append("y") or x + 1,
+                dependencies=["x"],
+                memoize=True,
+            )
+            p.add_node("z", lambda y, t: y + t, dependencies=["y", "t"])
+            return p
+
+        return calls, build
+
+    def test_memo_hit_skips_ancestors(self, counted):
+        """A memo hit skips the memoized node and its ancestors."""
+        calls, build = counted
+        memo = PipelineMemo()
+
+        assert build().execute(["z"], inputs={"s": 1, "t": 0}, memo=memo) == {"z": 3}
+        assert calls == ["x", "y"]
+
+        # Different pipeline instance, same upstream inputs
+        assert build().execute(["z"], inputs={"s": 1, "t": 1}, memo=memo) == {"z": 4}
+        assert calls == ["x", "y"]
+        assert memo.info().hits == 1
+
+    def test_memo_miss_on_different_inputs(self, counted):
+        """Changing an upstream value triggers recomputation."""
+        calls, build = counted
+        memo = PipelineMemo()
+
+        build().execute(["z"], inputs={"s": 1, "t": 0}, memo=memo)
+        assert build().execute(["z"], inputs={"s": 2, "t": 0}, memo=memo) == {"z": 5}
+        assert calls == ["x", "y", "x", "y"]
+
+    def test_unfingerprintable_input_disables_memo(self):
+        """Nodes depending on values which cannot be fingerprinted are not memoized."""
+        calls = []
+        memo = PipelineMemo()
+
+        def build():
+            p = Pipeline()
+            p.add_node(
+                "y",
+                lambda f: calls.append("y") or f(),
+                dependencies=["f"],
+                memoize=True,
+            )
+            return p
+
+        build().execute(["y"], inputs={"f": lambda: 1}, memo=memo)
+        build().execute(["y"], inputs={"f": lambda: 1}, memo=memo)
+        assert calls == ["y", "y"]
+        assert memo.info().currsize == 0
+
+    def test_no_memo(self, counted):
+        """Without a memo, memoizable nodes are always executed."""
+        calls, build = counted
+        build().execute(["z"], inputs={"s": 1, "t": 0})
+        build().execute(["z"], inputs={"s": 1, "t": 0})
+        assert calls == ["x", "y", "x", "y"]
+
+
+class TestCompiledPipeline:
+    """Tests for compiled pipelines."""
+
+    @pytest.fixture
+    def compiled(self):
+        p = Pipeline()
+        p.add_node("b", lambda a: a + 1, dependencies=["a"])
+        p.add_node("c", lambda a: a * 2, dependencies=["a"])
+        p.add_node("d", lambda b, c: b + c, dependencies=["b", "c"])
+        return p.compile()
+
+    def test_structure(self, compiled):
+        """Nodes are stored in topological order."""
+        assert compiled.list_nodes()[-1] == "d"
+        assert set(compiled.list_nodes()) == {"b", "c", "d"}
+        assert compiled.get_virtual_inputs() == ["a"]
+
+    def test_execute(self, compiled):
+        """Compiled pipelines produce the same results as the source pipeline."""
+        assert compiled.execute(inputs={"a": 3}) == {"d": 10}
+        assert compiled.execute(outputs=["b", "c"], inputs={"a": 1}) == {
+            "b": 2,
+            "c": 2,
+        }
+
+    def test_execute_bypass(self, compiled):
+        """Bypassed nodes are not executed, nor are their exclusive ancestors."""
+        assert compiled.execute(outputs=["b"], inputs={"b": 5}) == {"b": 5}
+
+    def test_execute_concurrent(self, compiled):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert compiled.execute(inputs={"a": 3}, executor=executor) == {"d": 10}
+
+    def test_execute_errors(self, compiled):
+        with pytest.raises(ValueError, match="Missing required virtual inputs"):
+            compiled.execute(outputs=["d"])
+        with pytest.raises(ValueError, match="not found"):
+            compiled.execute(outputs=["z"], inputs={"a": 1})
+        with pytest.raises(ValueError, match="neither a node nor a virtual input"):
+            compiled.execute(outputs=["d"], inputs={"a": 1, "z": 0})
+
+    def test_independent_of_source(self):
+        """Modifying the source pipeline does not affect the compiled plan."""
+        p = Pipeline()
+        p.add_node("a", lambda: 1)
+        compiled = p.compile()
+        p.add_node("b", lambda a: a + 1, dependencies=["a"])
+        assert compiled.list_nodes() == ["a"]
+
+    def test_validation_flags(self):
+        """Pre/post functions are only kept if validation is enabled."""
+        recorded = []
+        p = Pipeline(validate=False)
+        p.add_node("a", lambda: 1, post_funcs=[recorded.append])
+        p.compile().execute()
+        assert recorded == []
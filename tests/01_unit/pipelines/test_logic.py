@@ -427,3 +427,193 @@ def test_09_degree_of_linear_polarization(mode, aggregate_ckd_quad):
     expected_size = {**spectral_sizes, **film_sizes, **solar_angle_sizes}
     assert isinstance(result, xr.DataArray)
     assert result.sizes == expected_size
+
+
+@pytest.mark.parametrize("is_variance", [False, True], ids=["mean", "variance"])
+def test_10_aggregate_ckd_quad_reference(mode_ckd, is_variance):
+    # Compare the vectorized implementation with a per-pixel reference on
+    # synthetic data, with bins using different quadrature rules
+    from eradiate.quad import Quad
+
+    spectral_grid = CKDSpectralGrid.arange(500.0, 560.0, 10.0)
+    n_bins = len(spectral_grid.wcenters)
+    quads = [
+        Quad.gauss_legendre(8) if i % 2 else Quad.gauss_lobatto(8)
+        for i in range(n_bins)
+    ]
+    rng = np.random.default_rng(0)
+    raw = xr.DataArray(
+        rng.random((3, 4, n_bins, 8)),
+        dims=("y_index", "x_index", "w", "g"),
+        coords={"w": spectral_grid.wcenters.m_as(ureg.nm), "g": np.arange(8)},
+        name="radiance_raw",
+    )
+
+    result = logic.aggregate_ckd_quad(
+        "ckd", raw, spectral_grid, quads, is_variance=is_variance
+    )
+    assert result.dims == ("y_index", "x_index", "w")
+    assert result.name == "radiance"
+
+    for i_bin, quad in enumerate(quads):
+        for iy, ix in np.ndindex(3, 4):
+            values = raw.values[iy, ix, i_bin, :]
+            if is_variance:
+                expected = np.dot((0.5 * quad.weights) ** 2, values)
+            else:
+                expected = quad.integrate(values, interval=(0.0, 1.0))
+            np.testing.assert_allclose(
+                result.values[iy, ix, i_bin], expected, rtol=1e-14
+            )
+
+
+def test_11_gather_bitmaps_layout(mode_ckd):
+    # Bitmaps are written to the slot of their spectral index, regardless of
+    # iteration order; missing (w, g) combinations are filled with NaN
+    import mitsuba as mi
+
+    rng = np.random.default_rng(0)
+    bitmaps = {}
+    for w, gs in [(660.0, [0.2, 0.7]), (440.0, [0.0, 1.0]), (550.0, [1.0, 0.0])]:
+        for g in gs:
+            bitmaps[(w, g)] = {
+                "spp": 16,
+                "bitmap": mi.Bitmap(rng.random((3, 4, 1)), mi.Bitmap.PixelFormat.Y),
+                "m2": mi.Bitmap(rng.random((3, 4, 1)), mi.Bitmap.PixelFormat.Y),
+            }
+
+    result = logic.gather_bitmaps(
+        "ckd", "radiance", {}, True, False, bitmaps, None, None
+    )
+
+    raw = result["radiance_raw"]
+    assert raw.dims == ("w", "g", "y_index", "x_index")
+    np.testing.assert_array_equal(raw.w, [440.0, 550.0, 660.0])
+    np.testing.assert_array_equal(raw.g, [0.0, 0.2, 0.7, 1.0])
+    for (w, g), result_dict in bitmaps.items():
+        np.testing.assert_array_equal(
+            raw.sel(w=w, g=g).values, np.reshape(result_dict["bitmap"], (3, 4))
+        )
+        np.testing.assert_array_equal(
+            result["radiance_m2_raw"].sel(w=w, g=g).values,
+            np.reshape(result_dict["m2"], (3, 4)),
+        )
+    assert np.isnan(raw.sel(w=440.0, g=0.2)).all()
+    assert np.isnan(result["spp"].sel(w=660.0, g=0.0))
+
+
+@pytest.mark.parametrize("calculate_stokes", [False, True], ids=["scalar", "stokes"])
+def test_12_ckd_quad_accumulator(mode_ckd, calculate_stokes):
+    # On-the-fly quadrature evaluation matches the gather -> variance ->
+    # aggregate sequence
+    import mitsuba as mi
+
+    from eradiate.quad import Quad
+
+    spectral_grid = CKDSpectralGrid.arange(500.0, 540.0, 10.0)
+    quads = [
+        Quad.gauss_legendre(4) if i % 2 else Quad.gauss_lobatto(3)
+        for i in range(len(spectral_grid.wcenters))
+    ]
+    names = ["I", "Q", "U", "V"] if calculate_stokes else ["bitmap"]
+
+    rng = np.random.default_rng(0)
+    bitmaps = {}
+    for w, quad in zip(spectral_grid.wcenters.m_as(ureg.nm), quads):
+        for g in quad.eval_nodes([0, 1]):
+            bitmaps[(float(w), g)] = {
+                "spp": 16,
+                **{
+                    name: mi.Bitmap(rng.random((3, 4, 1)), mi.Bitmap.PixelFormat.Y)
+                    for name in [*names, "m2"]
+                },
+            }
+
+    accumulator = logic.CKDQuadAccumulator(
+        spectral_grid,
+        quads,
+        calculate_variance=True,
+        calculate_stokes=calculate_stokes,
+    )
+    for si, result_dict in bitmaps.items():
+        accumulator.add(si, result_dict)
+    result = logic.gather_ckd_aggregates(
+        "ckd",
+        "radiance",
+        {},
+        True,
+        calculate_stokes,
+        accumulator,
+        spectral_grid,
+        None,
+        None,
+    )
+
+    gathered = logic.gather_bitmaps(
+        "ckd", "radiance", {}, True, calculate_stokes, bitmaps, None, None
+    )
+    var_raw = logic.moment2_to_variance(
+        gathered["radiance_raw"],
+        gathered["radiance_m2_raw"],
+        gathered["spp"],
+        calculate_stokes,
+    )
+    expected = {
+        "radiance": logic.aggregate_ckd_quad(
+            "ckd", gathered["radiance_raw"], spectral_grid, quads, False
+        ),
+        "radiance_var": logic.aggregate_ckd_quad(
+            "ckd", var_raw, spectral_grid, quads, True
+        ),
+    }
+
+    for name in ["radiance", "radiance_var"]:
+        assert result[name].dims == expected[name].dims
+        assert result[name].name == name
+        xr.testing.assert_allclose(result[name], expected[name], rtol=1e-12)
+
+    # Aggregates can be selected by bin
+    assert list(accumulator.aggregates([510.0, 530.0]).keys()) == [510.0, 530.0]
+
+    # Spectral indexes outside the grid are rejected
+    with pytest.raises(ValueError):
+        accumulator.add((600.0, 0.5), next(iter(bitmaps.values())))
+
+
+def test_13_aggregate_ckd_quad_ragged(mode_ckd):
+    # Bins with different g-point counts are aggregated from the values at
+    # their own nodes, missing (w, g) combinations being ignored
+    from eradiate.quad import Quad
+
+    spectral_grid = CKDSpectralGrid.arange(500.0, 540.0, 10.0)
+    quads = [Quad.gauss_legendre(n) for n in [1, 2, 4, 2]]
+    g = np.unique(np.concatenate([quad.eval_nodes([0.0, 1.0]) for quad in quads]))
+
+    rng = np.random.default_rng(0)
+    values = np.full((len(quads), len(g)), np.nan)
+    for i_bin, quad in enumerate(quads):
+        i_nodes = np.searchsorted(g, quad.eval_nodes([0.0, 1.0]))
+        values[i_bin, i_nodes] = rng.random(len(i_nodes))
+
+    raw = xr.DataArray(
+        values,
+        dims=("w", "g"),
+        coords={"w": spectral_grid.wcenters.m_as(ureg.nm), "g": g},
+        name="radiance_raw",
+    )
+    result = logic.aggregate_ckd_quad(
+        "ckd", raw, spectral_grid, quads, is_variance=False
+    )
+
+    for i_bin, quad in enumerate(quads):
+        expected = quad.integrate(
+            raw.isel(w=i_bin).sel(g=quad.eval_nodes([0.0, 1.0])).values,
+            interval=(0.0, 1.0),
+        )
+        np.testing.assert_allclose(result.values[i_bin], expected, rtol=1e-14)
+
+    # Nodes which cannot be located are rejected
+    with pytest.raises(ValueError, match="could not locate"):
+        logic.aggregate_ckd_quad(
+            "ckd", raw, spectral_grid, [Quad.gauss_lobatto(3)] * 4, False
+        )
@@ -1,6 +1,20 @@
-from axsdb import ErrorHandlingAction, ErrorHandlingConfiguration
+import os
 
-from eradiate.radprops._absorption import DEFAULT_DATABASES, _init_absdb_factory
+import numpy as np
+import xarray as xr
+from axsdb import (
+    ErrorHandlingAction,
+    ErrorHandlingConfiguration,
+    MonoAbsorptionDatabase,
+)
+
+from eradiate import unit_registry as ureg
+from eradiate.radprops._absorption import (
+    DEFAULT_DATABASES,
+    _init_absdb_factory,
+    absdb_factory,
+    preload_absdb,
+)
 
 
 def test_init_absdb_factory(mode_mono):
@@ -15,3 +29,77 @@ def test_init_absdb_factory(mode_mono):
         assert (
             absdb.error_handling_config.t.missing is ErrorHandlingAction[action.upper()]
         )
+
+
+def test_preload_absdb(mode_mono, tmp_path, thermoprops_us_standard):
+    # Preloaded slices evaluate to the same values as the source database
+    absdb = absdb_factory.create(DEFAULT_DATABASES["mono"])
+    w = [550.0, 550.5, 700.0] * ureg.nm
+    thermoprops = thermoprops_us_standard
+
+    preloaded = preload_absdb(absdb, w, path=tmp_path)
+    assert preloaded is not absdb
+    assert len(list(tmp_path.iterdir())) == 1
+    np.testing.assert_allclose(
+        preloaded.eval_sigma_a_mono(w, thermoprops).values,
+        absdb.eval_sigma_a_mono(w, thermoprops).values,
+    )
+
+    # Slices are reused
+    assert preload_absdb(absdb, w, path=tmp_path) is not absdb
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def _make_wavenumber_absdb(path):
+    # Synthetic database indexed by ascending wavenumbers, i.e. descending
+    # wavelengths
+    path.mkdir()
+    for i, wn_min in enumerate([14000.0, 18000.0]):
+        wn = np.arange(wn_min, wn_min + 4000.0, 500.0)
+        xr.Dataset(
+            {"sigma_a": (("w", "p"), np.outer(wn, [1.0, 2.0]), {"units": "1/m"})},
+            coords={
+                "w": ("w", wn, {"units": "cm^-1"}),
+                "p": ("p", [1e4, 1e5], {"units": "Pa"}),
+            },
+        ).to_netcdf(path / f"chunk_{i}.nc")
+    return MonoAbsorptionDatabase.from_directory(path, lazy=True)
+
+
+def test_preload_absdb_wavenumber(mode_mono, tmp_path):
+    # Slices bracket the requested wavelengths on the dataset's own spectral
+    # axis, which is a wavenumber here
+    absdb = _make_wavenumber_absdb(tmp_path / "db")
+    w = 1e7 / np.array([15200.0, 19200.0])  # nm
+
+    preloaded = preload_absdb(absdb, w * ureg.nm, path=tmp_path / "slices")
+    assert preloaded is not absdb
+    np.testing.assert_allclose(
+        preloaded.load_dataset("chunk_0.nc").w.values, [15000.0, 15500.0]
+    )
+    np.testing.assert_allclose(
+        preloaded.load_dataset("chunk_1.nc").w.values, [19000.0, 19500.0]
+    )
+
+
+def test_preload_absdb_source_changes(mode_mono, tmp_path):
+    # Slices are not reused if the source database changes
+    absdb = _make_wavenumber_absdb(tmp_path / "db")
+    w = [650.0] * ureg.nm
+    slices = tmp_path / "slices"
+
+    preload_absdb(absdb, w, path=slices)
+    preload_absdb(absdb, w, path=slices)
+    assert len(list(slices.iterdir())) == 1
+
+    filename = tmp_path / "db" / "chunk_0.nc"
+    stat = filename.stat()
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    preload_absdb(absdb, w, path=slices)
+    assert len(list(slices.iterdir())) == 2
+
+
+def test_preload_absdb_ckd(mode_ckd, tmp_path):
+    # CKD databases are returned unchanged
+    absdb = absdb_factory.create(DEFAULT_DATABASES["ckd"])
+    assert preload_absdb(absdb, [550.0] * ureg.nm, path=tmp_path) is absdb
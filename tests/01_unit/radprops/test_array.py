@@ -96,3 +96,20 @@ def test_array_zeros(modes_all_mono, test_data):
 
     assert np.all(sigma_a.m_as("1/m") == np.zeros(10))
     assert np.all(sigma_s.m_as("1/m") == test_data.isel(w=0).values)
+
+
+def test_array_eval_dataset_batch(modes_all_mono, test_data):
+    # The default batch implementation stacks per-wavelength evaluations
+    zgrid = eradiate.scenes.geometry.ZGrid(np.linspace(0, 1000, 11))
+    array_radprofile = ArrayRadProfile(
+        has_absorption=True,
+        has_scattering=True,
+        sigma_a=test_data,
+        sigma_s=test_data,
+        interpolation_method="nearest",
+    )
+
+    ds = array_radprofile.eval_dataset_batch_mono([545.0, 565.0] * ureg.nm, zgrid)
+    assert ds.sigma_a.dims == ("w", "z_layer")
+    np.testing.assert_allclose(ds.sigma_a.values, test_data.values * 1e3)
+    np.testing.assert_allclose(ds.albedo.values[:, 1:], 0.5)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from eradiate import unit_registry as ureg
+from eradiate.radprops import AtmosphereRadProfile, ZGrid
+from eradiate.spectral.grid import CKDSpectralGrid
+
+
+def test_eval_dataset_batch_mono(mode_mono):
+    # Batch evaluation matches per-wavelength evaluation
+    profile = AtmosphereRadProfile()
+    zgrid = ZGrid(np.linspace(0, 120, 61) * ureg.km)
+    w = [440.0, 550.0, 660.0] * ureg.nm
+
+    ds = profile.eval_dataset_batch_mono(w, zgrid)
+    assert ds.sigma_t.dims == ("w", "z_layer")
+    assert ds.sigma_t.shape == (3, 60)
+
+    for i, x in enumerate(w):
+        np.testing.assert_allclose(
+            ds.sigma_a.isel(w=i).values,
+            profile.eval_sigma_a_mono(x, zgrid).m_as("km^-1"),
+        )
+        np.testing.assert_allclose(
+            ds.sigma_s.isel(w=i).values,
+            profile.eval_sigma_s_mono(x, zgrid).m_as("km^-1"),
+        )
+
+
+def test_eval_dataset_batch_ckd(mode_ckd):
+    # Batch evaluation over the g-points of a bin matches per-index evaluation
+    profile = AtmosphereRadProfile()
+    zgrid = ZGrid(np.linspace(0, 120, 61) * ureg.km)
+    w = CKDSpectralGrid.from_absorption_database(profile.absorption_data).wcenters[100]
+    g = [0.1, 0.5, 0.9]
+
+    ds = profile.eval_dataset_batch_ckd(w, g, zgrid)
+    assert ds.sigma_t.dims == ("g", "z_layer")
+    assert ds.sigma_t.shape == (3, 60)
+    assert ds.w.values == w.m_as("nm")
+
+    for j, y in enumerate(g):
+        np.testing.assert_allclose(
+            ds.sigma_a.isel(g=j).values,
+            profile.eval_sigma_a_ckd(w, y, zgrid).m_as("km^-1"),
+        )
+        np.testing.assert_allclose(
+            ds.sigma_s.isel(g=j).values,
+            profile.eval_sigma_s_ckd(w, y, zgrid).m_as("km^-1"),
+        )
@@ -386,3 +386,34 @@ def test_heterogeneous_absorbing_mol_atm(
             f"Test parametrisation inconsistent. Expected 'absorbing_only' or "
             f"'scattering_only' (got {particle_radprops})"
         )
+
+
+def test_heterogeneous_eval_radprops_batch(mode_ckd, atmosphere_us_standard_ckd):
+    # Batch evaluation over the g-points of a bin matches per-index evaluation
+    atmosphere = HeterogeneousAtmosphere(
+        geometry={"type": "plane_parallel", "zgrid": np.linspace(0, 120, 61) * ureg.km},
+        molecular_atmosphere=atmosphere_us_standard_ckd,
+        particle_layers=[ParticleLayer()],
+    )
+    atmosphere.update()
+    w = default_spectral_index(atmosphere.molecular_atmosphere).w
+    sis = [SpectralIndex.new(w=w, g=g) for g in [0.1, 0.5, 0.9]]
+
+    sigma_t, albedo = atmosphere.eval_radprops_batch(sis)
+    assert sigma_t.shape == (3, 60)
+    assert albedo.shape == (3, 60)
+
+    for i, si in enumerate(sis):
+        np.testing.assert_allclose(
+            sigma_t[i].m_as("km^-1"), atmosphere.eval_sigma_t(si).m_as("km^-1")
+        )
+        np.testing.assert_allclose(
+            albedo[i].m_as("dimensionless"),
+            atmosphere.eval_albedo(si).m_as("dimensionless"),
+        )
+
+    # Batches spanning several bins are rejected
+    with pytest.raises(ValueError, match="same bin"):
+        atmosphere.eval_radprops_batch(
+            [SpectralIndex.new(w=w, g=0.5), SpectralIndex.new(w=1.1 * w, g=0.5)]
+        )
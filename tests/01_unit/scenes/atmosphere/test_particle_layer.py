@@ -452,3 +452,42 @@ def test_particle_layer_wavelength_alignment(test_dataset_path):
         UserWarning, match="dataset does not contain the selected reference wavelength"
     ):
         ParticleLayer(dataset=ds, tau_ref=1.0, w_ref=0.5 * (w1 + w2) * ureg.nm)
+
+
+@pytest.mark.parametrize("geometry", ["plane_parallel", "spherical_shell"])
+def test_particle_layer_prefetch_radprops(mode_ckd, particle_dataset_test, geometry):
+    """
+    Medium parameters looked up from precomputed tables match direct evaluation.
+    """
+    layer = ParticleLayer(
+        geometry=geometry,
+        dataset=particle_dataset_test,
+        distribution={"type": "exponential"},
+        tau_ref=1.0,
+        bottom=0.0 * ureg.km,
+        top=5.0 * ureg.km,
+    )
+    sis = [
+        SpectralIndex.new(w=w, g=g)
+        for w in [550.0, 1650.0] * ureg.nm
+        for g in [0.0, 0.5, 1.0]
+    ]
+    _, umap = traverse(layer)
+    params = {k: v for k, v in umap.items() if k.startswith(layer.medium_id)}
+    assert len(params) == 2
+    expected = [
+        {k: param(KernelContext(si=si)) for k, param in params.items()} for si in sis
+    ]
+
+    layer.prefetch_radprops(sis + sis[:2])  # Duplicates are skipped
+    table = layer._radprops_table
+    assert table.sigma_t.shape == (len(sis), layer.geometry.zgrid.n_layers)
+    assert table.sigma_t.dtype == np.float32
+
+    for si, values in zip(sis, expected):
+        for k, param in params.items():
+            np.testing.assert_array_equal(param(KernelContext(si=si)), values[k])
+
+    # Table is discarded upon update
+    layer.update()
+    assert layer._radprops_table is None
@@ -7,8 +7,10 @@ import pytest
 
 from eradiate import KernelContext
 from eradiate import unit_registry as ureg
+from eradiate.scenes.biosphere import InstancedCanopyElement
 from eradiate.scenes.biosphere._leaf_cloud import (
     LeafCloud,
+    _leaf_cloud_mesh,
     _leaf_cloud_orientations,
     _leaf_cloud_positions_cuboid,
     _leaf_cloud_positions_cuboid_avoid_overlap,
@@ -119,6 +121,29 @@ def test_leaf_cloud_radii():
     assert np.allclose(radii, 10.0 * ureg.cm)
 
 
+def test_leaf_cloud_mesh():
+    positions = np.array([[0.0, 0.0, 0.0], [1.0, 1.0, 1.0], [0.0, 0.0, 2.0]])
+    orientations = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 1.0], [0.0, 0.0, -1.0]])
+    radii = np.array([0.1, 0.2, 0.3])
+    vertices, faces = _leaf_cloud_mesh(positions, orientations, radii, 8)
+    assert vertices.shape == (24, 3)
+    assert faces.shape == (18, 3)
+
+    # Polygons have the area of the leaves and face normals are aligned with
+    # leaf normals
+    v0, v1, v2 = (vertices[faces[:, i]] for i in range(3))
+    cross = np.cross(v1 - v0, v2 - v0)
+    areas = 0.5 * np.linalg.norm(cross, axis=1).reshape(3, 6).sum(axis=1)
+    np.testing.assert_allclose(areas, np.pi * radii**2)
+
+    normals = orientations / np.linalg.norm(orientations, axis=1, keepdims=True)
+    face_normals = cross / np.linalg.norm(cross, axis=1, keepdims=True)
+    np.testing.assert_allclose(face_normals, np.repeat(normals, 6, axis=0), atol=1e-12)
+
+    # Polygons are centered on leaf positions
+    np.testing.assert_allclose(vertices.reshape(3, 8, 3).mean(axis=1), positions)
+
+
 # ------------------------------------------------------------------------------
 #                                 LeafCloud tests
 # ------------------------------------------------------------------------------
@@ -324,6 +349,36 @@ def test_leaf_cloud_kernel_dict(mode_mono):
     check_scene_element(leaf_cloud)
 
 
+def test_leaf_cloud_kernel_dict_mesh(mode_mono):
+    leaf_cloud = LeafCloud(
+        id="leaf_cloud",
+        leaf_positions=[[0, 0, 0], [1, 1, 1]],
+        leaf_orientations=[[1, 0, 0], [0, 1, 0]],
+        leaf_radii=[0.1, 0.1],
+        leaf_geometry="mesh",
+    )
+
+    # Leaves are expanded as a single mesh holding the BSDF
+    template, params = traverse(leaf_cloud)
+    kernel_dict = template.render(ctx=KernelContext())
+    assert set(kernel_dict.keys()) == {"leaf_cloud_leaves"}
+    mesh = kernel_dict["leaf_cloud_leaves"]
+    assert mesh.face_count() == 2 * 6
+    assert mesh.bsdf().id() == "bsdf_leaf_cloud"
+    assert np.isclose(float(mesh.surface_area()), leaf_cloud.surface_area().m_as("m^2"))
+
+    # BSDF parameters are looked up in the mesh
+    check_scene_element(leaf_cloud)
+
+    # The mesh representation can be instanced
+    check_scene_element(
+        InstancedCanopyElement(
+            canopy_element=leaf_cloud,
+            instance_positions=[[0, 0, 0], [2, 2, 0]],
+        )
+    )
+
+
 def test_surface_area(mode_mono):
     """Unit testing for :meth:`LeafCloud.surface_area`."""
     cloud = LeafCloud(
@@ -129,3 +129,39 @@ def test_tabulated_order(mode_mono, tmpdir):
     phase_mu_decreasing = layer_mu_decreasing.eval(si, 0, 0)
 
     assert np.all(phase_mu_increasing == phase_mu_decreasing)
+
+
+@pytest.mark.parametrize("grid", ["regular", "polarized"])
+def test_tabulated_eval_matrix(mode_mono, grid, request):
+    data = request.getfixturevalue(grid)
+    phase = TabulatedPhaseFunction(data=data)
+
+    w_units = data.w.attrs["units"]
+    w_data = data.w.values
+    w = 0.5 * (w_data[0] + w_data[1]) * eradiate.unit_registry(w_units)
+
+    # All components are evaluated at once and match xarray interpolation
+    expected = data.interp(w=w.m_as(w_units)).transpose("i", "j", "mu").values
+    result = phase.eval_matrix_mono(w)
+    np.testing.assert_allclose(result, expected)
+
+    # Wavelength arrays are supported
+    result = phase.eval_matrix_mono(np.stack([w.m, w.m]) * w.u)
+    assert result.shape == (2, *expected.shape)
+    np.testing.assert_allclose(phase.eval_mono(w, 0, 0), expected[0, 0])
+
+    # Per-component evaluation reuses the cached phase matrix
+    si = SpectralIndex.new(w=w)
+    for i in range(data.i.size):
+        for j in range(data.j.size):
+            np.testing.assert_allclose(phase.eval(si, i, j), expected[i, j])
+    info = phase._eval_matrix_impl.cache_info()
+    assert (info.misses, info.hits) == (1, data.i.size * data.j.size - 1)
+
+    # Cached values are protected against modification
+    with pytest.raises(ValueError):
+        phase.eval_matrix(si)[0, 0, 0] = 0.0
+
+    # Out-of-bounds wavelengths are rejected
+    with pytest.raises(ValueError):
+        phase.eval_matrix_mono((w_data.max() + 1.0) * eradiate.unit_registry(w_units))
@@ -105,3 +105,57 @@ def test_solar_irradiance_datetime(mode_mono):
         s_scaled_datetime.eval_mono(550.0 * ureg.nm),
         s.eval_mono(550.0 * ureg.nm) / 0.98854537**2,
     )
+
+    # The Earth-Sun distance scaling factor is computed once per date
+    from eradiate.scenes.spectra._solar_irradiance import _earth_sun_distance_scale
+
+    hits = _earth_sun_distance_scale.cache_info().hits
+    s_scaled_datetime.eval_mono([500.0, 600.0] * ureg.nm)
+    assert _earth_sun_distance_scale.cache_info().hits == hits + 1
+
+
+def test_solar_irradiance_eval_array(mode_mono):
+    # Array evaluation matches xarray interpolation of the dataset
+    s = SolarIrradianceSpectrum(dataset="thuillier_2003")
+    w = np.linspace(400.0, 700.0, 31)
+    expected = s.dataset.ssi.interp(w=w).values
+
+    result = s.eval_mono(w * ureg.nm)
+    assert result.shape == w.shape
+    np.testing.assert_allclose(result.m_as(s.dataset.ssi.attrs["units"]), expected)
+
+
+def test_solar_irradiance_bin_average(mode_mono):
+    s = SolarIrradianceSpectrum(dataset="thuillier_2003", scale=2.0)
+    ssi_units = ureg(s.dataset.ssi.attrs["units"])
+    wmins = np.array([400.0, 550.0, 600.5]) * ureg.nm
+    wmaxs = np.array([410.0, 560.0, 601.0]) * ureg.nm
+
+    # Reference: trapezoid rule on the bin bounds and the dataset nodes they
+    # enclose (the spectrum is linear between dataset nodes)
+    expected = []
+    for wmin, wmax in zip(wmins.m, wmaxs.m):
+        w = np.unique(
+            np.concatenate(
+                [
+                    [wmin, wmax],
+                    s.dataset.w.values[(s.dataset.w > wmin) & (s.dataset.w < wmax)],
+                ]
+            )
+        )
+        values = s.eval_mono(w * ureg.nm).m_as(ssi_units)
+        expected.append(
+            np.sum(0.5 * (values[1:] + values[:-1]) * np.diff(w)) / (wmax - wmin)
+        )
+
+    result = s.eval_bin_average(wmins, wmaxs)
+    assert result.shape == (3,)
+    np.testing.assert_allclose(result.m_as(ssi_units), expected)
+
+    # The integral is consistent with the bin average
+    integral = s.integral(wmins[0], wmaxs[0])
+    assert np.isclose(integral, result[0] * (wmaxs[0] - wmins[0]))
+
+    # Bounds out of the dataset's spectral range are rejected
+    with pytest.raises(ValueError):
+        s.eval_bin_average(1.0 * ureg.nm, 2.0 * ureg.nm)
@@ -1,5 +1,14 @@
+import pytest
+import xarray as xr
+
 from eradiate.quad import QuadType
-from eradiate.spectral.ckd_quad import CKDQuadConfig, CKDQuadPolicy
+from eradiate.spectral.ckd_quad import (
+    CKDQuadConfig,
+    CKDQuadPolicy,
+    ng_minimum,
+    ng_threshold,
+)
+from eradiate.units import unit_registry as ureg
 
 
 def test_ckd_quad_config_construct():
@@ -16,3 +25,66 @@ def test_ckd_quad_config_convert():
     assert cqc.type is QuadType.GAUSS_LOBATTO
     assert cqc.ng_max == 8
     assert cqc.policy is CKDQuadPolicy.FIXED
+
+
+@pytest.fixture
+def error():
+    # Transmittance error for a single bin, minimal for 8 g-points
+    return xr.DataArray(
+        [1e-2, -5e-3, 2e-3, 5e-4, 1e-4, 2e-4],
+        dims="ng",
+        coords={"ng": [1, 2, 4, 8, 16, 32]},
+    )
+
+
+@pytest.mark.parametrize("ng_max, expected", [(None, 16), (32, 16), (8, 8), (3, 2)])
+def test_ng_minimum(error, ng_max, expected):
+    assert ng_minimum(error, ng_max) == expected
+    # A spectral dimension is reduced to its first bin
+    assert ng_minimum(error.expand_dims(w=[550.0]), ng_max) == expected
+
+
+@pytest.mark.parametrize(
+    "threshold, ng_max, expected",
+    [(1e-2, None, 2), (1e-3, None, 8), (1e-3, 4, 4), (1e-6, 16, 16)],
+)
+def test_ng_threshold(error, threshold, ng_max, expected):
+    assert ng_threshold(error, threshold, ng_max) == expected
+
+
+class _Database:
+    # Minimal stand-in for a CKD absorption database holding error data
+    def __init__(self, ds):
+        self.ds = ds
+
+    def lookup_datasets(self, **kwargs):
+        return [self.ds]
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [("fixed", 16), ("minimize_error", 8), ("error_threshold", 4)],
+)
+def test_ckd_quad_config_get_quad(error, policy, expected):
+    ds = xr.Dataset(
+        {"error": error.expand_dims(w=[540.0, 550.0, 560.0]).copy()},
+    )
+    ds["w"].attrs["units"] = "nm"
+    ds["error"].loc[{"w": 550.0, "ng": 4}] = 5e-4
+    ds["error"].loc[{"w": 550.0, "ng": 8}] = 1e-5
+
+    cqc = CKDQuadConfig(ng_max=16, policy=policy, error_threshold=1e-3)
+    quad = cqc.get_quad(_Database(ds), wcenter=551.0 * ureg.nm)
+    assert quad.type is cqc.type
+    assert len(quad.nodes) == expected
+
+
+def test_ckd_quad_config_get_quad_fallback(error):
+    # Adaptive policies fall back to ng_max if error data is missing
+    ds = xr.Dataset({"sigma_a": error.rename(ng="g").expand_dims(w=[550.0])})
+    ds["w"].attrs["units"] = "nm"
+
+    cqc = CKDQuadConfig(ng_max=4, policy="minimize_error")
+    with pytest.warns(UserWarning, match="Falling back"):
+        quad = cqc.get_quad(_Database(ds), wcenter=550.0 * ureg.nm)
+    assert len(quad.nodes) == 4
@@ -10,8 +10,10 @@ from eradiate.util.misc import (
     MultiGenerator,
     Singleton,
     cache_by_id,
+    cache_by_value,
     camel_to_snake,
     deduplicate,
+    fingerprint,
     fullname,
     is_vector3,
     natsorted,
@@ -148,6 +150,101 @@ def test_cache_by_id(capsys):
     assert captured.out == ""
 
 
+def test_cache_by_value():
+    calls = []
+
+    # Function: entries are keyed by value and evicted in LRU order
+    @cache_by_value(maxsize=2)
+    def f(x):
+        calls.append(x)
+        return x
+
+    for x in [1, 2, 1, 3, 2]:
+        f(x)
+    assert calls == [1, 2, 3, 2]
+    info = f.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 4, 2)
+
+    f.cache_clear()
+    assert f.cache_info().currsize == 0
+
+    # Arrays and quantities are keyed by contents
+    calls.clear()
+    f(np.array([1.0, 2.0]))
+    f(np.array([1.0, 2.0]))
+    f(np.array([1.0, 2.0]) * ureg.nm)
+    f(np.array([1.0, 2.0]) * ureg.nm)
+    assert len(calls) == 2
+
+    # Calls with unhashable arguments bypass the cache
+    calls.clear()
+    f.cache_clear()
+    f([1.0])
+    f([1.0])
+    assert len(calls) == 2
+    info = f.cache_info()
+    assert (info.misses, info.currsize) == (2, 0)
+
+    # Memory cap: values larger than the limit are not stored
+    @cache_by_value(maxbytes=100)
+    def g(n):
+        return np.zeros(n)
+
+    g(10)
+    g(100)
+    info = g.cache_info()
+    assert (info.currsize, info.nbytes) == (1, 80)
+    g(5)  # 80 + 40 > 100: evicts the first entry
+    info = g.cache_info()
+    assert (info.currsize, info.nbytes) == (1, 40)
+
+    # Methods: each instance has its own cache
+    class MyClass:
+        def __init__(self):
+            self.calls = 0
+
+        @cache_by_value
+        def f(self, si):
+            self.calls += 1
+            return si.as_hashable
+
+    obj1, obj2 = MyClass(), MyClass()
+    si = eradiate.spectral.SpectralIndex.new(w=550.0)
+
+    assert obj1.f(si) == obj1.f(eradiate.spectral.SpectralIndex.new(w=550.0))
+    assert obj1.calls == 1
+    obj2.f(si)
+    assert obj2.calls == 1
+    assert obj1.f.cache_info().hits == 1
+    assert obj2.f.cache_info().hits == 0
+
+    obj1.f.cache_clear()
+    obj1.f(si)
+    assert obj1.calls == 2
+
+
+def test_fingerprint(mode_mono):
+    # Mappings are fingerprinted regardless of insertion order
+    assert fingerprint({"a": 1, "b": [1.0, "x"]}) == fingerprint(
+        {"b": [1.0, "x"], "a": 1}
+    )
+
+    # Types, array contents and units are taken into account
+    assert fingerprint(1) != fingerprint(1.0)
+    assert fingerprint(np.arange(3)) != fingerprint(np.arange(3.0))
+    assert fingerprint(np.arange(3)) != fingerprint(np.arange(4))
+    assert fingerprint(1.0 * ureg.m) != fingerprint(1.0 * ureg.km)
+
+    # Equal attrs instances have the same fingerprint
+    si = eradiate.spectral.SpectralIndex.new(w=550.0)
+    assert fingerprint(si) == fingerprint(eradiate.spectral.SpectralIndex.new(w=550.0))
+    assert fingerprint(si) != fingerprint(eradiate.spectral.SpectralIndex.new(w=560.0))
+
+    # Callables have no stable fingerprint
+    with pytest.raises(TypeError):
+        fingerprint({"f": lambda x: x})
+
+
 @pytest.mark.parametrize(
     "input, expected",
     [
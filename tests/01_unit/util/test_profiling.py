@@ -0,0 +1,111 @@
+import json
+import threading
+
+import numpy as np
+
+from eradiate.util import profiling
+from eradiate.util.profiling import Profiler, get_profiler, profile, stage
+
+
+def test_stage_disabled():
+    # Without an active profiler, a shared no-op context manager is returned
+    assert get_profiler() is None
+    assert stage("foo") is stage("bar")
+    with stage("foo"):
+        pass
+
+
+def test_profile(tmp_path):
+    filename = tmp_path / "profile.json"
+
+    with profile(filename) as profiler:
+        assert get_profiler() is profiler
+        for _ in range(3):
+            with stage("foo"):
+                pass
+        with stage("bar"):
+            pass
+
+    # The profiler is deactivated upon exit
+    assert get_profiler() is None
+    with stage("foo"):
+        pass
+
+    report = profiler.to_dict()
+    assert list(report["stages"].keys()) == ["foo", "bar"]
+    assert report["stages"]["foo"]["count"] == 3
+    assert report["stages"]["bar"]["count"] == 1
+    foo = report["stages"]["foo"]
+    assert foo["min"] <= foo["mean"] <= foo["max"]
+    assert np.isclose(foo["total"], 3 * foo["mean"])
+    assert report["wall_time"] >= foo["total"]
+
+    # The report is written upon exit
+    assert json.loads(filename.read_text()) == json.loads(profiler.to_json())
+
+
+def test_profile_nested():
+    with profile() as outer:
+        with profile() as inner:
+            with stage("foo"):
+                pass
+        assert get_profiler() is outer
+        with stage("bar"):
+            pass
+
+    assert inner.stages == ["foo"]
+    assert outer.stages == ["bar"]
+
+
+def test_profile_exception():
+    try:
+        with profile() as profiler:
+            with stage("foo"):
+                raise ValueError
+    except ValueError:
+        pass
+
+    # Failed stages are recorded and the profiler is deactivated
+    assert profiler.stages == ["foo"]
+    assert get_profiler() is None
+
+
+def test_profiler_threads():
+    profiler = Profiler()
+
+    def work():
+        for _ in range(100):
+            with profiler.stage("foo"):
+                pass
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert profiler.to_dict()["stages"]["foo"]["count"] == 400
+
+
+def test_profiler_to_dataset():
+    profiler = Profiler()
+    profiler.record("foo", 1.0)
+    profiler.record("foo", 3.0)
+    profiler.record("bar", 0.5)
+
+    ds = profiler.to_dataset()
+    assert list(ds.stage.values) == ["foo", "bar"]
+    np.testing.assert_array_equal(ds["count"].values, [2, 1])
+    np.testing.assert_allclose(ds["total"].values, [4.0, 0.5])
+    np.testing.assert_allclose(ds["mean"].values, [2.0, 0.5])
+    np.testing.assert_allclose(ds["min"].values, [1.0, 0.5])
+    np.testing.assert_allclose(ds["max"].values, [3.0, 0.5])
+    assert ds["total"].attrs["units"] == "s"
+
+
+def test_peak_rss():
+    rss = profiling.peak_rss()
+    if profiling.resource is not None:
+        assert rss > 0
+    else:
+        assert rss is None
@@ -1,6 +1,8 @@
 import numpy as np
 import xarray as xr
 
+from eradiate import frame
+from eradiate.warp import uniform_hemisphere_to_square
 from eradiate.xarray.interp import dataarray_to_rgb, film_to_angular
 
 
@@ -26,6 +28,39 @@ def test_film_to_angular():
     assert set(da_angular.coords) == {"theta", "phi"}
 
 
+def test_film_to_angular_extra_dims():
+    # Interpolation broadcasts over extra dimensions and matches point-wise
+    # interpolation in film space
+    rng = np.random.default_rng(0)
+    da = xr.DataArray(
+        rng.random((3, 32, 16, 4)),
+        coords=(
+            ("w", [440.0, 550.0, 660.0]),
+            ("x", np.arange(0.5, 32, 1) / 32),
+            ("y", np.arange(0.5, 16, 1) / 16),
+            ("stokes", ["I", "Q", "U", "V"]),
+        ),
+    )
+
+    theta = np.radians(np.arange(0.0, 85.0, 5))
+    phi = np.radians(np.arange(0.0, 360.0, 10))
+    da_angular = film_to_angular(
+        da, theta=theta, phi=phi, azimuth_convention="east_right"
+    )
+    assert da_angular.dims == ("w", "stokes", "theta", "phi")
+    np.testing.assert_allclose(da_angular.theta, theta)
+    np.testing.assert_allclose(da_angular.phi, phi)
+
+    i_theta, i_phi = 7, 5
+    xy = uniform_hemisphere_to_square(
+        frame.angles_to_direction([theta[i_theta], phi[i_phi]])
+    )[0]
+    expected = da.interp(x=xy[0], y=xy[1])
+    np.testing.assert_allclose(
+        da_angular.isel(theta=i_theta, phi=i_phi).values, expected.values
+    )
+
+
 def test_dataarray_to_rgb():
     r = 0.25 * np.ones((3, 2, 1))
     g = 0.50 * np.ones((3, 2, 1))